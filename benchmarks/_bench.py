@@ -0,0 +1,30 @@
+# -*- coding: UTF-8 -*-
+"""
+Small helpers shared by the benchmark scripts. Run them from the root of the
+repository, e.g. ``python benchmarks/bench_transducers.py``.
+"""
+import sys
+import timeit
+from os.path import dirname
+from typing import Callable
+
+# Benchmark the checkout, not an installed version
+sys.path.insert(0, dirname(__file__) + "/..")
+
+
+def best_of(fn: Callable[[], object], repeat: int = 5, number: int = 1) -> float:
+    """
+    Return the best time, in seconds, of ``number`` calls to ``fn``.
+    """
+    return min(timeit.repeat(fn, repeat=repeat, number=number)) / number
+
+
+def report(name: str, seconds: float, n: int, baseline: float = 0.0) -> None:
+    """
+    Print the time per element of a benchmark, and its ratio to a baseline if
+    any.
+    """
+    line = "%-40s %10.1f ns/elt" % (name, seconds * 1e9 / n)
+    if baseline:
+        line += "  x%.2f" % (seconds / baseline)
+    print(line)
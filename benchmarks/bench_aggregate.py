@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare ``clj.reduce_by``, ``clj.frequencies`` and ``clj.aggregate_by`` with
+``clj.group_by`` followed by reductions, in time and in peak memory.
+"""
+import functools
+import operator
+import random
+import tracemalloc
+
+from _bench import best_of, report
+
+import clj as c
+
+N = 1_000_000
+KEYS = 1000
+
+
+def key(x):
+    return x % KEYS
+
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def compare(name, baseline, fn):
+    base = best_of(baseline, repeat=3)
+    report("%s, group_by" % name, base, N)
+    report("%s, streaming" % name, best_of(fn, repeat=3), N, base)
+    print("    peak memory: %.1f MB with group_by, %.1f MB streaming"
+          % (peak_memory(baseline) / 1e6, peak_memory(fn) / 1e6))
+
+
+def main():
+    rnd = random.Random(42)
+    coll = [rnd.randrange(10 ** 6) for _ in range(N)]
+
+    compare("sum by key",
+            lambda: {k: sum(v) for k, v in c.group_by(key, iter(coll)).items()},
+            lambda: c.reduce_by(key, operator.add, iter(coll), 0))
+    compare("max by key",
+            lambda: {k: functools.reduce(max, v) for k, v in c.group_by(key, iter(coll)).items()},
+            lambda: c.reduce_by(key, max, iter(coll)))
+    compare("frequencies",
+            lambda: {k: len(v) for k, v in c.group_by(c.identity, (key(x) for x in coll)).items()},
+            lambda: c.frequencies(key(x) for x in coll))
+
+    aggregates = {"count": (lambda n, _: n + 1, 0), "sum": (operator.add, 0), "max": (max, -1)}
+    compare("count+sum+max by key",
+            lambda: {k: {"count": len(v), "sum": sum(v), "max": max(v)}
+                     for k, v in c.group_by(key, iter(coll)).items()},
+            lambda: c.aggregate_by(key, aggregates, iter(coll)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare sequential and concurrent async maps over a stand-in I/O-bound
+coroutine that sleeps for 5ms.
+"""
+import asyncio
+import time
+
+import _bench  # noqa: F401 (sets up sys.path)
+
+from clj import aio
+
+N = 1000
+LATENCY = 0.005
+
+
+async def lookup(x):
+    await asyncio.sleep(LATENCY)
+    return x
+
+
+async def consume(agen):
+    n = 0
+    async for _ in agen:
+        n += 1
+    return n
+
+
+def bench(name, make_agen, n):
+    start = time.perf_counter()
+    asyncio.run(consume(make_agen()))
+    elapsed = time.perf_counter() - start
+    print("%-40s %8.0f elts/s" % (name, n / elapsed))
+
+
+def main():
+    # Sequential is slow; use fewer elements
+    bench("aio.map (sequential)", lambda: aio.map(lookup, range(N // 10)), N // 10)
+    for concurrency in (10, 100, 1000):
+        bench("amap, concurrency=%d" % concurrency,
+              lambda: aio.amap(lookup, range(N), concurrency=concurrency), N)
+        bench("amap, concurrency=%d, unordered" % concurrency,
+              lambda: aio.amap(lookup, range(N), concurrency=concurrency, ordered=False), N)
+
+    # Overhead on a function that doesn't wait
+    bench("aio.map, no I/O", lambda: aio.map(lambda x: x, range(N * 100)), N * 100)
+    bench("amap, no I/O", lambda: aio.amap(lambda x: x, range(N * 100), concurrency=100), N * 100)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# -*- coding: UTF-8 -*-
+"""
+Measure the throughput of channels between two threads and between two
+coroutines, against ``queue.Queue`` and ``asyncio.Queue``, and the latency of
+``pipeline`` from a put on its input to the take of the result, with a
+transducer that sleeps (like I/O) and different numbers of threads.
+"""
+import asyncio
+import queue
+import statistics
+import threading
+import time
+
+from _bench import best_of, report
+
+from clj import async_ as a
+from clj import transducers as xf
+
+N = 100_000
+PIPELINE_N = 400
+SLEEP = 0.002
+
+
+def threads_queue(size):
+    q: queue.Queue = queue.Queue(size)
+
+    def produce():
+        for e in range(N):
+            q.put(e)
+        q.put(None)
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    while q.get() is not None:
+        pass
+    thread.join()
+
+
+def threads_chan(size):
+    ch = a.chan(size)
+
+    def produce():
+        for e in range(N):
+            a.put(ch, e)
+        ch.close()
+
+    thread = threading.Thread(target=produce)
+    thread.start()
+    for _ in ch:
+        pass
+    thread.join()
+
+
+async def coroutines_queue(size):
+    q: asyncio.Queue = asyncio.Queue(size)
+
+    async def produce():
+        for e in range(N):
+            await q.put(e)
+        await q.put(None)
+
+    task = asyncio.ensure_future(produce())
+    while await q.get() is not None:
+        pass
+    await task
+
+
+async def coroutines_chan(size):
+    ch = a.chan(size)
+
+    async def produce():
+        for e in range(N):
+            await a.aput(ch, e)
+        ch.close()
+
+    task = asyncio.ensure_future(produce())
+    async for _ in ch:
+        pass
+    await task
+
+
+def latencies(n, ordered):
+    def work(x):
+        time.sleep(SLEEP)
+        return x, time.perf_counter()
+
+    from_, to = a.chan(), a.chan(PIPELINE_N)
+    a.pipeline(n, to, xf.map(work), from_, ordered=ordered)
+    starts = []
+    for e in range(PIPELINE_N):
+        starts.append(time.perf_counter())
+        a.put(from_, e)
+    from_.close()
+    # The time from the put to the end of the transducer, plus the time to
+    # reach the output channel
+    ends = {x: end for x, end in to}
+    return sorted(ends[e] - start for e, start in enumerate(starts))
+
+
+def main():
+    for size in (1, 1024):
+        base = best_of(lambda: threads_queue(size), repeat=3)
+        report("threads, queue.Queue(%d)" % size, base, N)
+        report("threads, chan(%d)" % size, best_of(lambda: threads_chan(size), repeat=3), N, base)
+        base = best_of(lambda: asyncio.run(coroutines_queue(size)), repeat=3)
+        report("coroutines, asyncio.Queue(%d)" % size, base, N)
+        report("coroutines, chan(%d)" % size, best_of(lambda: asyncio.run(coroutines_chan(size)), repeat=3), N,
+               base)
+
+    print("pipeline of %d values, sleeping %g ms each" % (PIPELINE_N, SLEEP * 1e3))
+    for ordered in (True, False):
+        for n in (1, 4, 16, 64):
+            start = time.perf_counter()
+            lat = latencies(n, ordered)
+            total = time.perf_counter() - start
+            print("%-40s %8.1f ms total, latency median %.1f ms, p99 %.1f ms"
+                  % ("  n=%d%s" % (n, "" if ordered else ", unordered"), total * 1e3,
+                     statistics.median(lat) * 1e3, lat[len(lat) * 99 // 100] * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare chunked pipelines with ``clj.seqs`` and with list comprehensions.
+"""
+from _bench import best_of, report
+
+import clj as c
+from clj import chunked as ch
+
+N = 1_000_000
+
+
+def non_zero(x):
+    return x % 1000 or None
+
+
+def main():
+    coll = list(range(N))
+
+    # map and remove are C builtins in clj.seqs, so chunking doesn't help
+    base = best_of(lambda: [x + 1 for x in coll if (x + 1) % 3], repeat=3)
+    report("map+remove, list comprehension", base, N)
+    report("map+remove, clj.seqs",
+           best_of(lambda: list(c.remove(lambda x: x % 3 == 0, c.map(c.inc, coll))), repeat=3), N, base)
+    for size in (8, 32, 256):
+        report("map+remove, clj.chunked (size=%d)" % size,
+               best_of(lambda: list(ch.remove(lambda x: x % 3 == 0, ch.map(c.inc, ch.chunked(coll, size)))),
+                       repeat=3), N, base)
+
+    # keep, drop, take and partition are generators in clj.seqs
+    base = best_of(lambda: [y for y in map(non_zero, coll) if y is not None], repeat=3)
+    report("keep, list comprehension", base, N)
+    report("keep, clj.seqs", best_of(lambda: list(c.keep(non_zero, coll)), repeat=3), N, base)
+    report("keep, clj.chunked", best_of(lambda: list(ch.keep(non_zero, coll)), repeat=3), N, base)
+
+    base = best_of(lambda: c.count(c.partition(c.take(N // 2, c.drop(10, c.keep(non_zero, coll))), 3, 2)), repeat=3)
+    report("keep+drop+take+partition, clj.seqs", base, N)
+    report("keep+drop+take+partition, clj.chunked",
+           best_of(lambda: ch.count(ch.partition(ch.take(N // 2, ch.drop(10, ch.keep(non_zero, coll))), 3, 2)),
+                   repeat=3), N, base)
+
+    base = best_of(lambda: c.count(c.take(N // 2, c.drop(10, (x for x in coll)))), repeat=3)
+    report("drop+take+count on a generator, clj.seqs", base, N)
+    report("drop+take+count on a generator, clj.chunked",
+           best_of(lambda: ch.count(ch.take(N // 2, ch.drop(10, (x for x in coll)))), repeat=3), N, base)
+
+
+if __name__ == "__main__":
+    main()
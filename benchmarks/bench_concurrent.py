@@ -0,0 +1,63 @@
+# -*- coding: UTF-8 -*-
+"""
+Measure the throughput of 8 threads reading the same lazy sequence through
+an ad-hoc lock per element, ``locked`` with and without batches, and
+``fan_out``. The threads only run in parallel on free-threaded builds of
+CPython; otherwise this measures the synchronization overhead.
+"""
+import sys
+import threading
+
+from _bench import best_of, report
+
+import clj as c
+from clj.concurrent import fan_out, locked
+
+N = 1_000_000
+THREADS = 8
+
+
+def run_threads(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def ad_hoc_lock():
+    it = c.map(c.inc, range(N))
+    lock = threading.Lock()
+
+    def consume():
+        while True:
+            with lock:
+                e = next(it, None)
+            if e is None:
+                return
+
+    run_threads([consume] * THREADS)
+
+
+def with_locked(batch):
+    it = locked(c.map(c.inc, range(N)), batch=batch)
+    run_threads([lambda: c.dorun(it)] * THREADS)
+
+
+def with_fan_out():
+    run_threads([lambda consumer=consumer: c.dorun(consumer)
+                 for consumer in fan_out(c.map(c.inc, range(N)), THREADS)])
+
+
+def main():
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("%d threads, GIL %s" % (THREADS, "enabled" if gil else "disabled"))
+    base = best_of(ad_hoc_lock, repeat=3)
+    report("ad-hoc lock", base, N)
+    report("locked(batch=1)", best_of(lambda: with_locked(1), repeat=3), N, base)
+    report("locked(batch=64)", best_of(lambda: with_locked(64), repeat=3), N, base)
+    report("fan_out(batch=64)", best_of(with_fan_out, repeat=3), N, base)
+
+
+if __name__ == "__main__":
+    main()
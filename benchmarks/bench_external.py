@@ -0,0 +1,39 @@
+# -*- coding: UTF-8 -*-
+"""
+Measure the cost of spilling to disk in ``clj.external``, compared with the
+in-memory functions.
+"""
+import random
+
+from _bench import best_of, report
+
+import clj as c
+from clj import external
+
+N = 1_000_000
+
+
+def main():
+    rnd = random.Random(42)
+    coll = [rnd.randrange(N // 2) for _ in range(N)]
+
+    # 1 GB is enough not to spill, 8 MB isn't
+    for name, memory in (("in memory", 2 ** 30), ("8 MB", 2 ** 23)):
+        base = best_of(lambda: c.count(c.distinct(coll)), repeat=3)
+        report("distinct, clj", base, N)
+        report("distinct, external, %s" % name,
+               best_of(lambda: c.count(external.distinct(coll, memory=memory)), repeat=3), N, base)
+
+        base = best_of(lambda: c.group_by(c.is_even, coll), repeat=3)
+        report("group_by, clj", base, N)
+        report("group_by, external, %s" % name,
+               best_of(lambda: c.dorun(external.group_by(c.is_even, coll, memory=memory)), repeat=3), N, base)
+
+        base = best_of(lambda: sorted(coll), repeat=3)
+        report("sort, sorted", base, N)
+        report("sort, external, %s" % name,
+               best_of(lambda: c.dorun(external.sort_by(None, coll, memory=memory)), repeat=3), N, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare ``clj.flatten`` with the previous recursive implementation on wide,
+shallow and deep trees.
+"""
+import collections.abc
+
+from _bench import best_of, report
+
+import clj as c
+
+
+def recursive_flatten(x):
+    for e in x:
+        if isinstance(e, collections.abc.Iterable) and not isinstance(e, (bytes, str)):
+            for sub_e in recursive_flatten(e):
+                yield sub_e
+        else:
+            yield e
+
+
+def nested(depth, leaf):
+    x = leaf
+    for _ in range(depth):
+        x = [x]
+    return x
+
+
+def main():
+    # 1M leaves in 1000 lists
+    wide = [list(range(1000)) for _ in range(1000)]
+    n = 1_000_000
+    base = best_of(lambda: c.count(recursive_flatten(wide)), repeat=3)
+    report("wide, recursive", base, n)
+    report("wide, clj.flatten", best_of(lambda: c.count(c.flatten(wide)), repeat=3), n, base)
+
+    # 100k leaves 10 levels deep, mixing lists and tuples
+    shallow = [nested(10, (i, "s")) for i in range(50_000)]
+    n = 100_000
+    base = best_of(lambda: c.count(recursive_flatten(shallow)), repeat=3)
+    report("shallow, recursive", base, n)
+    report("shallow, clj.flatten", best_of(lambda: c.count(c.flatten(shallow)), repeat=3), n, base)
+
+    # 100 leaves 500 levels deep; the recursive version can't go much deeper
+    deep = [nested(500, i) for i in range(100)]
+    n = 100
+    base = best_of(lambda: c.count(recursive_flatten(deep)), repeat=3)
+    report("deep (500), recursive", base, n)
+    report("deep (500), clj.flatten", best_of(lambda: c.count(c.flatten(deep)), repeat=3), n, base)
+
+    deep = nested(100_000, 1)
+    report("deep (100k), clj.flatten", best_of(lambda: c.count(c.flatten(deep)), repeat=3), 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare the per-call cost of ``clj.comp``, ``clj.juxt`` and ``clj.complement``
+with their previous implementations, and ``clj.partial`` with a closure.
+"""
+from _bench import best_of, report
+
+import clj as c
+
+N = 1_000_000
+
+
+def loop_comp(*fns):
+    def _comp(*args, **kw):
+        res = fns[-1](*args, **kw)
+
+        for i in range(1, len(fns)):
+            res = fns[-1 - i](res)
+
+        return res
+
+    return _comp
+
+
+def list_juxt(*fns):
+    def _fn(*args, **kw):
+        return [f(*args, **kw) for f in fns]
+
+    return _fn
+
+
+def not_complement(f):
+    def _f(*args, **kw):
+        return not f(*args, **kw)
+
+    return _f
+
+
+def closure_partial(f, *args):
+    def _fn(*more):
+        return f(*args, *more)
+
+    return _fn
+
+
+def add(a, b):
+    return a + b
+
+
+def bench(name, before, after):
+    coll = range(N)
+    base = best_of(lambda: c.dorun(map(before, coll)), repeat=3)
+    report("%s, before" % name, base, N)
+    report("%s, after" % name, best_of(lambda: c.dorun(map(after, coll)), repeat=3), N, base)
+
+
+def main():
+    for n in (2, 3, 4, 6):
+        fns = [c.inc] * n
+        bench("comp, %d functions" % n, loop_comp(*fns), c.comp(*fns))
+    bench("comp, nested", loop_comp(loop_comp(c.inc, c.inc), c.inc), c.comp(c.comp(c.inc, c.inc), c.inc))
+
+    for n in (1, 2, 3, 5):
+        fns = [c.inc] * n
+        bench("juxt, %d functions" % n, list_juxt(*fns), c.juxt(*fns))
+        bench("juxt, %d functions, as_tuple" % n, list_juxt(*fns), c.juxt(*fns, as_tuple=True))
+
+    bench("complement, twice", not_complement(not_complement(c.is_even)), c.complement(c.complement(c.is_even)))
+    bench("partial vs closure", closure_partial(add, 1), c.partial(add, 1))
+    bench("partial vs closure, nested", closure_partial(closure_partial(add), 1), c.partial(c.partial(add), 1))
+
+
+if __name__ == "__main__":
+    main()
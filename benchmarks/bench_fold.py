@@ -0,0 +1,38 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare ``clj.reducers.fold`` on pools of threads and processes with a
+sequential ``functools.reduce``, on a CPU-bound reduction.
+"""
+import functools
+import operator
+import os
+
+from _bench import best_of, report
+
+from clj.reducers import fold, monoid
+
+N = 2_000_000
+
+
+def add_square(acc, x):
+    return acc + x * x
+
+
+def main():
+    plus = monoid(operator.add, int)
+    print("%d CPUs" % (os.cpu_count() or 1))
+
+    for name, coll in (("range", range(N)), ("list", list(range(N))), ("iterator", None)):
+        def get():
+            return iter(range(N)) if coll is None else coll
+
+        base = best_of(lambda: functools.reduce(add_square, get(), 0), repeat=3)
+        report("%s, reduce" % name, base, N)
+        report("%s, fold, threads" % name,
+               best_of(lambda: fold(plus, add_square, get(), n=10_000), repeat=3), N, base)
+        report("%s, fold, processes" % name,
+               best_of(lambda: fold(plus, add_square, get(), n=10_000, executor="process"), repeat=3), N, base)
+
+
+if __name__ == "__main__":
+    main()
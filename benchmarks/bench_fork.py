@@ -0,0 +1,72 @@
+# -*- coding: UTF-8 -*-
+"""
+Compute the count, the sum and the last element of a generator in one pass:
+with ``list`` and three passes, ``itertools.tee``, ``fork`` and
+``multi_reduce``. Measure the time and the peak memory of each.
+"""
+import collections
+import itertools
+import operator
+import tracemalloc
+
+from _bench import best_of, report
+
+import clj as c
+
+N = 1_000_000
+
+consume = collections.deque(maxlen=0).extend
+
+REDUCTIONS = {"count": (lambda n, _: n + 1, 0), "sum": (operator.add, 0), "last": (lambda _, e: e, None)}
+
+
+def source():
+    return (x * 2 for x in range(N))
+
+
+def with_list():
+    coll = list(source())
+    return len(coll), sum(coll), coll[-1]
+
+
+def with_reductions(iterators):
+    # Step the reductions together so that the iterators stay in sync
+    counts, sums, lasts = (itertools.accumulate(it, f, initial=init)
+                           for it, (f, init) in zip(iterators, REDUCTIONS.values()))
+    results = collections.deque(zip(counts, sums, lasts), maxlen=1)
+    return results[0] if results else None
+
+
+def with_tee():
+    return with_reductions(itertools.tee(source(), 3))
+
+
+def with_fork():
+    return with_reductions(c.fork(source(), 3, max_lag=1000))
+
+
+def with_multi_reduce():
+    return c.multi_reduce(source(), REDUCTIONS)
+
+
+def peak(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    base = best_of(with_list, repeat=3)
+    report("list and 3 passes", base, N)
+    for name, fn in (("tee", with_tee), ("fork(max_lag=1000)", with_fork), ("multi_reduce", with_multi_reduce)):
+        report(name, best_of(fn, repeat=3), N, base)
+    for name, fn in (("list and 3 passes", with_list), ("tee", with_tee), ("fork(max_lag=1000)", with_fork),
+                     ("multi_reduce", with_multi_reduce)):
+        print("%-40s %10d kB peak" % (name, peak(fn) // 1024))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# -*- coding: UTF-8 -*-
+"""
+Measure the overhead of ``clj.instrument`` on a chain of stages, when it's
+disabled and when it's enabled.
+"""
+from _bench import best_of, report
+
+import clj as c
+from clj import instrument as ins
+from clj.pipeline import Seq
+
+N = 1_000_000
+
+
+def chain(stage):
+    return c.count(stage(c.distinct, stage(c.filter, c.is_even, stage(c.map, c.inc, range(N)))))
+
+
+def plain(f, *args):
+    return f(*args)
+
+
+def main():
+    base = best_of(lambda: chain(plain), repeat=3)
+    report("3 stages", base, N)
+    report("3 stages, instrumentation disabled", best_of(lambda: chain(ins.stage), repeat=3), N, base)
+    ins.enable()
+    report("3 stages, instrumentation enabled", best_of(lambda: chain(ins.stage), repeat=3), N, base)
+    ins.disable()
+
+    seq = Seq(range(N)).map(c.inc).filter(c.is_even).distinct()
+    base = best_of(seq.count, repeat=3)
+    report("pipeline, fused", base, N)
+    report("pipeline, instrumented", best_of(seq.instrument(ins.MemorySink()).count, repeat=3), N, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare the functions of ``clj.seqs`` on NumPy arrays, which are vectorized,
+with the same functions on iterators over these arrays.
+"""
+import operator
+import sys
+
+from _bench import best_of, report
+
+import clj as c
+
+N = 1_000_000
+
+
+def main():
+    try:
+        import numpy as np
+    except ImportError:
+        sys.exit("NumPy is not installed")
+
+    arr = np.random.default_rng(42).integers(0, 1000, N)
+
+    cases = [
+        ("distinct", lambda x: c.count(c.distinct(x))),
+        ("dedupe", lambda x: c.count(c.dedupe(x))),
+        ("partition 4", lambda x: c.count(c.partition(x, 4, as_tuple=True))),
+        ("take_nth 10", lambda x: c.count(c.take_nth(10, x))),
+        ("reductions +", lambda x: c.count(c.reductions(operator.add, x))),
+        ("drop_last 10", lambda x: c.count(c.drop_last(10, x))),
+        ("reverse", lambda x: c.count(c.reverse(x))),
+        ("interleave", lambda x: c.count(c.interleave(x, arr))),
+        ("take 10 of dedupe", lambda x: c.count(c.take(10, c.dedupe(x)))),
+    ]
+    for name, f in cases:
+        # An iterator over the array isn't vectorized, but has the same elements
+        base = best_of(lambda: f(iter(arr)), repeat=3)
+        report("%s, iterator" % name, base, N)
+        report("%s, vectorized" % name, best_of(lambda: f(arr), repeat=3), N, base)
+
+
+if __name__ == "__main__":
+    main()
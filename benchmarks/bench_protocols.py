@@ -0,0 +1,50 @@
+# -*- coding: UTF-8 -*-
+"""
+Measure the cost of the protocol lookups in ``clj.seqs`` on built-in types,
+before and after a protocol is extended to another type, and the gain for a
+type that implements them.
+"""
+from _bench import best_of, report
+
+import clj as c
+from clj import protocols
+
+N = 1_000_000
+
+
+class Column:
+    def __init__(self, values):
+        self.values = list(values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+def calls(coll):
+    for _ in range(N // 4):
+        c.count(coll)
+        c.first(coll)
+        c.nth(coll, 1)
+        c.last(coll)
+
+
+def main():
+    column = Column(range(100_000))
+    n = 100
+    column_base = best_of(lambda: [c.last(column) for _ in range(n)], repeat=3)
+    report("last(Column), iteration", column_base, n)
+
+    coll = [1, 2, 3]
+    base = best_of(lambda: calls(coll), repeat=3)
+    report("count/first/nth/last(list), no protocol", base, N)
+
+    protocols.ICounted.extend(Column, count=lambda col: len(col.values))
+    protocols.IIndexed.extend(Column, nth=lambda col, i: col.values[i])
+    report("count/first/nth/last(list), extended", best_of(lambda: calls(coll), repeat=3), N, base)
+
+    report("last(Column), ICounted and IIndexed", best_of(lambda: [c.last(column) for _ in range(n)], repeat=3), n,
+           column_base)
+
+
+if __name__ == "__main__":
+    main()
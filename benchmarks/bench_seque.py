@@ -0,0 +1,43 @@
+# -*- coding: UTF-8 -*-
+"""
+Measure ``seque`` with a producer and a consumer that release the GIL: the
+producer decompresses blocks with ``zlib`` and the consumer hashes them with
+``hashlib``, sequentially or overlapped. The overlap needs at least two
+CPUs. Also measure the overhead per element of fast producers.
+"""
+import hashlib
+import os
+import zlib
+
+from _bench import best_of, report
+
+import clj as c
+
+BLOCKS = 200
+BLOCK_SIZE = 1024 * 1024
+
+
+def main():
+    # Half random, half zeros so that it compresses but isn't trivial
+    block = zlib.compress(os.urandom(BLOCK_SIZE // 2) + bytes(BLOCK_SIZE // 2))
+    blocks = [block] * BLOCKS
+
+    def consume(decompressed):
+        for data in decompressed:
+            hashlib.sha256(data).digest()
+
+    base = best_of(lambda: consume(c.map(zlib.decompress, blocks)), repeat=3)
+    report("sequential", base, BLOCKS)
+    report("seque(n=4)", best_of(lambda: consume(c.seque(c.map(zlib.decompress, blocks), 4)), repeat=3),
+           BLOCKS, base)
+
+    n = 1_000_000
+    base = best_of(lambda: c.dorun(iter(range(n))), repeat=3)
+    report("overhead, range", base, n)
+    report("overhead, seque", best_of(lambda: c.dorun(c.seque(range(n))), repeat=3), n, base)
+    report("overhead, seque(chunksize=256)", best_of(lambda: c.dorun(c.seque(range(n), 1024, chunksize=256)),
+                                                    repeat=3), n, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare the random-access fast paths of ``clj.drop``, ``clj.take``,
+``clj.last``, ``clj.nth``, ``clj.butlast`` and ``clj.drop_last`` with their
+previous element-by-element implementations, on 10^7-element collections.
+Times are per call.
+"""
+import collections
+
+from _bench import best_of
+
+import clj as c
+
+N = 10_000_000
+
+
+def enumerate_drop(n, coll):
+    for i, e in enumerate(coll):
+        if i >= n:
+            yield e
+
+
+def enumerate_take(n, coll):
+    for i, e in enumerate(coll):
+        yield e
+        if i + 1 >= n:
+            break
+
+
+def loop_last(coll):
+    e = None
+    for item in coll:
+        e = item
+    return e
+
+
+def enumerate_nth(coll, n):
+    for i, e in enumerate(coll):
+        if i == n:
+            return e
+
+
+def deque_drop_last(n, coll):
+    queue = collections.deque()
+    size = 0
+    for e in coll:
+        queue.append(e)
+        if size < n:
+            size += 1
+            continue
+        yield queue.popleft()
+
+
+def compare(name, before, after):
+    base = best_of(before, repeat=3)
+    new = best_of(after, repeat=3)
+    print("%-40s %10.3f ms -> %10.3f ms  x%.4f" % (name, base * 1e3, new * 1e3, new / base))
+
+
+def main():
+    coll = list(range(N))
+    keys = dict.fromkeys(range(N)).keys()
+
+    compare("drop(N - 10, list)", lambda: c.dorun(enumerate_drop(N - 10, coll)), lambda: c.dorun(c.drop(N - 10, coll)))
+    compare("drop(N - 10, range)", lambda: c.dorun(enumerate_drop(N - 10, range(N))),
+            lambda: c.dorun(c.drop(N - 10, range(N))))
+    compare("rest(list), first element", lambda: next(enumerate_drop(1, coll)), lambda: next(iter(c.rest(coll))))
+    compare("take(10, list)", lambda: c.dorun(enumerate_take(10, coll)), lambda: c.dorun(c.take(10, coll)))
+    compare("take(N, list)", lambda: c.dorun(enumerate_take(N, coll)), lambda: c.dorun(c.take(N, coll)))
+    compare("last(list)", lambda: loop_last(coll), lambda: c.last(coll))
+    queue = collections.deque(coll)
+    compare("last(deque)", lambda: loop_last(queue), lambda: c.last(queue))
+    compare("nth(dict_keys, N - 10)", lambda: enumerate_nth(keys, N - 10), lambda: c.nth(keys, N - 10))
+    compare("nth(dict_keys, N // 3)", lambda: enumerate_nth(keys, N // 3), lambda: c.nth(keys, N // 3))
+    compare("butlast(list)", lambda: c.dorun(deque_drop_last(1, coll)), lambda: c.dorun(c.butlast(coll)))
+    compare("drop_last(10, list)", lambda: c.dorun(deque_drop_last(10, coll)), lambda: c.dorun(c.drop_last(10, coll)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare fused transducer pipelines with the equivalent nested generators from
+``clj.seqs``.
+"""
+import operator
+
+from _bench import best_of, report
+
+import clj as c
+from clj import transducers as t
+
+N = 1_000_000
+
+
+def add3(x):
+    return x + 3
+
+
+def non_zero(x):
+    return x % 7 or None
+
+
+def seqs_5(coll):
+    return c.partition(c.distinct(c.keep(non_zero, c.filter(c.is_even, c.map(c.inc, coll)))), 4)
+
+
+xf_5 = c.comp(t.map(c.inc), t.filter(c.is_even), t.keep(non_zero), t.distinct(), t.partition(4))
+
+
+def seqs_10(coll):
+    s = c.map(c.inc, coll)
+    s = c.filter(c.is_even, s)
+    s = c.map(add3, s)
+    s = c.remove(c.is_even, s)
+    s = c.keep(non_zero, s)
+    s = c.map(c.dec, s)
+    s = c.dedupe(s)
+    s = c.drop(10, s)
+    s = c.take_while(lambda x: x < N * 2, s)
+    return c.partition(s, 4)
+
+
+xf_10 = c.comp(t.map(c.inc), t.filter(c.is_even), t.map(add3), t.remove(c.is_even), t.keep(non_zero),
+               t.map(c.dec), t.dedupe(), t.drop(10), t.take_while(lambda x: x < N * 2), t.partition(4))
+
+
+def main():
+    coll = list(range(N))
+
+    base = best_of(lambda: c.count(seqs_5(coll)), repeat=3)
+    report("5 stages, clj.seqs", base, N)
+    report("5 stages, transduce", best_of(lambda: t.transduce(xf_5, lambda n, _: n + 1, coll, 0), repeat=3),
+           N, base)
+    report("5 stages, sequence", best_of(lambda: c.count(c.sequence(xf_5, coll)), repeat=3), N, base)
+
+    base = best_of(lambda: c.count(seqs_10(coll)), repeat=3)
+    report("10 stages, clj.seqs", base, N)
+    report("10 stages, transduce", best_of(lambda: t.transduce(xf_10, lambda n, _: n + 1, coll, 0), repeat=3),
+           N, base)
+    report("10 stages, into", best_of(lambda: c.into([], coll, xf_10), repeat=3), N, base)
+
+    base = best_of(lambda: sum(c.map(c.inc, c.filter(c.is_even, coll))), repeat=3)
+    report("filter+map+sum, builtins", base, N)
+    report("filter+map+sum, transduce",
+           best_of(lambda: t.transduce(c.comp(t.filter(c.is_even), t.map(c.inc)), operator.add, coll, 0),
+                   repeat=3), N, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare ``clj.tree_seq`` with the previous recursive implementation on a tree
+of about 10^6 nodes, and on a deep one.
+"""
+from _bench import best_of, report
+
+import clj as c
+
+
+def recursive_tree_seq(has_branch, get_children, root):
+    yield root
+    if has_branch(root):
+        for child in get_children(root):
+            for subchild in recursive_tree_seq(has_branch, get_children, child):
+                yield subchild
+
+
+def is_list(x):
+    return type(x) is list
+
+
+def tree(depth, fanout):
+    if depth == 0:
+        # Distinct leaves, so that unique=True doesn't skip them
+        return object()
+    return [tree(depth - 1, fanout) for _ in range(fanout)]
+
+
+def main():
+    # 10^6 leaves, 1111111 nodes in total
+    wide = tree(6, 10)
+    n = c.count(c.tree_seq(is_list, c.identity, wide))
+
+    base = best_of(lambda: c.count(recursive_tree_seq(is_list, c.identity, wide)), repeat=3)
+    report("10^6 nodes, recursive", base, n)
+    report("10^6 nodes, DFS", best_of(lambda: c.count(c.tree_seq(is_list, c.identity, wide)), repeat=3), n, base)
+    report("10^6 nodes, BFS",
+           best_of(lambda: c.count(c.tree_seq(is_list, c.identity, wide, bfs=True)), repeat=3), n, base)
+    report("10^6 nodes, DFS, unique",
+           best_of(lambda: c.count(c.tree_seq(is_list, c.identity, wide, unique=True)), repeat=3), n, base)
+    # Only the 111111 nodes above the leaves
+    report("10^6 nodes, DFS, max_depth=5",
+           best_of(lambda: c.count(c.tree_seq(is_list, c.identity, wide, max_depth=5)), repeat=3), n // 10)
+
+    # A binary tree 18 levels deep
+    deep = tree(18, 2)
+    n = c.count(c.tree_seq(is_list, c.identity, deep))
+    base = best_of(lambda: c.count(recursive_tree_seq(is_list, c.identity, deep)), repeat=3)
+    report("binary tree 18 levels deep, recursive", base, n)
+    report("binary tree 18 levels deep, DFS",
+           best_of(lambda: c.count(c.tree_seq(is_list, c.identity, deep)), repeat=3), n, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding: UTF-8 -*-
+"""
+Measure the time and peak memory of ``reverse``, ``rest``, ``take_nth`` and
+``split_at`` on large lists and bytearrays, which return views, against the
+generators they replace.
+"""
+import itertools
+import tracemalloc
+
+from _bench import best_of, report
+
+import clj as c
+from clj import seqs
+from clj.lazyseq import LazySeq
+
+N = 10_000_000
+
+
+def peak(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def split_at(n, coll):
+    seq = LazySeq(coll)
+    return LazySeq(itertools.islice(seq, n)), seq.drop(n)
+
+
+def main():
+    for coll in (list(range(N)), bytearray(N)):
+        name = type(coll).__name__
+        for label, view, generator in (
+                ("reverse", lambda: c.dorun(c.reverse(coll)), lambda: c.dorun(seqs._reverse(coll))),
+                ("rest", lambda: c.dorun(c.rest(coll)), lambda: c.dorun(seqs._drop(1, coll))),
+                ("take_nth(2)", lambda: c.dorun(c.take_nth(2, coll)), lambda: c.dorun(seqs._take_nth(2, coll))),
+                ("split_at", lambda: [c.dorun(part) for part in c.split_at(N // 2, coll)],
+                 lambda: [c.dorun(part) for part in split_at(N // 2, coll)])):
+            base = best_of(generator, repeat=3)
+            report("%s(%s), generator" % (label, name), base, N)
+            report("%s(%s), view" % (label, name), best_of(view, repeat=3), N, base)
+            print("%-40s %10d kB -> %d kB" % ("  peak memory", peak(generator) // 1024, peak(view) // 1024))
+
+
+if __name__ == "__main__":
+    main()
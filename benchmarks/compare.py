@@ -0,0 +1,66 @@
+# -*- coding: UTF-8 -*-
+"""
+Compare two results files of ``benchmarks/suite.py``:
+
+    python benchmarks/compare.py before.json after.json
+
+Exit with status 1 if a benchmark is slower than ``--threshold`` times its
+previous time.
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("-t", "--threshold", type=float, default=1.2,
+                        help="Ratio above which a benchmark is a regression (default: 1.2)")
+    parser.add_argument("-a", "--all", action="store_true", help="Show all the benchmarks, not only the changed ones")
+    args = parser.parse_args()
+
+    before, after = load(args.before), load(args.after)
+    print("before: %s (Python %s)" % (before["meta"]["commit"], before["meta"]["python"]))
+    print("after:  %s (Python %s)" % (after["meta"]["commit"], after["meta"]["python"]))
+    print()
+
+    regressions = []
+    for key in sorted(set(before["results"]) | set(after["results"])):
+        if key not in before["results"]:
+            print("%-28s new" % key)
+            continue
+        if key not in after["results"]:
+            # e.g. the second run was filtered with ``-k``
+            if args.all:
+                print("%-28s missing" % key)
+            continue
+
+        old = before["results"][key]["ns_per_elt"]
+        new = after["results"][key]["ns_per_elt"]
+        ratio = new / old if old else 1.0
+
+        if ratio > args.threshold:
+            flag = "SLOWER"
+            regressions.append(key)
+        elif ratio < 1 / args.threshold:
+            flag = "faster"
+        elif args.all:
+            flag = ""
+        else:
+            continue
+        print("%-28s %10.1f ns -> %10.1f ns  x%.2f %s" % (key, old, new, ratio, flag))
+
+    if regressions:
+        print("\n%d regression(s) above x%.2f" % (len(regressions), args.threshold))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+# -*- coding: UTF-8 -*-
+"""
+Benchmark every public function of ``clj``, and compare it with its natural
+baseline from the standard library where there’s one.
+
+    python benchmarks/suite.py -o before.json
+    # ... change things ...
+    python benchmarks/suite.py -o after.json
+    python benchmarks/compare.py before.json after.json
+
+Results are in nanoseconds per element of the input, or per call for the
+functions that don’t iterate over a collection.
+"""
+import argparse
+import collections
+import functools
+import itertools
+import json
+import operator
+import platform
+import random
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import _bench  # noqa: F401 (benchmark the checkout)
+
+import clj as c
+
+N = 100_000
+
+_DATA = list(range(N))
+_BIGINTS = [10 ** 30 + i for i in range(N)]
+_STRS = ["%020d" % i for i in range(N)]
+_NESTED = [[i, [i + 1, (i + 2,)]] for i in range(0, N, 3)]
+
+# Builders of fresh inputs, since generators can be consumed only once
+INPUTS: Dict[str, Callable[[], Iterable]] = {
+    "list": lambda: _DATA,
+    "tuple": lambda: tuple(_DATA),
+    "range": lambda: range(N),
+    "gen": lambda: (x for x in _DATA),
+    "bigint": lambda: _BIGINTS,
+    "str": lambda: _STRS,
+}
+
+ALL = tuple(INPUTS)
+NUMBERS = ("list", "tuple", "range", "gen", "bigint")
+# For functions that don’t take a collection, or that take a specific one
+NONE = ("-",)
+
+consume = collections.deque(maxlen=0).extend
+
+
+def roundrobin(*iterables):
+    "roundrobin('ABC', 'D', 'EF') --> A D E B F C (from the itertools docs)"
+    num_active = len(iterables)
+    nexts = itertools.cycle(iter(it).__next__ for it in iterables)
+    while num_active:
+        try:
+            for next_ in nexts:
+                yield next_()
+        except StopIteration:
+            num_active -= 1
+            nexts = itertools.cycle(itertools.islice(nexts, num_active))
+
+
+def sliding_window(iterable, n):
+    "sliding_window('ABCDEFG', 4) --> ABCD BCDE CDEF DEFG (from the itertools docs)"
+    it = iter(iterable)
+    window = collections.deque(itertools.islice(it, n - 1), maxlen=n)
+    for x in it:
+        window.append(x)
+        yield tuple(window)
+
+
+def _tree(depth: int) -> list:
+    if depth == 0:
+        return []
+    return [_tree(depth - 1), _tree(depth - 1)]
+
+
+_TREE = _tree(16)  # 2**17 - 1 nodes
+_TREE_SIZE = 2 ** 17 - 1
+
+
+def _key(x):
+    return hash(x) % 7
+
+
+def _pred(x):
+    return hash(x) % 3
+
+
+def _never(_):
+    return False
+
+
+def _always(_):
+    return True
+
+
+class Case(NamedTuple):
+    # Function to benchmark; it takes the input built by INPUTS[kind]
+    run: Callable[[Any], Any]
+    # Baseline, or None
+    baseline: Optional[Callable[[Any], Any]] = None
+    kinds: Tuple[str, ...] = ALL
+    # Number of elements processed by one run
+    elements: int = N
+
+
+def _multi_reduce(coll):
+    # multi_reduce with _AGGREGATES, by hand
+    n = total = 0
+    for e in coll:
+        n += 1
+        total += e
+    return {"count": n, "sum": total}
+
+
+def _times(k: int, f: Callable[[Any], Any]) -> Callable[[Any], None]:
+    def run(coll):
+        for _ in range(k):
+            f(coll)
+
+    return run
+
+
+CALLS = 10_000
+
+# Results of aggregate_by and frequencies on shards of 10k elements with 1000
+# keys, to merge
+_SHARDS = 10
+_AGGREGATES = {"count": (lambda n, _: n + 1, 0, operator.add), "sum": (operator.add, 0)}
+_PARTIALS = [c.aggregate_by(lambda x: x % 1000, _AGGREGATES, range(i, N, _SHARDS)) for i in range(_SHARDS)]
+_COUNTS = [c.frequencies(x % 1000 for x in range(i, N, _SHARDS)) for i in range(_SHARDS)]
+
+CASES: Dict[str, Case] = {
+    # clj.seqs
+    "aggregate_by": Case(lambda coll: c.aggregate_by(_key, _AGGREGATES, coll), kinds=NUMBERS),
+    "butlast": Case(lambda coll: consume(c.butlast(coll))),
+    "concat": Case(lambda coll: consume(c.concat(coll, [1])), lambda coll: consume(itertools.chain(coll, [1]))),
+    "cons": Case(lambda coll: consume(c.cons(1, coll)), lambda coll: consume(itertools.chain([1], coll))),
+    "count": Case(c.count, lambda coll: sum(1 for _ in coll)),
+    "cycle": Case(lambda coll: consume(itertools.islice(c.cycle(coll), 2 * N)),
+                  lambda coll: consume(itertools.islice(itertools.cycle(coll), 2 * N)), elements=2 * N),
+    "dedupe": Case(lambda coll: consume(c.dedupe(coll)),
+                   lambda coll: consume(k for k, _ in itertools.groupby(coll))),
+    "distinct": Case(lambda coll: consume(c.distinct(coll)), lambda coll: consume(dict.fromkeys(coll))),
+    "dorun": Case(c.dorun, consume),
+    "drop": Case(lambda coll: consume(c.drop(N // 2, coll)),
+                 lambda coll: consume(itertools.islice(coll, N // 2, None))),
+    "drop_last": Case(lambda coll: consume(c.drop_last(10, coll))),
+    "drop_while": Case(lambda coll: consume(c.drop_while(_always, coll))),
+    "empty": Case(_times(CALLS, c.empty), kinds=("list", "tuple", "gen"), elements=CALLS),
+    "every": Case(lambda coll: c.every(_always, coll), lambda coll: all(map(_always, coll))),
+    "ffirst": Case(_times(CALLS, c.ffirst), kinds=NONE, elements=CALLS),
+    "filter": Case(lambda coll: consume(c.filter(_pred, coll))),
+    "first": Case(_times(CALLS, c.first), lambda coll: _times(CALLS, lambda x: next(iter(x), None))(coll),
+                  kinds=("list", "tuple", "range", "gen"), elements=CALLS),
+    "flatten": Case(lambda coll: consume(c.flatten(coll)), kinds=NONE, elements=N),
+    "fork": Case(lambda coll: consume(zip(*c.fork(coll, 2))), lambda coll: consume(zip(*itertools.tee(coll, 2)))),
+    "frequencies": Case(c.frequencies, collections.Counter),
+    "group_by": Case(lambda coll: c.group_by(_key, coll)),
+    "interleave": Case(lambda colls: consume(c.interleave(*colls)), lambda colls: consume(roundrobin(*colls)),
+                       elements=2 * N),
+    "interpose": Case(lambda coll: consume(c.interpose(0, coll)),
+                      lambda coll: consume(itertools.islice(
+                          itertools.chain.from_iterable(zip(itertools.repeat(0), coll)), 1, None))),
+    "is_seq": Case(_times(CALLS, c.is_seq), kinds=("list", "tuple", "range", "gen"), elements=CALLS),
+    "iterate": Case(lambda _: consume(itertools.islice(c.iterate(c.inc, 0), N)), kinds=NONE),
+    "keep": Case(lambda coll: consume(c.keep(_pred, coll)),
+                 lambda coll: consume(y for y in map(_pred, coll) if y is not None)),
+    "keep_indexed": Case(lambda coll: consume(c.keep_indexed(operator.add, coll)),
+                         lambda coll: consume(y for y in itertools.starmap(operator.add, enumerate(coll))
+                                              if y is not None), kinds=NUMBERS),
+    "last": Case(c.last, lambda coll: collections.deque(coll, maxlen=1)),
+    "map": Case(lambda coll: consume(c.map(_pred, coll))),
+    "map_indexed": Case(lambda coll: consume(c.map_indexed(operator.add, coll)),
+                        lambda coll: consume(itertools.starmap(operator.add, enumerate(coll))), kinds=NUMBERS),
+    "mapcat": Case(lambda coll: consume(c.mapcat(lambda x: (x, x), coll)),
+                   lambda coll: consume(itertools.chain.from_iterable(map(lambda x: (x, x), coll)))),
+    "merge_aggregates": Case(lambda partials: c.merge_aggregates(_AGGREGATES, *partials), kinds=NONE,
+                             elements=_SHARDS),
+    "merge_with": Case(lambda counts: c.merge_with(operator.add, *counts),
+                       lambda counts: functools.reduce(operator.add, map(collections.Counter, counts)),
+                       kinds=NONE, elements=_SHARDS),
+    "multi_reduce": Case(lambda coll: c.multi_reduce(coll, _AGGREGATES), lambda coll: _multi_reduce(coll),
+                         kinds=NUMBERS),
+    "nfirst": Case(_times(CALLS, lambda coll: consume(c.nfirst(coll))), kinds=NONE, elements=CALLS),
+    "not_any": Case(lambda coll: c.not_any(_never, coll), lambda coll: not any(map(_never, coll))),
+    "not_every": Case(lambda coll: c.not_every(_always, coll), lambda coll: not all(map(_always, coll))),
+    "nth": Case(lambda coll: c.nth(coll, N - 1), lambda coll: next(itertools.islice(coll, N - 1, None))),
+    "partition": Case(lambda coll: consume(c.partition(coll, 4)), lambda coll: consume(zip(*[iter(coll)] * 4))),
+    "partition_all": Case(lambda coll: consume(c.partition_all(coll, 4, 1, as_tuple=True)),
+                          lambda coll: consume(sliding_window(coll, 4))),
+    "partition_by": Case(lambda coll: consume(c.partition_by(_key, coll)),
+                         lambda coll: consume(list(g) for _, g in itertools.groupby(coll, _key))),
+    "pmap": Case(lambda coll: consume(c.pmap(c.identity, coll, chunksize=256)),
+                 lambda coll: consume(map(c.identity, coll)), kinds=("list", "gen")),
+    "range": Case(lambda _: consume(itertools.islice(c.range(), N)),
+                  lambda _: consume(itertools.islice(itertools.count(), N)), kinds=NONE),
+    "reduce_by": Case(lambda coll: c.reduce_by(_key, operator.add, coll, 0),
+                      lambda coll: {k: sum(v) for k, v in c.group_by(_key, coll).items()}, kinds=NUMBERS),
+    "reductions": Case(lambda coll: consume(c.reductions(operator.add, coll)),
+                       lambda coll: consume(itertools.accumulate(coll, operator.add)), kinds=NUMBERS),
+    "remove": Case(lambda coll: consume(c.remove(_pred, coll))),
+    "repeat": Case(lambda _: consume(c.repeat(1, N)), lambda _: consume(itertools.repeat(1, N)), kinds=NONE),
+    "repeatedly": Case(lambda _: consume(c.repeatedly(object, N)), lambda _: consume(object() for _ in range(N)),
+                       kinds=NONE),
+    "replace": Case(lambda coll: consume(c.replace({1: 2}, coll)), lambda coll: consume(map({1: 2}.get, coll, coll))),
+    "rest": Case(lambda coll: consume(c.rest(coll)), lambda coll: consume(itertools.islice(coll, 1, None))),
+    "reverse": Case(lambda coll: consume(c.reverse(coll)), lambda coll: consume(reversed(list(coll)))),
+    "second": Case(_times(CALLS, c.second), kinds=("list", "tuple", "range", "gen"), elements=CALLS),
+    "seque": Case(lambda coll: consume(c.seque(coll, 1024, chunksize=256)), lambda coll: consume(iter(coll)),
+                  kinds=("list", "gen")),
+    "shuffle": Case(c.shuffle, lambda coll: random.shuffle(list(coll))),
+    "some": Case(lambda coll: c.some(_never, coll), lambda coll: next(filter(_never, coll), None)),
+    "split_at": Case(lambda coll: consume(c.split_at(N // 2, coll)[1])),
+    "split_with": Case(lambda coll: consume(c.split_with(lambda x: x < N // 2, coll)[1]), kinds=NUMBERS),
+    "take": Case(lambda coll: consume(c.take(N // 2, coll)),
+                 lambda coll: consume(itertools.islice(coll, N // 2)), elements=N // 2),
+    "take_nth": Case(lambda coll: consume(c.take_nth(3, coll)),
+                     lambda coll: consume(itertools.islice(coll, 0, None, 3))),
+    "take_while": Case(lambda coll: consume(c.take_while(_always, coll))),
+    "tree_seq": Case(lambda tree: consume(c.tree_seq(c.identity, c.identity, tree)), kinds=NONE,
+                     elements=_TREE_SIZE),
+    "zipmap": Case(lambda coll: c.zipmap(coll, coll), lambda coll: dict(zip(coll, coll)), kinds=ALL[:3] + ALL[4:]),
+    # clj.transducers
+    "into": Case(lambda coll: c.into([], coll), lambda coll: [].extend(coll)),
+    "sequence": Case(lambda coll: consume(c.sequence(c.transducers.map(_pred), coll)),
+                     lambda coll: consume(map(_pred, coll))),
+    "transduce": Case(lambda coll: c.transduce(c.transducers.map(c.inc), operator.add, coll, 0),
+                      lambda coll: sum(map(c.inc, coll)), kinds=NUMBERS),
+    # clj.fns
+    "comp": Case(lambda coll: consume(map(c.comp(c.inc, c.inc), coll)),
+                 lambda coll: consume(map(lambda x: x + 1 + 1, coll)), kinds=NUMBERS),
+    "complement": Case(lambda coll: consume(map(c.complement(c.is_even), coll)),
+                       lambda coll: consume(map(lambda x: not c.is_even(x), coll)), kinds=NUMBERS),
+    "constantly": Case(lambda coll: consume(map(c.constantly(1), coll)),
+                       lambda coll: consume(map(lambda _: 1, coll))),
+    "dec": Case(lambda coll: consume(map(c.dec, coll)), lambda coll: consume(map(lambda x: x - 1, coll)),
+                kinds=NUMBERS),
+    "identity": Case(lambda coll: consume(map(c.identity, coll)), lambda coll: consume(map(lambda x: x, coll))),
+    "inc": Case(lambda coll: consume(map(c.inc, coll)), lambda coll: consume(map(lambda x: x + 1, coll)),
+                kinds=NUMBERS),
+    "is_distinct": Case(lambda coll: consume(itertools.starmap(c.is_distinct, zip(coll, coll, coll))),
+                        lambda coll: consume(len(set(t)) == len(t) for t in zip(coll, coll, coll))),
+    "is_even": Case(lambda coll: consume(map(c.is_even, coll)), lambda coll: consume(map(lambda x: x % 2 == 0, coll)),
+                    kinds=NUMBERS),
+    "is_odd": Case(lambda coll: consume(map(c.is_odd, coll)), lambda coll: consume(map(lambda x: x % 2 == 1, coll)),
+                   kinds=NUMBERS),
+    "juxt": Case(lambda coll: consume(map(c.juxt(c.inc, c.dec), coll)),
+                 lambda coll: consume(map(lambda x: [x + 1, x - 1], coll)), kinds=NUMBERS),
+    "partial": Case(lambda coll: consume(map(c.partial(operator.add, 1), coll)),
+                    lambda coll: consume(map(lambda x: 1 + x, coll)), kinds=NUMBERS),
+}
+
+# Inputs of the cases that don't use INPUTS
+SPECIAL_INPUTS: Dict[str, Callable[[], Any]] = {
+    "ffirst": lambda: [[1]],
+    "flatten": lambda: _NESTED,
+    "merge_aggregates": lambda: _PARTIALS,
+    "merge_with": lambda: _COUNTS,
+    "nfirst": lambda: [[1, 2]],
+    "tree_seq": lambda: _TREE,
+}
+
+
+def public_functions() -> List[str]:
+    return sorted(name for name in dir(c) if not name.startswith("_") and callable(getattr(c, name)))
+
+
+def _input(name: str, kind: str) -> Any:
+    if kind == "-":
+        return SPECIAL_INPUTS.get(name, lambda: None)()
+    if name == "interleave":
+        return INPUTS[kind](), INPUTS[kind]()
+    return INPUTS[kind]()
+
+
+def _time(name: str, kind: str, fn: Callable[[Any], Any], repeat: int) -> float:
+    # Build a fresh input for each run, outside of the timing
+    best = float("inf")
+    for _ in range(repeat):
+        coll = _input(name, kind)
+        start = time.perf_counter()
+        fn(coll)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(names: List[str], repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in names:
+        case = CASES[name]
+        for kind in case.kinds:
+            key = "%s[%s]" % (name, kind)
+            ns = _time(name, kind, case.run, repeat) * 1e9 / case.elements
+            result = {"ns_per_elt": ns}
+            line = "%-28s %10.1f ns" % (key, ns)
+            if case.baseline is not None:
+                base = _time(name, kind, case.baseline, repeat) * 1e9 / case.elements
+                result["baseline_ns_per_elt"] = base
+                line += "  baseline %8.1f ns  x%.2f" % (base, ns / base if base else float("inf"))
+            results[key] = result
+            print(line, flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--output", help="Write the results in this JSON file")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Number of runs of each benchmark")
+    parser.add_argument("-k", "--filter", help="Only run the benchmarks whose name contains this string")
+    parser.add_argument("--check", action="store_true", help="Only check that all public functions are benchmarked")
+    args = parser.parse_args()
+
+    missing = sorted(set(public_functions()) - set(CASES))
+    if missing:
+        print("Missing benchmarks: %s" % ", ".join(missing), file=sys.stderr)
+        if args.check:
+            sys.exit(1)
+    if args.check:
+        return
+
+    names = sorted(name for name in CASES if not args.filter or args.filter in name)
+    results = run(names, args.repeat)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "meta": {
+                    "commit": _commit(),
+                    "python": platform.python_version(),
+                    "implementation": platform.python_implementation(),
+                    "n": N,
+                    "repeat": args.repeat,
+                    "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                },
+                "results": results,
+            }, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
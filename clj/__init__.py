@@ -3,10 +3,13 @@
 __version__ = "0.3.0"
 
 from clj.seqs import (
-    butlast, concat, cons, count, cycle, dedupe, distinct, dorun, drop, drop_last, drop_while, empty, every, ffirst,
-    filter, first, flatten, group_by, interleave, interpose, is_seq, iterate, keep, keep_indexed, last, map_indexed,
-    map, mapcat, nfirst, not_any, not_every, nth, partition, partition_by, range, reductions, remove, repeat,
-    repeatedly, replace,
-    rest, reverse, second, shuffle, some, split_at, split_with, take, take_nth, take_while, tree_seq, zipmap)
+    aggregate_by, butlast, concat, cons, count, cycle, dedupe, distinct, dorun, drop, drop_last, drop_while, empty,
+    every, ffirst, filter, first, flatten, fork, frequencies, group_by, interleave, interpose, is_seq, iterate, keep,
+    keep_indexed, last, map_indexed, map, mapcat, merge_aggregates, merge_with, multi_reduce, nfirst, not_any,
+    not_every, nth, partition, partition_all, partition_by, pmap, range, reduce_by, reductions, remove, repeat,
+    repeatedly, replace, rest, reverse, second, seque, shuffle, some, split_at, split_with, take, take_nth, take_while,
+    tree_seq, zipmap)
 
-from clj.fns import comp, complement, constantly, dec, identity, inc, juxt, is_distinct, is_odd, is_even
+from clj.fns import comp, complement, constantly, dec, identity, inc, juxt, is_distinct, is_odd, is_even, partial
+
+from clj.transducers import into, sequence, transduce
@@ -0,0 +1,275 @@
+# -*- coding: UTF-8 -*-
+"""
+Vectorized versions of some functions of ``clj.seqs``, used when their
+argument is a one-dimensional NumPy array of numbers, or an ``array.array``.
+
+NumPy is an optional dependency, and it's never imported here: if it isn't
+loaded yet, the argument can't be a NumPy array. ``array.array``s are only
+vectorized if NumPy is loaded.
+
+The results are computed ``CHUNK_SIZE`` elements at a time, so that e.g.
+``take(3, dedupe(array))`` doesn't go over the whole array, and they are the
+same as the non-vectorized ones: NumPy scalars for NumPy arrays, and Python
+numbers for ``array.array``s.
+"""
+import array
+import itertools
+import operator
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Number of elements processed at once
+CHUNK_SIZE = 4096
+
+# Kinds of NumPy dtypes we handle: booleans, signed and unsigned integers and
+# floats. Other ones (objects, strings, etc.) don't have the same semantics
+# as their Python counterparts.
+_NUMERIC_KINDS = "biuf"
+
+# Functions that have a NumPy ufunc equivalent, with the same semantics on
+# NumPy scalars.
+_UFUNC_NAMES = {
+    operator.add: "add",
+    operator.sub: "subtract",
+    operator.mul: "multiply",
+}
+
+# Ufuncs we use to accumulate: their output has the type of their inputs
+_ACCUMULATORS = {"add", "subtract", "multiply", "maximum", "minimum", "fmax", "fmin"}
+
+
+def _numpy() -> Any:
+    return sys.modules.get("numpy")
+
+
+def _view(coll: Any) -> Tuple[Any, bool]:
+    """
+    Return a NumPy view of ``coll``, and whether its elements should be
+    converted to Python numbers.
+    """
+    if isinstance(coll, array.array):
+        return _numpy().frombuffer(coll, dtype=coll.typecode), True
+    return coll, False
+
+
+def is_numeric_array(coll: Any) -> bool:
+    """
+    Test if ``coll`` can be handled by this module.
+    """
+    np = _numpy()
+    if np is None:
+        return False
+    if isinstance(coll, array.array):
+        return coll.typecode != "u"
+    # Exclude subclasses such as masked arrays
+    return type(coll) is np.ndarray and coll.ndim == 1 and coll.dtype.kind in _NUMERIC_KINDS
+
+
+def _chunks(arr: Any) -> Iterator[Any]:
+    for i in range(0, len(arr), CHUNK_SIZE):
+        yield arr[i:i + CHUNK_SIZE]
+
+
+def _elements(chunks: Iterable[Any], to_list: bool) -> Iterator:
+    # Chaining in C is faster than a generator
+    if to_list:
+        chunks = map(operator.methodcaller("tolist"), chunks)
+    return itertools.chain.from_iterable(chunks)
+
+
+def _slice(coll: Any, s: slice) -> Iterator:
+    arr, to_list = _view(coll)
+    # Slicing returns a view, so this doesn't copy anything
+    return _elements(_chunks(arr[s]), to_list)
+
+
+def take_nth(n: int, coll: Any) -> Iterator:
+    return _slice(coll, slice(None, None, n))
+
+
+def drop_last(n: int, coll: Any) -> Iterator:
+    return _slice(coll, slice(None, max(len(coll) - max(n, 0), 0)))
+
+
+def reverse(coll: Any) -> Iterator:
+    return _slice(coll, slice(None, None, -1))
+
+
+def _dedupe(arr: Any) -> Iterator[Any]:
+    np = _numpy()
+    for i in range(0, len(arr), CHUNK_SIZE):
+        chunk = arr[i:i + CHUNK_SIZE]
+        keep = np.empty(len(chunk), dtype=bool)
+        keep[0] = i == 0 or chunk[0] != arr[i - 1]
+        np.not_equal(chunk[1:], chunk[:-1], out=keep[1:])
+        yield chunk[keep]
+
+
+def dedupe(coll: Any) -> Iterator:
+    arr, to_list = _view(coll)
+    return _elements(_dedupe(arr), to_list)
+
+
+def _first_indices(arr: Any, with_counts: bool = False) -> Tuple[Any, Any]:
+    """
+    Return the sorted indices of the first occurrence of each value of
+    ``arr``, and the number of occurrences of these values if
+    ``with_counts`` is true.
+    """
+    np = _numpy()
+    if arr.dtype.kind in "biu" and len(arr):
+        lo, hi = int(arr.min()), int(arr.max())
+        if hi - lo <= 2 * len(arr):
+            # Small range: find the first index of each value in a table,
+            # which is a lot faster than sorting
+            if arr.dtype.kind == "u":
+                # Subtract first, as uint64 values may not fit in an int64
+                offsets = (arr - arr.dtype.type(lo)).astype(np.int64)
+            else:
+                offsets = arr.astype(np.int64) - lo
+            first = np.full(hi - lo + 1, len(arr))
+            np.minimum.at(first, offsets, np.arange(len(arr)))
+            present = first < len(arr)
+            indices = first[present]
+            counts = np.bincount(offsets, minlength=len(first))[present] if with_counts else None
+            return _sort_indices(indices, counts)
+
+    nan = np.isnan(arr) if arr.dtype.kind == "f" else None
+    if nan is None or not nan.any():
+        _, indices, counts = np.unique(arr, return_index=True, return_counts=True)
+    else:
+        # NaNs are all different from each other, but np.unique merges them
+        not_nan = np.flatnonzero(~nan)
+        _, indices, counts = np.unique(arr[not_nan], return_index=True, return_counts=True)
+        nan_indices = np.flatnonzero(nan)
+        indices = np.concatenate((not_nan[indices], nan_indices))
+        counts = np.concatenate((counts, np.ones(len(nan_indices), dtype=counts.dtype)))
+    return _sort_indices(indices, counts if with_counts else None)
+
+
+def _sort_indices(indices: Any, counts: Any) -> Tuple[Any, Any]:
+    if counts is None:
+        indices.sort()
+        return indices, None
+    order = indices.argsort()
+    return indices[order], counts[order]
+
+
+def distinct(coll: Any) -> Iterator:
+    arr, to_list = _view(coll)
+    # We need the whole array to know which elements come first
+    indices, _ = _first_indices(arr)
+    return _elements(_chunks(arr[indices]), to_list)
+
+
+def frequencies(coll: Any) -> Dict:
+    arr, to_list = _view(coll)
+    indices, counts = _first_indices(arr, with_counts=True)
+    values = arr[indices]
+    return dict(zip(values.tolist() if to_list else values, counts.tolist()))
+
+
+def windows(coll: Any, n: int, step: int, as_tuple: bool) -> Tuple[Iterator, List]:
+    """
+    Return an iterator of the partitions of ``n`` elements of ``coll``, at
+    offsets ``step`` apart, and a list of the elements after the last one.
+    """
+    np = _numpy()
+    arr, to_list = _view(coll)
+    count = max((len(arr) - n) // step + 1, 0)
+    rows = np.lib.stride_tricks.as_strided(arr, shape=(count, n), strides=(arr.strides[0] * step, arr.strides[0]),
+                                           writeable=False)
+    tail = arr[count * step:]
+    return _rows(rows, to_list, as_tuple), tail.tolist() if to_list else list(tail)
+
+
+def _rows(rows: Any, to_list: bool, as_tuple: bool) -> Iterator:
+    for chunk in _chunks(rows):
+        if to_list:
+            partitions = chunk.tolist()
+            yield from map(tuple, partitions) if as_tuple else partitions
+        else:
+            # Zipping the columns is a lot faster than iterating over the
+            # rows, which are arrays
+            partitions = zip(*chunk.T)
+            yield from partitions if as_tuple else map(list, partitions)
+
+
+def can_interleave(colls: Tuple) -> bool:
+    """
+    Test if ``colls`` can be interleaved by this module, i.e. they are all
+    NumPy arrays or all ``array.array``s, with the same type.
+    """
+    if len(colls) < 2 or not all(is_numeric_array(coll) for coll in colls):
+        return False
+    first = colls[0]
+    if isinstance(first, array.array):
+        return all(isinstance(coll, array.array) and coll.typecode == first.typecode for coll in colls)
+    return all(not isinstance(coll, array.array) and coll.dtype == first.dtype for coll in colls)
+
+
+def _interleave(arrs: List[Any]) -> Iterator[Any]:
+    np = _numpy()
+    size = min(len(arr) for arr in arrs)
+    for i in range(0, size, CHUNK_SIZE):
+        end = min(i + CHUNK_SIZE, size)
+        yield np.stack([arr[i:end] for arr in arrs], axis=1).ravel()
+
+
+def interleave(colls: Tuple) -> Iterator:
+    views = [_view(coll) for coll in colls]
+    return _elements(_interleave([arr for arr, _ in views]), views[0][1])
+
+
+def accumulator(f: Callable, coll: Any) -> Optional[Any]:
+    """
+    Return the NumPy ufunc equivalent to ``f`` on ``coll``, if there's one.
+    """
+    if not is_numeric_array(coll) or isinstance(coll, array.array) or coll.dtype.kind == "b":
+        # array.array elements are Python numbers, which may not overflow
+        # like NumPy ones do
+        return None
+    np = _numpy()
+    if isinstance(f, np.ufunc):
+        return f if f.__name__ in _ACCUMULATORS else None
+    name = _UFUNC_NAMES.get(f)
+    return getattr(np, name) if name else None
+
+
+def _reduce_chunks(f: Callable, ufunc: Any, arr: Any, init: Any, has_init: bool) -> Iterator[Iterable]:
+    if not len(arr):
+        yield [init if has_init else None]
+        return
+
+    if has_init:
+        acc = f(init, arr[0])
+        yield [init, acc]
+    else:
+        acc = arr[0]
+        yield [acc]
+
+    np = _numpy()
+    for i in range(1, len(arr), CHUNK_SIZE):
+        if not isinstance(acc, np.generic) or acc.dtype != arr.dtype:
+            # e.g. init is a float and arr contains integers: we can't tell
+            # the type of the results without calling f
+            yield _reduce_elements(f, acc, arr[i:])
+            return
+
+        # accumulate works sequentially, so we get the same results as with
+        # a loop, including for floats. Without dtype, it would use a larger
+        # type for small integers, like sum does.
+        chunk = np.concatenate((np.array([acc], dtype=arr.dtype), arr[i:i + CHUNK_SIZE]))
+        results = ufunc.accumulate(chunk, dtype=arr.dtype)
+        acc = results[-1]
+        yield results[1:]
+
+
+def _reduce_elements(f: Callable, acc: Any, coll: Iterable) -> Iterator:
+    for e in coll:
+        acc = f(acc, e)
+        yield acc
+
+
+def reductions(f: Callable, ufunc: Any, arr: Any, init: Any, has_init: bool) -> Iterator:
+    return itertools.chain.from_iterable(_reduce_chunks(f, ufunc, arr, init, has_init))
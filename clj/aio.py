@@ -0,0 +1,999 @@
+# -*- coding: UTF-8 -*-
+"""
+Asynchronous counterparts of the functions in ``clj.seqs``.
+
+All functions accept both sync and async iterables, and return async
+generators where ``clj.seqs`` returns generators. Functions that return a
+value in ``clj.seqs`` (``first``, ``count``, ``group_by``, etc.) are
+coroutines here. Functions passed as arguments may be coroutine functions;
+their results are awaited.
+
+    >>> async for e in take(3, distinct(map(fetch, ids))):
+    ...     print(e)
+"""
+import random
+import asyncio
+import collections
+import collections.abc as collections_abc
+
+from typing import (Any, AsyncGenerator, AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Dict, Hashable,
+                    Iterable, List, Optional, Sequence, Set, Tuple, TypeVar, Union, cast)
+
+from clj.seqs import empty, is_seq, merge_aggregates, merge_with  # noqa: F401 (they don't iterate over their argument)
+from clj.seqs import _partition_tail
+from clj.trackers import Tracker
+
+T = TypeVar('T')
+T2 = TypeVar('T2')
+
+AnyIterable = Union[Iterable[T], AsyncIterable[T]]
+
+# We use this as a default value for some arguments in order to check if they
+# were provided or not
+_nil = object()
+
+# We redefine `range` below so keep a reference to the original one here
+_range = range
+
+
+async def _from_iter(coll: Iterable[T]) -> AsyncIterator[T]:
+    for e in coll:
+        yield e
+
+
+def _aiter(coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async iterator over ``coll``, which may be sync or async.
+    """
+    if hasattr(coll, "__aiter__"):
+        return cast(AsyncIterable[T], coll).__aiter__()
+    return _from_iter(cast(Iterable[T], coll))
+
+
+async def _resolve(x: Union[T, Awaitable[T]]) -> T:
+    if hasattr(x, "__await__"):
+        return await cast(Awaitable[T], x)
+    return cast(T, x)
+
+
+async def _call(f: Callable[[T], Any], x: T) -> Any:
+    # f is called in the task, so that a task cancelled before it starts
+    # doesn't leave a coroutine that's never awaited
+    return await _resolve(f(x))
+
+
+# Note: in hot loops we don't call _resolve but inline its code to avoid
+# creating a coroutine for each element.
+
+async def distinct(coll: AnyIterable[T], key: Optional[Callable[[T], Hashable]] = None,
+                   tracker: Optional[Tracker] = None) -> AsyncIterator[T]:
+    """
+    Return an async generator of the elements of ``coll`` with duplicates removed.
+    See ``clj.distinct`` for ``key`` and ``tracker``.
+    """
+    seen = set()
+    async for e in _aiter(coll):
+        k: Any = e
+        if key is not None:
+            k = key(e)
+            if hasattr(k, "__await__"):
+                k = await k
+
+        if tracker is not None:
+            if tracker.add(k):
+                continue
+        elif k in seen:
+            continue
+        else:
+            seen.add(k)
+        yield e
+
+
+async def filter(pred: Callable[[T], Any], coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of the items in ``coll`` for which
+    ``pred(item)`` returns a truthy value.
+    """
+    async for e in _aiter(coll):
+        res = pred(e)
+        if hasattr(res, "__await__"):
+            res = await res
+        if res:
+            yield e
+
+
+async def remove(pred: Callable[[T], Any], coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of the items in ``coll`` for which
+    ``pred(item)`` returns a falsy value.
+    """
+    async for e in _aiter(coll):
+        res = pred(e)
+        if hasattr(res, "__await__"):
+            res = await res
+        if not res:
+            yield e
+
+
+async def keep(f: Callable[[T], Any], coll: AnyIterable[T]) -> AsyncIterator:
+    """
+    Return an async generator of the non-``None`` results of ``f(item)``.
+    """
+    async for e in _aiter(coll):
+        res = f(e)
+        if hasattr(res, "__await__"):
+            res = await res
+        if res is not None:
+            yield res
+
+
+async def keep_indexed(f: Callable[[int, T], Any], coll: AnyIterable[T]) -> AsyncIterator:
+    """
+    Return an async generator of the non-``None`` results of ``f(index, item)``.
+    """
+    i = 0
+    async for e in _aiter(coll):
+        res = f(i, e)
+        if hasattr(res, "__await__"):
+            res = await res
+        if res is not None:
+            yield res
+        i += 1
+
+
+async def cons(x: T2, seq: AnyIterable[T]) -> AsyncIterator[Union[T, T2]]:
+    """
+    Return an async generator where ``x`` is the first element and ``seq`` is
+    the rest.
+    """
+    yield x
+    async for e in _aiter(seq):
+        yield e
+
+
+async def concat(*xs: AnyIterable) -> AsyncIterator:
+    """
+    Return an async generator representing the concatenation of the elements
+    in the supplied colls.
+    """
+    for coll in xs:
+        async for e in _aiter(coll):
+            yield e
+
+
+async def map(f: Callable[..., Any], *colls: AnyIterable) -> AsyncIterator:
+    """
+    Return an async generator of the results of ``f`` applied to the first
+    items of each coll, then the second items, etc, until any coll is
+    exhausted.
+    """
+    if len(colls) == 1:
+        async for e in _aiter(colls[0]):
+            res = f(e)
+            if hasattr(res, "__await__"):
+                res = await res
+            yield res
+        return
+
+    iterators = [_aiter(coll) for coll in colls]
+    while True:
+        args = []
+        for it in iterators:
+            try:
+                args.append(await it.__anext__())
+            except StopAsyncIteration:
+                return
+
+        res = f(*args)
+        if hasattr(res, "__await__"):
+            res = await res
+        yield res
+
+
+async def amap(f: Callable[[T], Any], coll: AnyIterable[T], concurrency: int = 8, ordered: bool = True) \
+        -> AsyncGenerator[Any, None]:
+    """
+    Like ``map``, but run up to ``concurrency`` calls of ``f`` at once. This is
+    meant for I/O-bound coroutine functions, e.g. HTTP requests.
+
+    The elements of ``coll`` are read only as slots become available, so at
+    most ``concurrency`` results are pending at any time. The results are
+    yielded in order unless ``ordered=False``, in which case they're yielded as
+    soon as they're ready. If a call raises an exception, it is raised here.
+    The pending calls are cancelled when the generator is closed, either
+    explicitly with ``aclose()`` or when it’s garbage-collected because the
+    consumer stopped early.
+    """
+    if concurrency <= 0:
+        raise ValueError("concurrency must be positive")
+
+    it = _aiter(coll)
+    # Tasks in the order they were created
+    pending: Deque[asyncio.Future] = collections.deque()
+    # Tasks in the order they completed, if not ordered
+    completed: asyncio.Queue = asyncio.Queue()
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < concurrency:
+                try:
+                    e = await it.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                task: asyncio.Future = asyncio.ensure_future(_call(f, e))
+                if not ordered:
+                    task.add_done_callback(completed.put_nowait)
+                pending.append(task)
+
+            if not pending:
+                return
+
+            if ordered:
+                task = pending[0]
+                res = await task
+                pending.popleft()
+                yield res
+            else:
+                task = await completed.get()
+                pending.remove(task)
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def amapcat(f: Callable[[T], Any], coll: AnyIterable[T], concurrency: int = 8, ordered: bool = True) \
+        -> AsyncIterator:
+    """
+    Like ``mapcat``, but run up to ``concurrency`` calls of ``f`` at once. See
+    ``amap``.
+    """
+    results = amap(f, coll, concurrency=concurrency, ordered=ordered)
+    try:
+        async for res in results:
+            async for e in _aiter(res):
+                yield e
+    finally:
+        await results.aclose()
+
+
+async def akeep(f: Callable[[T], Any], coll: AnyIterable[T], concurrency: int = 8, ordered: bool = True) \
+        -> AsyncIterator:
+    """
+    Like ``keep``, but run up to ``concurrency`` calls of ``f`` at once. See
+    ``amap``.
+    """
+    results = amap(f, coll, concurrency=concurrency, ordered=ordered)
+    try:
+        async for res in results:
+            if res is not None:
+                yield res
+    finally:
+        await results.aclose()
+
+
+async def mapcat(f: Callable[..., Any], *colls: AnyIterable) -> AsyncIterator:
+    """
+    Return an async generator representing the result of applying concat to
+    the result of applying ``map`` to ``f`` and ``colls``. Thus function ``f``
+    should return a (sync or async) collection.
+    """
+    async for coll in map(f, *colls):
+        async for e in _aiter(coll):
+            yield e
+
+
+async def cycle(coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an (infinite!) async generator which yields repetitions of the
+    items in ``coll``.
+    """
+    els = []
+    async for e in _aiter(coll):
+        yield e
+        els.append(e)
+
+    if not els:
+        return
+
+    while True:
+        for e in els:
+            yield e
+
+
+async def interleave(*colls: AnyIterable) -> AsyncIterator:
+    """
+    Return an async generator of the first item in each coll, then the second
+    etc.
+    """
+    iterators = [_aiter(coll) for coll in colls]
+    if not iterators:
+        return
+
+    while True:
+        values = []
+        for it in iterators:
+            try:
+                values.append(await it.__anext__())
+            except StopAsyncIteration:
+                return
+        for v in values:
+            yield v
+
+
+async def interpose(sep: T2, coll: AnyIterable[T]) -> AsyncIterator[Union[T, T2]]:
+    """
+    Return an async generator of the elements of ``coll`` separated by ``sep``.
+    """
+    first_ = True
+    async for e in _aiter(coll):
+        if first_:
+            first_ = False
+        else:
+            yield sep
+
+        yield e
+
+
+def rest(coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return a possibly empty async generator of the items after the first.
+    """
+    return drop(1, coll)
+
+
+async def drop(n: int, coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of all but the first ``n`` items in ``coll``.
+    """
+    if coll is None:
+        return
+
+    it = _aiter(coll)
+    for _ in _range(n):
+        try:
+            await it.__anext__()
+        except StopAsyncIteration:
+            return
+
+    async for e in it:
+        yield e
+
+
+async def drop_while(pred: Callable[[T], Any], coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of the items in ``coll`` starting from the first
+    item for which ``pred(item)`` returns a falsy value.
+    """
+    dropping = True
+    async for e in _aiter(coll):
+        if dropping:
+            res = pred(e)
+            if hasattr(res, "__await__"):
+                res = await res
+            if res:
+                continue
+            dropping = False
+        yield e
+
+
+async def take(n: int, coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of the first ``n`` items in ``coll``, or all
+    items if there are fewer than ``n``.
+    """
+    if n <= 0:
+        return
+
+    i = 0
+    async for e in _aiter(coll):
+        yield e
+        i += 1
+        if i >= n:
+            break
+
+
+async def take_nth(n: int, coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of every ``n``th item in ``coll``.
+    """
+    if n <= 0:
+        async for e in _aiter(coll):
+            while True:
+                yield e
+
+    i = 0
+    async for e in _aiter(coll):
+        if i % n == 0:
+            yield e
+        i += 1
+
+
+async def take_while(pred: Callable[[T], Any], coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of successive items from ``coll`` while
+    ``pred(item)`` returns a truthy value.
+    """
+    async for e in _aiter(coll):
+        res = pred(e)
+        if hasattr(res, "__await__"):
+            res = await res
+        if not res:
+            break
+        yield e
+
+
+async def butlast(coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of all but the last item in ``coll``.
+    """
+    first_ = True
+    last_e: Optional[T] = None
+    async for e in _aiter(coll):
+        if first_:
+            last_e = e
+            first_ = False
+            continue
+
+        yield cast(T, last_e)
+        last_e = e
+
+
+async def drop_last(n: int, coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of all but the last ``n`` items in ``coll``.
+    """
+    queue: Deque[T] = collections.deque()
+    size = 0
+
+    async for e in _aiter(coll):
+        queue.append(e)
+
+        if size < n:
+            size += 1
+            continue
+
+        yield queue.popleft()
+
+
+async def flatten(x: AnyIterable, max_depth: Optional[int] = None, leaf_types: Tuple[type, ...] = (bytes, str)) \
+        -> AsyncIterator:
+    """
+    Take any nested combination of sync and async iterables and return their
+    contents as a single, flat async generator. See ``clj.flatten`` for
+    ``max_depth`` and ``leaf_types``.
+    """
+    max_stack = -1 if max_depth is None else max(max_depth, 0) + 1
+    iterable_class = collections_abc.Iterable
+    stack = [_aiter(x)]
+    while stack:
+        try:
+            e = await stack[-1].__anext__()
+        except StopAsyncIteration:
+            stack.pop()
+            continue
+
+        if (hasattr(e, "__aiter__") or (isinstance(e, iterable_class) and not isinstance(e, leaf_types))) \
+                and len(stack) != max_stack:
+            stack.append(_aiter(e))
+        else:
+            yield e
+
+
+async def reverse(coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of the items in ``coll`` in reverse order. Not
+    lazy.
+    """
+    for e in reversed([e async for e in _aiter(coll)]):
+        yield e
+
+
+async def shuffle(coll: AnyIterable[T]) -> List[T]:
+    """
+    Return a random permutation of ``coll``.
+    """
+    els = [e async for e in _aiter(coll)]
+    random.shuffle(els)
+    return els
+
+
+async def split_at(n: int, coll: AnyIterable[T]) -> Tuple[List[T], AsyncIterator[T]]:
+    """
+    Return a tuple of ``(taken, rest)`` where ``taken`` is a list of the first
+    ``n`` items and ``rest`` an async iterator of the remaining ones.
+    """
+    it = _aiter(coll if coll is not None else [])
+    taken = []
+    if n > 0:
+        async for e in it:
+            taken.append(e)
+            if len(taken) >= n:
+                break
+
+    return taken, it
+
+
+async def split_with(pred: Callable[[T], Any], coll: AnyIterable[T]) -> Tuple[List[T], AsyncIterator[T]]:
+    """
+    Return a tuple of ``(taken, rest)`` where ``taken`` is a list of the items
+    for which ``pred(item)`` is truthy and ``rest`` an async iterator of the
+    remaining ones.
+    """
+    it = _aiter(coll)
+    taken = []
+    async for e in it:
+        if await _resolve(pred(e)):
+            taken.append(e)
+        else:
+            return taken, cons(e, it)
+
+    return taken, _from_iter([])
+
+
+async def replace(smap: Dict[T, T2], coll: AnyIterable[T]) -> AsyncIterator[Union[T, T2]]:
+    """
+    Return an async generator where any element that’s a key in ``smap`` is
+    replaced with the corresponding value in ``smap``.
+    """
+    get = smap.get
+    async for e in _aiter(coll):
+        yield get(e, e)
+
+
+async def reductions(f: Callable[[Any, T], Any], coll: AnyIterable[T], init: Any = _nil) -> AsyncIterator:
+    """
+    Yield the intermediate values of the reduction of ``coll`` by ``f``,
+    starting with ``init``.
+    """
+    it = _aiter(coll)
+    if init is _nil:
+        try:
+            acc = await it.__anext__()
+        except StopAsyncIteration:
+            yield None
+            return
+    else:
+        acc = init
+
+    yield acc
+
+    async for e in it:
+        acc = f(acc, e)
+        if hasattr(acc, "__await__"):
+            acc = await acc
+        yield acc
+
+
+async def map_indexed(f: Callable[[int, T], Any], coll: AnyIterable[T]) -> AsyncIterator:
+    """
+    Return an async generator of ``f(0, first item)``, ``f(1, second item)``,
+    etc.
+    """
+    i = 0
+    async for e in _aiter(coll):
+        res = f(i, e)
+        if hasattr(res, "__await__"):
+            res = await res
+        yield res
+        i += 1
+
+
+async def first(coll: AnyIterable[T]) -> Optional[T]:
+    """
+    Return the first item in ``coll``, or ``None`` if it’s empty.
+    """
+    if coll is None:
+        return None
+    try:
+        return await _aiter(coll).__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+async def ffirst(x: AnyIterable[AnyIterable[T]]) -> Optional[T]:
+    """
+    Same as ``first(first(x))``.
+    """
+    f = await first(x)
+    if f is None:
+        return None
+    return await first(f)
+
+
+async def nfirst(x: AnyIterable[AnyIterable[T]]) -> AsyncIterator[T]:
+    """
+    Same as ``rest(first(x))``.
+    """
+    f = await first(x)
+    if f is None:
+        return
+    async for e in rest(f):
+        yield e
+
+
+async def second(coll: AnyIterable[T]) -> Optional[T]:
+    """
+    Same as ``first(rest(coll))``.
+    """
+    return await first(rest(coll))
+
+
+async def nth(coll: AnyIterable[T], n: int, not_found: Any = _nil) -> Any:
+    """
+    Return the value at the index ``n``. Raise an ``IndexError`` if the index
+    is out of bounds, unless ``not_found`` is supplied.
+    """
+    if n >= 0:
+        if hasattr(coll, "__getitem__"):
+            try:
+                return cast(list, coll)[n]
+            except IndexError:
+                if not_found is not _nil:
+                    return not_found
+                raise
+
+        i = 0
+        async for e in _aiter(coll):
+            if i == n:
+                return e
+            i += 1
+
+    if not_found is _nil:
+        raise IndexError("%s index out of range" % type(coll))
+
+    return not_found
+
+
+async def last(coll: AnyIterable[T]) -> Optional[T]:
+    """
+    Return the last item in ``coll``, or ``None`` if it’s empty.
+    """
+    e = None
+    async for item in _aiter(coll):
+        e = item
+    return e
+
+
+async def zipmap(keys: AnyIterable[T], vals: AnyIterable[T2]) -> Dict[T, T2]:
+    """
+    Return a ``dict`` with the keys mapped to the corresponding ``vals``.
+    """
+    return {k: v async for k, v in map(lambda k, v: (k, v), keys, vals)}
+
+
+async def group_by(f: Callable[[T], Any], coll: AnyIterable[T]) -> Dict[Any, List[T]]:
+    """
+    Return a ``dict`` of the elements of ``coll`` keyed by the result of ``f``
+    on each element.
+    """
+    groups: Dict[Any, List[T]] = collections.defaultdict(list)
+    async for e in _aiter(coll):
+        k = f(e)
+        if hasattr(k, "__await__"):
+            k = await k
+        groups[k].append(e)
+
+    return dict(groups)
+
+
+async def reduce_by(keyfn: Callable[[T], Any], f: Callable[[Any, T], Any], coll: AnyIterable[T], init: Any = _nil) \
+        -> Dict[Any, Any]:
+    """
+    Return a ``dict`` of the reductions by ``f`` of the elements of ``coll``
+    that have the same ``keyfn``. See ``clj.reduce_by``.
+    """
+    acc: Dict[Any, Any] = {}
+    async for e in _aiter(coll):
+        k = keyfn(e)
+        if hasattr(k, "__await__"):
+            k = await k
+        value = acc.get(k, init)
+        if value is _nil:
+            acc[k] = e
+            continue
+        value = f(value, e)
+        if hasattr(value, "__await__"):
+            value = await value
+        acc[k] = value
+    return acc
+
+
+async def frequencies(coll: AnyIterable[T]) -> Dict[T, int]:
+    """
+    Return a ``dict`` of the distinct elements of ``coll`` to the number of
+    times they appear.
+    """
+    counts: Dict[T, int] = {}
+    async for e in _aiter(coll):
+        counts[e] = counts.get(e, 0) + 1
+    return counts
+
+
+async def aggregate_by(keyfn: Callable[[T], Any], aggregates: Dict[str, Tuple], coll: AnyIterable[T]) \
+        -> Dict[Any, Dict[str, Any]]:
+    """
+    Like ``reduce_by`` with several reductions at once. See
+    ``clj.aggregate_by``.
+    """
+    names = list(aggregates)
+    fs = [aggregate[0] for aggregate in aggregates.values()]
+    inits = [aggregate[1] for aggregate in aggregates.values()]
+
+    acc: Dict[Any, List] = {}
+    async for e in _aiter(coll):
+        k = keyfn(e)
+        if hasattr(k, "__await__"):
+            k = await k
+        values = acc.get(k)
+        if values is None:
+            values = acc[k] = list(inits)
+        for i, f in enumerate(fs):
+            value = f(values[i], e)
+            if hasattr(value, "__await__"):
+                value = await value
+            values[i] = value
+
+    return {k: dict(zip(names, values)) for k, values in acc.items()}
+
+
+def _make_pred(pred: Union[Callable[[T], Any], Set[T]]) -> Callable[[T], Any]:
+    if isinstance(pred, set):
+        return cast(Set[T], pred).__contains__
+    return pred
+
+
+async def some(pred: Union[Callable[[T], Any], Set[T]], coll: AnyIterable[T]) -> Optional[T]:
+    """
+    Return the first element ``x`` of ``coll`` for which ``pred(x)`` is logical
+    true, else ``None``. ``pred`` may also be a set.
+    """
+    pred = _make_pred(pred)
+    async for e in _aiter(coll):
+        res = pred(e)
+        if hasattr(res, "__await__"):
+            res = await res
+        if res:
+            return e
+    return None
+
+
+async def every(pred: Union[Callable[[T], Any], Set[T]], coll: AnyIterable[T]) -> bool:
+    """
+    Return ``True`` if ``pred(x)`` is logical true for every ``x`` in
+    ``coll``, else ``False``.
+    """
+    pred = _make_pred(pred)
+    async for e in _aiter(coll):
+        res = pred(e)
+        if hasattr(res, "__await__"):
+            res = await res
+        if not res:
+            return False
+    return True
+
+
+async def not_every(pred: Union[Callable[[T], Any], Set[T]], coll: AnyIterable[T]) -> bool:
+    """
+    Return ``False`` if ``pred(x)`` is logical true for every ``x`` in
+    ``coll``, else ``True``.
+    """
+    return not await every(pred, coll)
+
+
+async def not_any(pred: Union[Callable[[T], Any], Set[T]], coll: AnyIterable[T]) -> bool:
+    """
+    Return ``False`` if ``pred(x)`` is logical true for any ``x`` in ``coll``,
+    else ``True``.
+    """
+    return await some(pred, coll) is None
+
+
+async def dorun(coll: AnyIterable) -> None:
+    """
+    Walk through ``coll`` to force any side effects, without retaining the
+    head.
+    """
+    async for _ in _aiter(coll):
+        pass
+
+
+async def repeatedly(f: Callable[[], Any], n: Optional[int] = None) -> AsyncIterator:
+    """
+    Return an infinite (or length ``n`` if supplied) async generator of calls
+    to ``f``.
+    """
+    if n is None:
+        n = -1
+
+    while n != 0:
+        res = f()
+        if hasattr(res, "__await__"):
+            res = await res
+        yield res
+        n -= 1
+
+
+async def iterate(f: Callable[[Any], Any], x: Any) -> AsyncIterator:
+    """
+    Return an async generator of ``x``, ``f(x)``, ``f(f(x))``, etc.
+    """
+    while True:
+        yield x
+        x = f(x)
+        if hasattr(x, "__await__"):
+            x = await x
+
+
+async def repeat(x: T, n: Optional[int] = None) -> AsyncIterator[T]:
+    """
+    Return an async generator that indefinitely yields ``x`` (or ``n`` times if
+    ``n`` is supplied).
+    """
+    if n is None:
+        while True:
+            yield x
+
+    for _ in _range(n):
+        yield x
+
+
+async def range(*args: int) -> AsyncIterator[int]:
+    """
+    Async version of ``clj.range``: with no arguments, return an infinite
+    async generator of numbers starting at ``0``.
+    """
+    if args:
+        for e in _range(*args):
+            yield e
+        return
+
+    n = 0
+    while True:
+        yield n
+        n += 1
+
+
+async def tree_seq(has_branch: Callable[[Any], Any], get_children: Callable[[Any], Any], root: Any, bfs: bool = False,
+                   max_depth: Optional[int] = None, unique: bool = False) -> AsyncIterator:
+    """
+    Return an async generator of the nodes in a tree, via a depth-first walk.
+    ``get_children`` may return a sync or async iterable. See
+    ``clj.tree_seq`` for the other arguments.
+    """
+    if max_depth is not None:
+        max_depth = max(max_depth, 0)
+
+    seen: Dict[int, Any] = {}
+
+    # Iterators of nodes, with their depth. This is a stack for a depth-first
+    # walk, and a queue for a breadth-first one.
+    pending: Deque[Tuple[AsyncIterator, int]] = collections.deque([(_from_iter([root]), 0)])
+    while pending:
+        nodes, depth = pending[0] if bfs else pending[-1]
+        try:
+            node = await nodes.__anext__()
+        except StopAsyncIteration:
+            if bfs:
+                pending.popleft()
+            else:
+                pending.pop()
+            continue
+
+        if unique:
+            if id(node) in seen:
+                continue
+            seen[id(node)] = node
+
+        yield node
+        if depth != max_depth and await _resolve(has_branch(node)):
+            pending.append((_aiter(await _resolve(get_children(node))), depth + 1))
+
+
+async def dedupe(coll: AnyIterable[T]) -> AsyncIterator[T]:
+    """
+    Return an async generator of the elements of ``coll`` with consecutive
+    duplicates removed.
+    """
+    initial = True
+    prev = None
+    async for e in _aiter(coll):
+        if initial or e != prev:
+            initial = False
+            yield e
+        prev = e
+
+
+async def count(coll: AnyIterable) -> int:
+    """
+    Return the number of items in ``coll``.
+    """
+    if hasattr(coll, "__len__"):
+        return len(cast(list, coll))
+
+    n = 0
+    async for _ in _aiter(coll):
+        n += 1
+    return n
+
+
+async def _partition(coll: AnyIterable, n: int, step: Optional[int], pad: Optional[Iterable], all_: bool,
+                     as_tuple: bool) -> AsyncIterator:
+    if step is None:
+        step = n
+    if n <= 0 or step <= 0:
+        return
+
+    make: Callable[[Iterable], Any] = tuple if as_tuple else list
+    window: Deque = collections.deque(maxlen=n)
+    # Number of elements to read before the next partition, and to skip when
+    # step > n
+    wait = n
+    skip = 0
+    async for element in _aiter(coll):
+        if skip:
+            skip -= 1
+            continue
+
+        window.append(element)
+        wait -= 1
+        if wait == 0:
+            yield make(window)
+            if step >= n:
+                window.clear()
+                skip = step - n
+                wait = n
+            else:
+                wait = step
+
+    # The next partition starts with the last n-wait elements
+    tail = list(window)[len(window) - (n - wait):]
+    for p in _partition_tail(tail, n, step, pad, all_, make):
+        yield p
+
+
+async def partition(coll: AnyIterable[T], n: int, step: Optional[int] = None, pad: Optional[Iterable[T2]] = None,
+                    as_tuple: bool = False) -> AsyncIterator[Sequence[Union[T, T2]]]:
+    """
+    Async version of ``clj.partition``.
+    """
+    async for p in _partition(coll, n, step, pad, False, as_tuple):
+        yield p
+
+
+async def partition_all(coll: AnyIterable[T], n: int, step: Optional[int] = None, as_tuple: bool = False) \
+        -> AsyncIterator[Sequence[T]]:
+    """
+    Async version of ``clj.partition_all``.
+    """
+    async for p in _partition(coll, n, step, None, True, as_tuple):
+        yield p
+
+
+async def partition_by(f: Callable[[T], Any], coll: AnyIterable[T]) -> AsyncIterator[List[T]]:
+    """
+    Return an async generator of lists of consecutive elements of ``coll``
+    for which ``f`` returns the same value.
+    """
+    current: List[T] = []
+    current_value = None
+    async for element in _aiter(coll):
+        value = f(element)
+        if hasattr(value, "__await__"):
+            value = await value
+
+        if not current or value == current_value:
+            current_value = value
+            current.append(element)
+            continue
+
+        yield current
+        current = [element]
+        current_value = value
+
+    if current:
+        yield current
@@ -0,0 +1,824 @@
+# -*- coding: UTF-8 -*-
+"""
+Channels, like Clojure’s core.async (``async`` is a keyword in Python, hence
+the name of the module). A channel passes values between threads and
+coroutines, with an optional buffer:
+
+    >>> from clj import async_ as a
+    >>> ch = a.chan(100)
+    >>> a.put(ch, 42)      # >!! in core.async
+    True
+    >>> a.take(ch)         # <!!
+    42
+    >>> await a.atake(ch)  # <! in a coroutine
+
+========================  ==========================  ======================================
+core.async                ``clj.async_``              Comment
+========================  ==========================  ======================================
+``chan``                  ``chan``                    ``chan(n_or_buffer, xf, ex_handler)``
+``buffer``, …             ``buffer``, …               Also ``dropping_buffer`` and
+                                                      ``sliding_buffer``
+``>!!``, ``<!!``          ``put``, ``take``           Wait in the current thread
+``>!``, ``<!``            ``aput``, ``atake``         Coroutines, for ``asyncio``
+``offer!``, ``poll!``     ``offer``, ``poll``         Never wait
+``alts!!``, ``alts!``     ``alts``, ``aalts``         Return ``(value, channel)``
+``close!``                ``Channel.close``
+``timeout``               ``timeout``                 In seconds
+``onto-chan!!``           ``onto_chan``
+``to-chan!!``             ``to_chan``
+``pipeline``              ``pipeline``                On threads
+========================  ==========================  ======================================
+
+``None`` can't be put on a channel: taking from a channel that's closed and
+empty returns ``None``. Channels are iterable, with ``for`` and
+``async for``, until they're closed and empty; they can be used with
+``clj.seqs`` and ``clj.aio``.
+"""
+import asyncio
+import collections
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from typing import (Any, AsyncIterator, Callable, Deque, Iterable, Iterator, List, Optional, Sequence, Tuple, Union,
+                    cast)
+
+from clj.transducers import Transducer, is_reduced, into
+
+logger = logging.getLogger(__name__)
+
+# We use this as a default value for some arguments in order to check if they
+# were provided or not
+_nil = object()
+
+# Number of operations a channel queues between two purges of the ones that
+# were completed by another channel of ``alts``, like core.async's MAX-DIRTY
+_MAX_DIRTY = 64
+
+
+class Buffer:
+    """
+    Buffer of up to ``n`` values: puts wait when it's full.
+    """
+
+    def __init__(self, n: int):
+        if n <= 0:
+            raise ValueError("n must be positive")
+        self.n = n
+        self._values: Deque = collections.deque()
+
+    def full(self) -> bool:
+        return len(self._values) >= self.n
+
+    def add(self, x: Any) -> None:
+        self._values.append(x)
+
+    def remove(self) -> Any:
+        return self._values.popleft()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self):
+        return "<%s %d/%d>" % (type(self).__name__, len(self), self.n)
+
+
+class DroppingBuffer(Buffer):
+    """
+    Buffer of up to ``n`` values that drops the new ones when it's full, so
+    that puts never wait.
+    """
+
+    def full(self) -> bool:
+        return False
+
+    def add(self, x: Any) -> None:
+        if len(self._values) < self.n:
+            self._values.append(x)
+
+
+class SlidingBuffer(Buffer):
+    """
+    Buffer of up to ``n`` values that drops the oldest ones when it's full, so
+    that puts never wait.
+    """
+
+    def __init__(self, n: int):
+        super().__init__(n)
+        self._values = collections.deque(maxlen=n)
+
+    def full(self) -> bool:
+        return False
+
+
+def buffer(n: int) -> Buffer:
+    """
+    Return a buffer of ``n`` values, for ``chan``.
+    """
+    return Buffer(n)
+
+
+def dropping_buffer(n: int) -> DroppingBuffer:
+    """
+    Return a buffer of ``n`` values that drops the new ones when it's full.
+    """
+    return DroppingBuffer(n)
+
+
+def sliding_buffer(n: int) -> SlidingBuffer:
+    """
+    Return a buffer of ``n`` values that drops the oldest ones when it's full.
+    """
+    return SlidingBuffer(n)
+
+
+def _log_exception(e: Exception) -> None:
+    logger.error("Exception in a channel transducer", exc_info=e)
+
+
+class _Flag:
+    # Whether an operation is still pending. The operations of alts share
+    # one, with a lock since several channels may try to complete it at once.
+    __slots__ = ("active", "lock")
+
+    def __init__(self, shared: bool):
+        self.active = True
+        self.lock = threading.Lock() if shared else None
+
+
+class _Handler:
+    # A pending operation: its flag, and the function called with its result
+    __slots__ = ("flag", "callback")
+
+    def __init__(self, flag: _Flag, callback: Callable[[Any], None]):
+        self.flag = flag
+        self.callback = callback
+
+
+def _commit(a: _Flag, b: Optional[_Flag] = None) -> bool:
+    """
+    Mark the operations of ``a`` and ``b`` as completed and return ``True``
+    if both are still pending, else return ``False``.
+    """
+    if b is None and a.lock is None:
+        # The common case, under the lock of the channel
+        if not a.active:
+            return False
+        a.active = False
+        return True
+    locks = [flag.lock for flag in (a, b) if flag is not None and flag.lock is not None]
+    # Always in the same order, so that two channels don't deadlock
+    locks.sort(key=id)
+    for lock in locks:
+        lock.acquire()
+    try:
+        if not a.active or (b is not None and not b.active):
+            return False
+        a.active = False
+        if b is not None:
+            b.active = False
+        return True
+    finally:
+        for lock in locks:
+            lock.release()
+
+
+def _buffer_rf(buf: Buffer, x: Any = _nil) -> Buffer:
+    # Reducing function of the transducer of a channel
+    if x is not _nil:
+        buf.add(x)
+    return buf
+
+
+class Channel:
+    """
+    A channel; see ``chan``.
+    """
+
+    def __init__(self, buf: Optional[Buffer] = None, xf: Optional[Transducer] = None,
+                 ex_handler: Optional[Callable[[Exception], Any]] = None):
+        if xf is not None and buf is None:
+            raise ValueError("A channel with a transducer needs a buffer")
+        self._buf = buf
+        self._add = None if xf is None else xf(_buffer_rf)
+        self._ex_handler = ex_handler or _log_exception
+        self._lock = threading.Lock()
+        self._takes: Deque[_Handler] = collections.deque()
+        self._puts: Deque[Tuple[_Handler, Any]] = collections.deque()
+        self._dirty_takes = 0
+        self._dirty_puts = 0
+        self._closed = False
+        # Whether the completion step of the transducer was run
+        self._completed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __repr__(self):
+        return "<Channel %s%s>" % (self._buf if self._buf is not None else "unbuffered",
+                                   " closed" if self._closed else "")
+
+    def __iter__(self) -> Iterator:
+        while True:
+            value = take(self)
+            if value is None:
+                return
+            yield value
+
+    async def __aiter__(self) -> AsyncIterator:
+        while True:
+            value = await atake(self)
+            if value is None:
+                return
+            yield value
+
+    def close(self) -> None:
+        """
+        Close the channel: puts return ``False``, and takes return ``None``
+        once the values in its buffer and the pending puts are taken.
+        """
+        deliveries: List[Tuple[Callable, Any]] = []
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._puts = collections.deque((h, v) for h, v in self._puts if h.flag.active)
+            # Otherwise, the pending puts go through the transducer first
+            if not self._puts:
+                self._complete()
+            self._deliver_buffered(deliveries)
+            # There are no values for the remaining takes
+            while self._takes:
+                taker = self._takes.popleft()
+                if _commit(taker.flag):
+                    deliveries.append((taker.callback, None))
+        _deliver(deliveries)
+
+    def _handle(self, e: Exception) -> None:
+        value = self._ex_handler(e)
+        if value is not None:
+            cast(Buffer, self._buf).add(value)
+
+    def _complete(self) -> None:
+        if self._add is not None and not self._completed:
+            self._completed = True
+            try:
+                self._add(self._buf)
+            except Exception as e:
+                self._handle(e)
+
+    def _add_value(self, value: Any, deliveries: List[Tuple[Callable, Any]]) -> None:
+        buf = cast(Buffer, self._buf)
+        if self._add is None:
+            buf.add(value)
+            return
+        try:
+            done = is_reduced(self._add(buf, value))
+        except Exception as e:
+            done = False
+            self._handle(e)
+        if done:
+            # The transducer ended: the pending puts are dropped, like in
+            # core.async
+            self._closed = True
+            while self._puts:
+                putter, _ = self._puts.popleft()
+                if _commit(putter.flag):
+                    deliveries.append((putter.callback, True))
+            self._complete()
+
+    def _move_puts(self, deliveries: List[Tuple[Callable, Any]]) -> None:
+        # Move the pending puts to the buffer, through the transducer
+        buf = cast(Buffer, self._buf)
+        puts = self._puts
+        while puts and not buf.full():
+            putter, value = puts.popleft()
+            if _commit(putter.flag):
+                deliveries.append((putter.callback, True))
+                self._add_value(value, deliveries)
+        if self._closed and not puts:
+            self._complete()
+
+    def _deliver_buffered(self, deliveries: List[Tuple[Callable, Any]]) -> None:
+        # Give the values of the buffer to the pending takes
+        buf = self._buf
+        takes = self._takes
+        while takes and buf:
+            taker = takes.popleft()
+            if _commit(taker.flag):
+                deliveries.append((taker.callback, buf.remove()))
+
+    def _put(self, handler: _Handler, value: Any, wait: bool = True) -> Optional[Tuple[bool]]:
+        """
+        Put ``value``, and return a tuple of the result if the put is done.
+        Otherwise, queue it if ``wait`` and return ``None``.
+        """
+        if value is None:
+            raise ValueError("Can't put None on a channel")
+        deliveries: List[Tuple[Callable, Any]] = []
+        with self._lock:
+            result = self._put_locked(handler, value, wait, deliveries)
+        _deliver(deliveries)
+        return result
+
+    def _put_locked(self, handler: _Handler, value: Any, wait: bool, deliveries: List[Tuple[Callable, Any]]) \
+            -> Optional[Tuple[bool]]:
+        if self._closed:
+            return (False,) if _commit(handler.flag) else None
+
+        buf = self._buf
+        if buf is not None and not buf.full():
+            if not _commit(handler.flag):
+                return None
+            self._add_value(value, deliveries)
+            self._deliver_buffered(deliveries)
+            if self._closed:
+                while self._takes:
+                    taker = self._takes.popleft()
+                    if _commit(taker.flag):
+                        deliveries.append((taker.callback, None))
+            return (True,)
+
+        # Give the value to a pending take: there's none if the buffer isn't
+        # empty
+        takes = self._takes
+        own: List = []
+        try:
+            while takes:
+                taker = takes.popleft()
+                if taker.flag is handler.flag:
+                    # alts taking from the channel it puts on
+                    own.append(taker)
+                elif _commit(handler.flag, taker.flag):
+                    deliveries.append((taker.callback, value))
+                    return (True,)
+                elif not handler.flag.active:
+                    takes.appendleft(taker)
+                    return None
+        finally:
+            takes.extendleft(reversed(own))
+
+        if wait:
+            self._dirty_puts += 1
+            if self._dirty_puts >= _MAX_DIRTY:
+                self._dirty_puts = 0
+                self._puts = collections.deque((h, v) for h, v in self._puts if h.flag.active)
+            self._puts.append((handler, value))
+        return None
+
+    def _take(self, handler: _Handler, wait: bool = True) -> Optional[Tuple[Any]]:
+        """
+        Take a value, and return it in a tuple if the take is done. Otherwise,
+        queue it if ``wait`` and return ``None``.
+        """
+        deliveries: List[Tuple[Callable, Any]] = []
+        with self._lock:
+            result = self._take_locked(handler, wait, deliveries)
+        _deliver(deliveries)
+        return result
+
+    def _take_locked(self, handler: _Handler, wait: bool, deliveries: List[Tuple[Callable, Any]]) \
+            -> Optional[Tuple[Any]]:
+        buf = self._buf
+        if buf is not None:
+            if not buf and self._puts:
+                # The transducer dropped the values of the puts moved before
+                self._move_puts(deliveries)
+            if buf:
+                if not _commit(handler.flag):
+                    return None
+                value = buf.remove()
+                self._move_puts(deliveries)
+                return (value,)
+
+        # Take the value of a pending put, for unbuffered channels
+        puts = self._puts
+        own: List = []
+        try:
+            while puts:
+                putter, put_value = puts.popleft()
+                if putter.flag is handler.flag:
+                    own.append((putter, put_value))
+                elif _commit(handler.flag, putter.flag):
+                    deliveries.append((putter.callback, True))
+                    return (put_value,)
+                elif not handler.flag.active:
+                    puts.appendleft((putter, put_value))
+                    return None
+        finally:
+            puts.extendleft(reversed(own))
+
+        if self._closed:
+            return (None,) if _commit(handler.flag) else None
+
+        if wait:
+            self._dirty_takes += 1
+            if self._dirty_takes >= _MAX_DIRTY:
+                self._dirty_takes = 0
+                self._takes = collections.deque(h for h in self._takes if h.flag.active)
+            self._takes.append(handler)
+        return None
+
+
+def _deliver(deliveries: List[Tuple[Callable, Any]]) -> None:
+    # Called without the lock of the channel, since the callbacks may use
+    # other channels
+    for callback, value in deliveries:
+        callback(value)
+
+
+def chan(buf_or_n: Union[Buffer, int, None] = None, xf: Optional[Transducer] = None,
+         ex_handler: Optional[Callable[[Exception], Any]] = None) -> Channel:
+    """
+    Return a new channel, unbuffered by default: a put then waits for a take,
+    and vice versa. ``buf_or_n`` is a buffer or a number of values for a
+    fixed buffer.
+
+    ``xf`` is a transducer applied to the values put on the channel, which
+    then needs a buffer. If it raises an exception, ``ex_handler`` is called
+    with it and its result is put on the channel unless it's ``None``; by
+    default, the exception is logged.
+    """
+    if isinstance(buf_or_n, int):
+        buf_or_n = Buffer(buf_or_n) if buf_or_n else None
+    return Channel(buf_or_n, xf, ex_handler)
+
+
+class _Waiter:
+    # Callback that wakes up the thread waiting for the result of an
+    # operation
+    __slots__ = ("_lock", "value")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._lock.acquire()
+        self.value: Any = None
+
+    def __call__(self, value: Any) -> None:
+        self.value = value
+        self._lock.release()
+
+    def wait(self) -> Any:
+        self._lock.acquire()
+        return self.value
+
+
+def put(ch: Channel, value: Any) -> bool:
+    """
+    Put ``value`` on ``ch``, waiting for room if needed. Return ``False`` if
+    the channel is closed, else ``True``.
+    """
+    # Without creating a waiter when the put can be done right away
+    result = ch._put(_Handler(_Flag(False), _noop), value, wait=False)
+    if result is None:
+        waiter = _Waiter()
+        result = ch._put(_Handler(_Flag(False), waiter), value)
+        if result is None:
+            return waiter.wait()
+    return result[0]
+
+
+def take(ch: Channel) -> Any:
+    """
+    Take a value from ``ch``, waiting for one if needed. Return ``None`` if
+    the channel is closed and empty.
+    """
+    result = ch._take(_Handler(_Flag(False), _noop), wait=False)
+    if result is None:
+        waiter = _Waiter()
+        result = ch._take(_Handler(_Flag(False), waiter))
+        if result is None:
+            return waiter.wait()
+    return result[0]
+
+
+def offer(ch: Channel, value: Any) -> bool:
+    """
+    Put ``value`` on ``ch`` if it can be done right away, and return
+    ``True`` if it was.
+    """
+    result = ch._put(_Handler(_Flag(False), _noop), value, wait=False)
+    return result is not None and result[0]
+
+
+def poll(ch: Channel) -> Any:
+    """
+    Take a value from ``ch`` if one is available right away, else return
+    ``None``.
+    """
+    result = ch._take(_Handler(_Flag(False), _noop), wait=False)
+    return None if result is None else result[0]
+
+
+def _noop(_: Any) -> None:
+    pass
+
+
+def _future_callback(future: asyncio.Future) -> Callable[[Any], None]:
+    # Callback that sets the result of a future from any thread
+    loop = future.get_loop()
+    loop_thread = threading.get_ident()
+
+    def set_result(value):
+        if not future.done():
+            future.set_result(value)
+
+    def callback(value):
+        if threading.get_ident() == loop_thread:
+            # Another coroutine of the loop, which doesn't need to wake it up
+            set_result(value)
+        else:
+            loop.call_soon_threadsafe(set_result, value)
+
+    return callback
+
+
+async def _wait(future: asyncio.Future, flag: _Flag) -> Any:
+    try:
+        return await future
+    except asyncio.CancelledError:
+        # Withdraw the operation
+        _commit(flag)
+        raise
+
+
+async def aput(ch: Channel, value: Any) -> bool:
+    """
+    Coroutine version of ``put``. If the task is cancelled, the put is
+    withdrawn unless it was already done.
+    """
+    # Without creating a future when the put can be done right away
+    result = ch._put(_Handler(_Flag(False), _noop), value, wait=False)
+    if result is None:
+        future = asyncio.get_running_loop().create_future()
+        flag = _Flag(True)
+        result = ch._put(_Handler(flag, _future_callback(future)), value)
+        if result is None:
+            return await _wait(future, flag)
+    return result[0]
+
+
+async def atake(ch: Channel) -> Any:
+    """
+    Coroutine version of ``take``. If the task is cancelled, the take is
+    withdrawn; the value is lost if it was already taken.
+    """
+    result = ch._take(_Handler(_Flag(False), _noop), wait=False)
+    if result is None:
+        future = asyncio.get_running_loop().create_future()
+        flag = _Flag(True)
+        result = ch._take(_Handler(flag, _future_callback(future)))
+        if result is None:
+            return await _wait(future, flag)
+    return result[0]
+
+
+Operation = Union[Channel, Tuple[Channel, Any]]
+
+
+def _alts(operations: Sequence[Operation], flag: _Flag, callback: Callable[[Tuple[Any, Optional[Channel]]], None],
+          priority: bool, default: Any) -> Optional[Tuple[Any, Optional[Channel]]]:
+    """
+    Start the operations of ``alts``, and return the result of the first one
+    that completes right away, or ``None``.
+    """
+    if not operations:
+        raise ValueError("alts needs at least one operation")
+    # Before any operation is queued, or it could complete after the error
+    if any(not isinstance(operation, Channel) and operation[1] is None for operation in operations):
+        raise ValueError("Can't put None on a channel")
+    if not priority:
+        start = random.randrange(len(operations))
+        operations = list(itertools.chain(operations[start:], operations[:start]))
+
+    for operation in operations:
+        if isinstance(operation, Channel):
+            ch = operation
+            result: Optional[Tuple[Any]] = ch._take(_Handler(flag, _port_callback(callback, ch)))
+        else:
+            ch, value = operation
+            result = ch._put(_Handler(flag, _port_callback(callback, ch)), value)
+        if result is not None:
+            return result[0], ch
+        if not flag.active:
+            # Another operation was completed in the meantime
+            return None
+
+    if default is not _nil and _commit(flag):
+        return default, None
+    return None
+
+
+def _port_callback(callback: Callable[[Tuple[Any, Optional[Channel]]], None], ch: Channel) -> Callable[[Any], None]:
+    return lambda value: callback((value, ch))
+
+
+def alts(operations: Sequence[Operation], priority: bool = False, default: Any = _nil) \
+        -> Tuple[Any, Optional[Channel]]:
+    """
+    Wait until one of ``operations`` completes, and return a tuple of its
+    result and its channel; only that operation is done. An operation is
+    either a channel to take from, or a tuple ``(channel, value)`` to put a
+    value; the result of a put is ``True`` or ``False``, like for ``put``.
+
+    The operations are tried in a random order, or in order if
+    ``priority=True``. If ``default`` is given and no operation can complete
+    right away, return ``(default, None)`` instead of waiting.
+    """
+    waiter = _Waiter()
+    flag = _Flag(True)
+    result = _alts(operations, flag, waiter, priority, default)
+    if result is not None:
+        return result
+    return waiter.wait()
+
+
+async def aalts(operations: Sequence[Operation], priority: bool = False, default: Any = _nil) \
+        -> Tuple[Any, Optional[Channel]]:
+    """
+    Coroutine version of ``alts``.
+    """
+    future = asyncio.get_running_loop().create_future()
+    flag = _Flag(True)
+    result = _alts(operations, flag, _future_callback(future), priority, default)
+    if result is not None:
+        return result
+    return await _wait(future, flag)
+
+
+class _Timers:
+    """
+    Thread that closes the channels returned by ``timeout`` when they're due,
+    so that there's not a thread per timeout.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap: List[Tuple[float, int, Channel]] = []
+        self._counter = itertools.count()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, seconds: float, ch: Channel) -> None:
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + seconds, next(self._counter), ch))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="clj-async-timers", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap or self._heap[0][0] > time.monotonic():
+                    self._cond.wait(self._heap[0][0] - time.monotonic() if self._heap else None)
+                ch = heapq.heappop(self._heap)[2]
+            ch.close()
+
+
+_timers = _Timers()
+
+
+def timeout(seconds: float) -> Channel:
+    """
+    Return a channel that closes after ``seconds``, e.g. to stop waiting in
+    ``alts``.
+    """
+    ch = Channel()
+    _timers.add(seconds, ch)
+    return ch
+
+
+def _thread(target: Callable, *args: Any) -> None:
+    threading.Thread(target=target, args=args, name="clj-async", daemon=True).start()
+
+
+def onto_chan(ch: Channel, coll: Iterable, close: bool = True) -> Channel:
+    """
+    Put the elements of ``coll`` on ``ch`` from a new thread, then close
+    ``ch`` unless ``close=False``. Return a channel that's closed once it's
+    done.
+    """
+    done = Channel()
+
+    def run():
+        try:
+            for e in coll:
+                if not put(ch, e):
+                    break
+        finally:
+            if close:
+                ch.close()
+            done.close()
+
+    _thread(run)
+    return done
+
+
+def to_chan(coll: Iterable, buf_or_n: Union[Buffer, int, None] = None) -> Channel:
+    """
+    Return a channel of the elements of ``coll``, which is closed after
+    them.
+    """
+    ch = chan(buf_or_n)
+    onto_chan(ch, coll)
+    return ch
+
+
+def _apply(xf: Transducer, value: Any, ex_handler: Callable[[Exception], Any]) -> List:
+    # Each value goes through a fresh transducer, like in core.async. The
+    # None results can't be put on a channel, so they're handled like errors
+    try:
+        results = into([], [value], xf)
+    except Exception as e:
+        results = [ex_handler(e)]
+    else:
+        results = [ex_handler(ValueError("Can't put None on a channel")) if e is None else e for e in results]
+    return [e for e in results if e is not None]
+
+
+def pipeline(n: int, to: Channel, xf: Transducer, from_: Channel, ordered: bool = True, close: bool = True,
+             ex_handler: Optional[Callable[[Exception], Any]] = None) -> Channel:
+    """
+    Take the values of ``from_``, apply the transducer ``xf`` to each one on
+    ``n`` threads, and put the results on ``to``. Since ``xf`` is applied to
+    each value independently, stateful transducers don't work across values;
+    each value can produce any number of results. The results are in the
+    order of the values unless ``ordered=False``, in which case they're put
+    on ``to`` as soon as they're ready. At most ``n`` values are processed
+    at once.
+
+    ``to`` is closed after the last result unless ``close=False``. If ``xf``
+    raises an exception, ``ex_handler`` is called with it, and its result is
+    put on ``to`` unless it's ``None``; by default, the exception is logged.
+    A ``None`` result of ``xf`` is handled like a ``ValueError``.
+
+    Return a channel that's closed once all the results are on ``to``.
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    handle = ex_handler or _log_exception
+    done = Channel()
+    jobs = chan(n)
+
+    def finish():
+        if close:
+            to.close()
+        done.close()
+
+    if ordered:
+        # A channel per value for its results, in the order of the values
+        results = chan(n)
+
+        def read():
+            for value in from_:
+                result = chan(1)
+                put(jobs, (value, result))
+                put(results, result)
+            jobs.close()
+            results.close()
+
+        def work():
+            for value, result in jobs:
+                put(result, _apply(xf, value, handle))
+
+        def write():
+            try:
+                for result in results:
+                    for e in take(result):
+                        put(to, e)
+            finally:
+                finish()
+
+        _thread(read)
+        _thread(write)
+        for _ in range(n):
+            _thread(work)
+    else:
+        lock = threading.Lock()
+        remaining = [n]
+
+        def read_unordered():
+            for value in from_:
+                put(jobs, value)
+            jobs.close()
+
+        def work_unordered():
+            try:
+                for value in jobs:
+                    for e in _apply(xf, value, handle):
+                        put(to, e)
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    last = not remaining[0]
+                if last:
+                    finish()
+
+        _thread(read_unordered)
+        for _ in range(n):
+            _thread(work_unordered)
+
+    return done
@@ -0,0 +1,244 @@
+# -*- coding: UTF-8 -*-
+"""
+Chunked sequences, like Clojure’s: elements are processed a chunk at a time
+rather than one by one, which amortizes the cost of laziness.
+
+    >>> from clj import chunked as ch
+    >>> s = ch.take(10, ch.filter(is_even, ch.map(inc, ch.chunked(range(1000), 64))))
+    >>> list(s)
+    [2, 4, 6, 8, 10, 12, 14, 16, 18, 20]
+
+The functions here accept a ``ChunkedSeq`` or any iterable, which is then
+chunked with ``chunked``, and return ``ChunkedSeq``s. Like generators, a
+``ChunkedSeq`` can only be iterated over once. Unlike ``clj.seqs``, they are
+lazy a chunk at a time: ``take(1, map(f, coll))`` calls ``f`` on a whole
+chunk.
+
+This pays off for the functions that are generators in ``clj.seqs`` (``keep``,
+``take``, ``drop``, ``partition``, ``distinct``); ``map``, ``filter`` and
+``remove`` are already C builtins there.
+"""
+import itertools
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, TypeVar, Union
+
+from clj import protocols
+from clj.seqs import _partition_tail
+
+T = TypeVar('T')
+T2 = TypeVar('T2')
+
+# Default number of elements per chunk
+CHUNK_SIZE = 32
+
+# We redefine `map` and `filter` below so keep a reference to the original ones here
+_map_builtin = map
+_filter_builtin = filter
+
+
+class ChunkedSeq(Iterable[T]):
+    """
+    A lazy sequence made of an iterable of non-empty chunks. Iterating over
+    it returns the elements; use ``chunks()`` to get the chunks.
+    """
+
+    def __init__(self, chunks: Iterable[Sequence[T]]):
+        self._chunks = chunks
+
+    def __iter__(self) -> Iterator[T]:
+        return itertools.chain.from_iterable(self._chunks)
+
+    def chunks(self) -> Iterator[Sequence[T]]:
+        """
+        Return an iterator of the chunks.
+        """
+        return iter(self._chunks)
+
+
+def _chunk_sequence(coll: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for i in range(0, len(coll), size):
+        yield coll[i:i + size]
+
+
+def _chunk_iterable(coll: Iterable[T], size: int) -> Iterator[List[T]]:
+    it = iter(coll)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def chunked(coll: Iterable[T], size: int = CHUNK_SIZE) -> ChunkedSeq[T]:
+    """
+    Return a ``ChunkedSeq`` of the elements of ``coll``, in chunks of ``size``
+    elements. Lists, tuples and ranges are sliced; collections that implement
+    ``clj.protocols.IChunked`` give their own chunks; other iterables are read
+    ``size`` elements at a time.
+    """
+    if size <= 0:
+        raise ValueError("size must be positive")
+    if isinstance(coll, ChunkedSeq):
+        return coll
+    implementation = protocols.IChunked.find(coll)
+    if implementation is not None:
+        return ChunkedSeq(implementation.chunks(coll, size))
+    if isinstance(coll, (list, tuple, range)):
+        return ChunkedSeq(_chunk_sequence(coll, size))
+    return ChunkedSeq(_chunk_iterable(coll, size))
+
+
+def _chunks(coll: Iterable[T]) -> Iterator[Sequence[T]]:
+    return chunked(coll).chunks()
+
+
+def _map(f: Callable[[T], T2], coll: Iterable[T]) -> Iterator[List[T2]]:
+    for chunk in _chunks(coll):
+        yield list(_map_builtin(f, chunk))
+
+
+def map(f: Callable[[T], T2], coll: Iterable[T]) -> ChunkedSeq[T2]:
+    """
+    Chunked version of ``clj.map``, with a single collection.
+    """
+    return ChunkedSeq(_map(f, coll))
+
+
+def _filter(pred: Callable[[T], Any], coll: Iterable[T], keep_if: bool) -> Iterator[List[T]]:
+    filter_ = _filter_builtin if keep_if else itertools.filterfalse
+    for chunk in _chunks(coll):
+        chunk = list(filter_(pred, chunk))
+        if chunk:
+            yield chunk
+
+
+def filter(pred: Callable[[T], Any], coll: Iterable[T]) -> ChunkedSeq[T]:
+    """
+    Chunked version of ``clj.filter``.
+    """
+    return ChunkedSeq(_filter(pred, coll, True))
+
+
+def remove(pred: Callable[[T], Any], coll: Iterable[T]) -> ChunkedSeq[T]:
+    """
+    Chunked version of ``clj.remove``.
+    """
+    return ChunkedSeq(_filter(pred, coll, False))
+
+
+def _keep(f: Callable[[T], Optional[T2]], coll: Iterable[T]) -> Iterator[List[T2]]:
+    for chunk in _chunks(coll):
+        kept = [e for e in _map_builtin(f, chunk) if e is not None]
+        if kept:
+            yield kept
+
+
+def keep(f: Callable[[T], Optional[T2]], coll: Iterable[T]) -> ChunkedSeq[T2]:
+    """
+    Chunked version of ``clj.keep``.
+    """
+    return ChunkedSeq(_keep(f, coll))
+
+
+def _take(n: int, coll: Iterable[T]) -> Iterator[Sequence[T]]:
+    if n <= 0:
+        return
+    for chunk in _chunks(coll):
+        if len(chunk) >= n:
+            yield chunk[:n]
+            return
+        yield chunk
+        n -= len(chunk)
+
+
+def take(n: int, coll: Iterable[T]) -> ChunkedSeq[T]:
+    """
+    Chunked version of ``clj.take``. It doesn't consume more chunks than
+    needed.
+    """
+    return ChunkedSeq(_take(n, coll))
+
+
+def _drop(n: int, coll: Iterable[T]) -> Iterator[Sequence[T]]:
+    chunks = _chunks(coll)
+    for chunk in chunks:
+        if len(chunk) > n:
+            yield chunk[n:] if n > 0 else chunk
+            break
+        n -= len(chunk)
+    yield from chunks
+
+
+def drop(n: int, coll: Iterable[T]) -> ChunkedSeq[T]:
+    """
+    Chunked version of ``clj.drop``.
+    """
+    return ChunkedSeq(_drop(n, coll))
+
+
+def _partition(coll: Iterable[T], n: int, step: Optional[int], pad: Optional[Iterable[T2]]) \
+        -> Iterator[List[List[Union[T, T2]]]]:
+    if step is None:
+        step = n
+    if n <= 0 or step <= 0:
+        return
+
+    # Elements of the current partitions; the next one starts at `start`,
+    # which may be past the end of `buffer` if step > n.
+    buffer: List = []
+    start = 0
+    for chunk in _chunks(coll):
+        if start >= len(buffer):
+            start -= len(buffer)
+            buffer = list(chunk)
+        else:
+            buffer = buffer[start:]
+            buffer.extend(chunk)
+            start = 0
+
+        end = len(buffer) - n
+        partitions = [buffer[i:i + n] for i in range(start, end + 1, step)]
+        if partitions:
+            start += len(partitions) * step
+            yield partitions
+
+    tail = buffer[start:]
+    partitions = list(_partition_tail(tail, n, step, pad, False, list))
+    if partitions:
+        yield partitions
+
+
+def partition(coll: Iterable[T], n: int, step: Optional[int] = None, pad: Optional[Iterable[T2]] = None) \
+        -> ChunkedSeq[List[Union[T, T2]]]:
+    """
+    Chunked version of ``clj.partition``. The partitions are lists.
+    """
+    return ChunkedSeq(_partition(coll, n, step, pad))
+
+
+def _distinct(coll: Iterable[T], key: Optional[Callable[[T], Hashable]]) -> Iterator[List[T]]:
+    seen: Set[Hashable] = set()
+    add = seen.add
+    for chunk in _chunks(coll):
+        if key is None:
+            chunk = [e for e in chunk if not (e in seen or add(e))]
+        else:
+            chunk = [e for e, k in zip(chunk, _map_builtin(key, chunk)) if not (k in seen or add(k))]
+        if chunk:
+            yield chunk
+
+
+def distinct(coll: Iterable[T], key: Optional[Callable[[T], Hashable]] = None) -> ChunkedSeq[T]:
+    """
+    Chunked version of ``clj.distinct``.
+    """
+    return ChunkedSeq(_distinct(coll, key))
+
+
+def count(coll: Iterable) -> int:
+    """
+    Chunked version of ``clj.count``.
+    """
+    if isinstance(coll, (list, tuple, range)):
+        return len(coll)
+    return sum(_map_builtin(len, _chunks(coll)))
+
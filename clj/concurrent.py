@@ -0,0 +1,200 @@
+# -*- coding: UTF-8 -*-
+"""
+Sharing lazy sequences between threads. The generators of ``clj.seqs`` can't
+be read by several threads at once (they raise ``ValueError: generator
+already executing``); ``locked`` and ``fan_out`` make them safe to:
+
+    >>> from clj.concurrent import locked, fan_out
+    >>> lines = locked(map(parse, read_lines()), batch=64)
+    >>> workers = [Thread(target=lambda: count(map(process, lines))) for _ in range(8)]
+
+Both only rely on ``threading`` locks and ``queue.Queue``, so they also work
+on free-threaded builds of CPython, where the threads then run in parallel.
+"""
+import itertools
+import queue
+import threading
+from typing import Any, Generic, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+# How long the producer of fan_out waits on a full queue before trying the
+# next one, in seconds
+_POLL_INTERVAL = 0.001
+
+
+class LockedIterator(Generic[T]):
+    """
+    Thread-safe iterator over an iterable; see ``locked``.
+    """
+
+    def __init__(self, coll: Iterable[T], batch: int = 1):
+        if batch <= 0:
+            raise ValueError("batch must be positive")
+        self._it = iter(coll)
+        self._batch = batch
+        self._lock = threading.Lock()
+        # The elements each thread took but didn't read yet
+        self._local = threading.local()
+
+    def __iter__(self) -> "LockedIterator[T]":
+        return self
+
+    def __next__(self) -> T:
+        if self._batch == 1:
+            with self._lock:
+                return next(self._it)
+
+        try:
+            return next(self._local.buffer)
+        except (AttributeError, StopIteration):
+            # First call in this thread, or its batch is exhausted
+            pass
+
+        buffer = iter(self.next_batch())
+        self._local.buffer = buffer
+        return next(buffer)
+
+    def next_batch(self) -> List[T]:
+        """
+        Return a list of up to ``batch`` elements, which is empty once the
+        iterable is exhausted. Consuming whole batches avoids the per-element
+        overhead of ``next``.
+        """
+        with self._lock:
+            return list(itertools.islice(self._it, self._batch))
+
+
+def locked(coll: Iterable[T], batch: int = 1) -> LockedIterator[T]:
+    """
+    Return an iterator over ``coll`` that several threads can read from: each
+    element goes to one of them. With ``batch > 1``, a thread takes ``batch``
+    elements at once while holding the lock, and the following ``next`` calls
+    from that thread read them without locking.
+
+    Elements taken by a thread are only read by that thread: if it stops
+    reading, the rest of its batch is lost for the others.
+    """
+    return LockedIterator(coll, batch)
+
+
+class _Error:
+    # Wraps the exception raised by the iterable, which the consumers of
+    # fan_out raise in turn
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+# Put in the queues once the iterable is exhausted
+_done = object()
+
+
+class _Consumer(Iterator[T]):
+    """
+    One of the iterators returned by ``fan_out``.
+    """
+
+    def __init__(self, q: "queue.Queue", closed: threading.Event):
+        self._queue = q
+        self._closed = closed
+        self._items: Iterator[T] = iter(())
+
+    def __next__(self) -> T:
+        try:
+            return next(self._items)
+        except StopIteration:
+            pass
+
+        if self._closed.is_set():
+            raise StopIteration
+        item = self._queue.get()
+        if item is _done:
+            self.close()
+            raise StopIteration
+        if isinstance(item, _Error):
+            self.close()
+            raise item.exception
+        self._items = iter(item)
+        return next(self._items)
+
+    def close(self) -> None:
+        """
+        Stop reading: the elements queued for this consumer are dropped.
+        """
+        self._closed.set()
+        # Unblock the producer if it's waiting on this queue
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def __del__(self):
+        self.close()
+
+
+def _produce(it: Iterator, queues: List["queue.Queue"], closed: List[threading.Event], batch: int) -> None:
+    n = len(queues)
+    i = 0
+    end: Any = _done
+    try:
+        while True:
+            chunk = list(itertools.islice(it, batch))
+            if not chunk:
+                break
+            # Give the chunk to the next consumer that isn't closed and has
+            # room for it, or wait for one
+            while True:
+                open_ = [j for j in itertools.chain(range(i, n), range(i)) if not closed[j].is_set()]
+                if not open_:
+                    close = getattr(it, "close", None)
+                    if close is not None:
+                        close()
+                    return
+                j = next((j for j in open_ if not queues[j].full()), open_[0])
+                i = (j + 1) % n
+                if _put(queues[j], chunk):
+                    break
+    except BaseException as e:
+        end = _Error(e)
+
+    # Without waiting on a full queue while another consumer waits for the
+    # end of its own
+    pending = list(range(n))
+    while pending:
+        pending = [j for j in pending if not closed[j].is_set() and not _put(queues[j], end)]
+
+
+def _put(q: "queue.Queue", item: Any) -> bool:
+    try:
+        q.put(item, timeout=_POLL_INTERVAL)
+        return True
+    except queue.Full:
+        return False
+
+
+def fan_out(coll: Iterable[T], n_consumers: int, batch: int = 64, maxsize: int = 4) -> List[Iterator[T]]:
+    """
+    Split ``coll`` between ``n_consumers`` iterators, one per thread: each
+    element goes to one of them. A background thread reads ``coll`` by
+    batches of ``batch`` elements and puts them in the bounded queue of a
+    consumer that has room for them, at most ``maxsize`` batches per
+    consumer. The elements of each consumer are in the order of ``coll``.
+
+    If reading ``coll`` raises an exception, each consumer raises it once
+    it has read the elements before. Once all the consumers are closed with
+    their ``close`` method (or garbage-collected), the background thread
+    stops and closes ``coll`` if it can.
+    """
+    if n_consumers <= 0:
+        raise ValueError("n_consumers must be positive")
+    if batch <= 0:
+        raise ValueError("batch must be positive")
+    if maxsize <= 0:
+        raise ValueError("maxsize must be positive")
+
+    queues: List[queue.Queue] = [queue.Queue(maxsize) for _ in range(n_consumers)]
+    closed = [threading.Event() for _ in range(n_consumers)]
+    threading.Thread(target=_produce, args=(iter(coll), queues, closed, batch), name="clj-fan-out",
+                     daemon=True).start()
+    return [_Consumer(q, is_closed) for q, is_closed in zip(queues, closed)]
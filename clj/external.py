@@ -0,0 +1,342 @@
+# -*- coding: UTF-8 -*-
+"""
+External-memory versions of ``group_by``, ``distinct`` and sorting, for
+collections that don't fit in memory.
+
+    >>> from clj import external
+    >>> for user, events in external.group_by(get_user, read_events(), memory=512 * 1024 ** 2):
+    ...     process(user, events)
+
+Elements are kept in memory until their estimated size exceeds ``memory``
+bytes; they are then spilled to temporary files, which are read back
+lazily. Spilled elements must be picklable. Temporary files are created in a
+directory under ``tmpdir`` (by default, the system's temporary directory)
+that is removed once the generator is exhausted or closed.
+
+Memory usage is estimated from ``sys.getsizeof`` of one element (and key) in
+``SAMPLE_EVERY``, which doesn't account for what they reference: give a
+lower budget for nested elements, or elements of very different sizes.
+"""
+import heapq
+import itertools
+import os
+import pickle
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple, TypeVar
+
+T = TypeVar('T')
+T2 = TypeVar('T2')
+
+# Default memory budget, in bytes
+DEFAULT_MEMORY = 64 * 1024 * 1024
+
+# Default number of files elements are partitioned into when they're spilled
+DEFAULT_PARTITIONS = 16
+
+# Estimated memory used by the reference to an element in a list, set or
+# dict, in addition to the element itself
+_OVERHEAD = 64
+
+# Number of elements pickled together in sorted runs
+_BATCH_SIZE = 1024
+
+# Maximum number of sorted runs merged at once
+_MAX_MERGED_RUNS = 64
+
+# Measure the size of one element in this many; the other ones are assumed
+# to have the same size
+SAMPLE_EVERY = 256
+
+
+def _size(x: Any) -> int:
+    return sys.getsizeof(x) + _OVERHEAD
+
+
+def _check(memory: int, partitions: int = 1) -> None:
+    if memory <= 0:
+        raise ValueError("memory must be positive")
+    if partitions <= 0:
+        raise ValueError("partitions must be positive")
+
+
+class _SpillFiles:
+    """
+    Temporary files, which are created in a temporary directory on the first
+    write. Each file holds a sequence of pickled lists.
+    """
+
+    def __init__(self, tmpdir: Optional[str]):
+        self._tmpdir = tmpdir
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+        self._names: Set[str] = set()
+
+    def _path(self, name: str) -> str:
+        if self._directory is None:
+            self._directory = tempfile.TemporaryDirectory(prefix="clj-", dir=self._tmpdir)
+        return os.path.join(self._directory.name, name)
+
+    def append(self, name: str, items: List) -> None:
+        with open(self._path(name), "ab") as f:
+            pickle.dump(items, f, pickle.HIGHEST_PROTOCOL)
+        self._names.add(name)
+
+    def read(self, name: str) -> Iterator[List]:
+        """
+        Yield the lists written in the file ``name``, if it exists.
+        """
+        if name not in self._names:
+            return
+        with open(self._path(name), "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+
+    def remove(self, name: str) -> None:
+        if name in self._names:
+            self._names.remove(name)
+            os.remove(self._path(name))
+
+    def close(self) -> None:
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+
+def _spill(files: _SpillFiles, prefix: str, items: Iterable, partitions: int, key: Callable[[Any], Hashable]) -> None:
+    """
+    Append ``items`` to the files ``prefix-i``, where ``i`` is the partition
+    of their ``key``.
+    """
+    buffers: List[List] = [[] for _ in range(partitions)]
+    for item in items:
+        buffers[hash(key(item)) % partitions].append(item)
+    for i, buffer in enumerate(buffers):
+        if buffer:
+            files.append("%s-%d" % (prefix, i), buffer)
+
+
+def _identity(x: T) -> T:
+    return x
+
+
+def _first(x: Tuple) -> Any:
+    return x[0]
+
+
+def group_by(f: Callable[[T], T2], coll: Iterable[T], memory: int = DEFAULT_MEMORY,
+             partitions: int = DEFAULT_PARTITIONS, tmpdir: Optional[str] = None) -> Iterator[Tuple[T2, List[T]]]:
+    """
+    Like ``clj.group_by``, but return a generator of ``(key, elements)``
+    tuples, and spill the groups to ``partitions`` files by hash of their key
+    when they use more than ``memory`` bytes.
+
+    The elements of each group are in the order they appeared in ``coll``.
+    If nothing was spilled, the groups are in the order of their first
+    element; otherwise, they come a partition at a time. Each group, and the
+    groups of a partition, must fit in memory.
+    """
+    _check(memory, partitions)
+    return _group_by(f, coll, memory, partitions, tmpdir)
+
+
+def _group_by(f: Callable[[T], T2], coll: Iterable[T], memory: int, partitions: int, tmpdir: Optional[str]) \
+        -> Iterator[Tuple[T2, List[T]]]:
+    groups: Dict[T2, List[T]] = {}
+    used = n = n_groups = 0
+    sample_every = SAMPLE_EVERY
+    files: Optional[_SpillFiles] = None
+    try:
+        for e in coll:
+            k = f(e)
+            group = groups.get(k)
+            if group is None:
+                group = groups[k] = []
+            group.append(e)
+
+            n += 1
+            if n == sample_every:
+                used += n * _size(e) + (len(groups) - n_groups) * (_size(k) + _size(group))
+                n = 0
+                n_groups = len(groups)
+                if used > memory:
+                    if files is None:
+                        files = _SpillFiles(tmpdir)
+                    _spill(files, "groups", groups.items(), partitions, _first)
+                    groups = {}
+                    used = n_groups = 0
+
+        if files is None:
+            yield from groups.items()
+            return
+
+        _spill(files, "groups", groups.items(), partitions, _first)
+        del groups
+        for i in range(partitions):
+            merged: Dict[T2, List[T]] = {}
+            for batch in files.read("groups-%d" % i):
+                for k, elements in batch:
+                    group = merged.get(k)
+                    if group is None:
+                        merged[k] = elements
+                    else:
+                        group.extend(elements)
+            files.remove("groups-%d" % i)
+            yield from merged.items()
+    finally:
+        if files is not None:
+            files.close()
+
+
+def distinct(coll: Iterable[T], key: Optional[Callable[[T], Hashable]] = None, memory: int = DEFAULT_MEMORY,
+             partitions: int = DEFAULT_PARTITIONS, tmpdir: Optional[str] = None) -> Iterator[T]:
+    """
+    Like ``clj.distinct``, but spill the keys seen so far to ``partitions``
+    files by hash when they use more than ``memory`` bytes.
+
+    Until then, the elements are yielded as they're read. After that, the
+    remaining elements are spilled as well, and the new ones are yielded once
+    ``coll`` is exhausted, a partition at a time, in the order they appeared
+    in each partition. The keys of a partition must fit in memory.
+    """
+    _check(memory, partitions)
+    return _distinct(coll, key, memory, partitions, tmpdir)
+
+
+def _distinct(coll: Iterable[T], key: Optional[Callable[[T], Hashable]], memory: int, partitions: int,
+              tmpdir: Optional[str]) -> Iterator[T]:
+    it = iter(coll)
+    seen = set()
+    used = n = 0
+    sample_every = SAMPLE_EVERY
+    for e in it:
+        k = e if key is None else key(e)
+        if k not in seen:
+            seen.add(k)
+            yield e
+            n += 1
+            if n == sample_every:
+                used += n * _size(k)
+                n = 0
+                if used > memory:
+                    break
+    else:
+        return
+
+    files = _SpillFiles(tmpdir)
+    try:
+        _spill(files, "seen", seen, partitions, _identity)
+        del seen
+
+        # Elements that may be new; we keep their key if it has to be
+        # computed, so that key is called only once per element
+        buffer: List = []
+        used = 0
+        for e in it:
+            if key is None:
+                buffer.append(e)
+            else:
+                k = key(e)
+                buffer.append((k, e))
+
+            n += 1
+            if n == sample_every:
+                used += n * (_size(e) if key is None else _size(k) + _size(e))
+                n = 0
+                if used > memory:
+                    _spill(files, "elements", buffer, partitions, _identity if key is None else _first)
+                    buffer = []
+                    used = 0
+        _spill(files, "elements", buffer, partitions, _identity if key is None else _first)
+        del buffer
+
+        for i in range(partitions):
+            seen = set(itertools.chain.from_iterable(files.read("seen-%d" % i)))
+            for batch in files.read("elements-%d" % i):
+                for item in batch:
+                    k, e = (item, item) if key is None else item
+                    if k not in seen:
+                        seen.add(k)
+                        yield e
+            files.remove("seen-%d" % i)
+            files.remove("elements-%d" % i)
+    finally:
+        files.close()
+
+
+def _write_run(files: _SpillFiles, name: str, run: Iterable) -> None:
+    it = iter(run)
+    while True:
+        batch = list(itertools.islice(it, _BATCH_SIZE))
+        if not batch:
+            return
+        files.append(name, batch)
+
+
+def _read_run(files: _SpillFiles, name: str) -> Iterator:
+    return itertools.chain.from_iterable(files.read(name))
+
+
+def sort_by(keyfn: Optional[Callable[[T], Any]], coll: Iterable[T], memory: int = DEFAULT_MEMORY,
+            reverse: bool = False, tmpdir: Optional[str] = None) -> Iterator[T]:
+    """
+    Return a generator of the elements of ``coll`` sorted by ``keyfn``, or by
+    themselves if ``keyfn`` is ``None``. This is a stable external merge
+    sort: elements are sorted in runs of about ``memory`` bytes, which are
+    spilled to files and then merged.
+    """
+    _check(memory)
+    return _sort_by(keyfn, coll, memory, reverse, tmpdir)
+
+
+def _sort_by(keyfn: Optional[Callable[[T], Any]], coll: Iterable[T], memory: int, reverse: bool,
+             tmpdir: Optional[str]) -> Iterator[T]:
+    buffer: List[T] = []
+    used = n = 0
+    sample_every = SAMPLE_EVERY
+    runs: List[str] = []
+    files: Optional[_SpillFiles] = None
+    try:
+        for e in coll:
+            buffer.append(e)
+
+            n += 1
+            if n == sample_every:
+                used += n * _size(e)
+                n = 0
+                if used > memory:
+                    if files is None:
+                        files = _SpillFiles(tmpdir)
+                    buffer.sort(key=keyfn, reverse=reverse)
+                    runs.append("run-%d" % len(runs))
+                    _write_run(files, runs[-1], buffer)
+                    buffer = []
+                    used = 0
+
+        buffer.sort(key=keyfn, reverse=reverse)
+        if files is None:
+            yield from buffer
+            return
+
+        # Merge the runs in several passes if there are too many of them to
+        # have all their files open at once. The runs are merged in order so
+        # that the sort stays stable.
+        count = len(runs)
+        while len(runs) >= _MAX_MERGED_RUNS:
+            merged_runs = []
+            for i in range(0, len(runs), _MAX_MERGED_RUNS):
+                group = runs[i:i + _MAX_MERGED_RUNS]
+                merged_runs.append("run-%d" % count)
+                count += 1
+                _write_run(files, merged_runs[-1],
+                           heapq.merge(*[_read_run(files, run) for run in group], key=keyfn, reverse=reverse))
+                for run in group:
+                    files.remove(run)
+            runs = merged_runs
+
+        yield from heapq.merge(*[_read_run(files, run) for run in runs], buffer, key=keyfn, reverse=reverse)
+    finally:
+        if files is not None:
+            files.close()
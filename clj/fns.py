@@ -1,7 +1,8 @@
 # -*- coding: UTF-8 -*-
 
 # See http://clojure.org/reference/other_functions
-from typing import TypeVar, Union, Callable, Hashable
+import functools
+from typing import TypeVar, Union, Callable, Hashable, List
 
 T = TypeVar('T')
 
@@ -48,17 +49,48 @@ def comp(*fns: Callable) -> Callable:
     applies the rightmost of functions to the args, the next function
     (right-to-left) to the result, etc.
     """
+    # Flatten nested compositions so that comp(comp(f, g), h) doesn't pay for
+    # two levels of calls.
+    flat: List[Callable] = []
+    for f in fns:
+        flat.extend(getattr(f, "_clj_fns", (f,)))
+    fns = tuple(flat)
+
     if not fns:
         return constantly(None)
 
-    def _comp(*args, **kw):
-        res = fns[-1](*args, **kw)
-
-        for i in range(1, len(fns)):
-            res = fns[-1 - i](res)
-
-        return res
-
+    # These run once per element in maps, so the usual arities get a closure
+    # without a loop.
+    if len(fns) == 1:
+        return fns[0]
+    elif len(fns) == 2:
+        f, g = fns
+
+        def _comp(*args, **kw):
+            return f(g(*args, **kw))
+    elif len(fns) == 3:
+        f, g, h = fns
+
+        def _comp(*args, **kw):
+            return f(g(h(*args, **kw)))
+    elif len(fns) == 4:
+        f, g, h, i = fns
+
+        def _comp(*args, **kw):
+            return f(g(h(i(*args, **kw))))
+    else:
+        last = fns[-1]
+        rest = fns[-2::-1]
+
+        def _comp(*args, **kw):
+            res = last(*args, **kw)
+            for fn in rest:
+                res = fn(res)
+            return res
+
+    # Keep the composed functions around so that e.g. clj.transducers can
+    # inspect a composition of transducers.
+    _comp._clj_fns = fns  # type: ignore
     return _comp
 
 
@@ -68,9 +100,16 @@ def complement(f: Callable) -> Callable[..., bool]:
     as ``f``, has the same effects, if any, and returns the opposite truth
     value.
     """
+    complemented = getattr(f, "_clj_complemented", None)
+    if complemented is not None:
+        # complement(complement(g)) only has to call g
+        def _f(*args, **kw):
+            return bool(complemented(*args, **kw))
+    else:
+        def _f(*args, **kw):
+            return not f(*args, **kw)
 
-    def _f(*args, **kw):
-        return not f(*args, **kw)
+        _f._clj_complemented = f  # type: ignore
 
     return _f
 
@@ -86,24 +125,69 @@ def constantly(x: T) -> Callable[..., T]:
     return _fn
 
 
-def juxt(*fns) -> Callable[..., list]:
+def juxt(*fns: Callable, as_tuple: bool = False) -> Callable[..., Union[list, tuple]]:
     """
     Takes a set of functions and returns a function that is the juxtaposition
     of those functions. The returned function takes a variable number of
     arguments, and returns a list containing the result of applying each
-    function to the arguments (left-to-right).
+    function to the arguments (left-to-right), or a tuple if ``as_tuple`` is
+    true.
 
         juxt(a, b, c)(x) # => [a(x), b(x), c(x)]
     """
 
     # Note we accept zero argument while Clojure wants at least one.
 
-    def _fn(*args, **kw):
-        return [f(*args, **kw) for f in fns]
+    if len(fns) == 1:
+        f, = fns
+        if as_tuple:
+            def _fn(*args, **kw):
+                return (f(*args, **kw),)
+        else:
+            def _fn(*args, **kw):
+                return [f(*args, **kw)]
+    elif len(fns) == 2:
+        f, g = fns
+        if as_tuple:
+            def _fn(*args, **kw):
+                return f(*args, **kw), g(*args, **kw)
+        else:
+            def _fn(*args, **kw):
+                return [f(*args, **kw), g(*args, **kw)]
+    elif len(fns) == 3:
+        f, g, h = fns
+        if as_tuple:
+            def _fn(*args, **kw):
+                return f(*args, **kw), g(*args, **kw), h(*args, **kw)
+        else:
+            def _fn(*args, **kw):
+                return [f(*args, **kw), g(*args, **kw), h(*args, **kw)]
+    elif as_tuple:
+        def _fn(*args, **kw):
+            return tuple([f(*args, **kw) for f in fns])
+    else:
+        def _fn(*args, **kw):
+            return [f(*args, **kw) for f in fns]
 
     return _fn
 
 
+def partial(f: Callable, *args, **kw) -> Callable:
+    """
+    Takes a function ``f`` and fewer than the normal arguments to ``f``, and
+    returns a function that takes a variable number of additional arguments.
+    When called, the returned function calls ``f`` with ``args`` plus the
+    additional arguments.
+
+    This is ``functools.partial``, which flattens nested partials and doesn't
+    allocate more than the arguments it's called with; ``f`` itself is
+    returned if there are no arguments to add.
+    """
+    if not args and not kw:
+        return f
+    return functools.partial(f, *args, **kw)
+
+
 def is_distinct(*args: Hashable):
     s = set()
     for arg in args:
@@ -0,0 +1,300 @@
+# -*- coding: UTF-8 -*-
+"""
+Per-stage instrumentation of chains of lazy sequences. Wrap each stage with
+``stage``, which calls the function and measures the generator it returns:
+
+    >>> from clj import instrument as ins
+    >>> sink = ins.MemorySink()
+    >>> c.count(ins.stage(c.distinct, ins.stage(c.map, parse, lines, sink=sink), sink=sink))
+    >>> sink.stats["distinct"]
+    <Stats distinct in=1000 out=120 seconds=0.000213 peak_buffered=120>
+
+``Seq.instrument()`` in ``clj.pipeline`` does the same for each stage of a
+pipeline, which then isn't fused.
+
+The statistics of a stage are reported to a sink once it's exhausted or
+closed. Without a ``sink`` argument, stages report to the sink given to
+``enable``; if it wasn't called, ``stage`` only calls the function, so that
+instrumentation can be left in the code at almost no cost.
+
+The input of a stage is one of the positional arguments of its function,
+usually the last one (see ``INPUTS``). Wrapping it means that the function
+sees a generator, and not e.g. a list or a NumPy array it could process
+faster.
+"""
+import abc
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+_clock = time.perf_counter
+
+# We use this as a default value for some arguments in order to check if they
+# were provided or not
+_nil = object()
+
+
+class Stats:
+    """
+    Statistics of a stage: the number of elements it read (``elements_in``)
+    and produced (``elements_out``), the time spent in it excluding the
+    stages it read from (``seconds``), and the largest number of elements it
+    held at once (``peak_buffered``), if known.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.elements_in = 0
+        self.elements_out = 0
+        self.seconds = 0.0
+        self.peak_buffered = 0
+
+    @property
+    def throughput(self) -> float:
+        """
+        Number of elements produced per second spent in the stage.
+        """
+        return self.elements_out / self.seconds if self.seconds > 0 else 0.0
+
+    def merge(self, other: "Stats") -> None:
+        """
+        Add the statistics of another run of the same stage to these ones.
+        """
+        self.elements_in += other.elements_in
+        self.elements_out += other.elements_out
+        self.seconds += other.seconds
+        self.peak_buffered = max(self.peak_buffered, other.peak_buffered)
+
+    def __repr__(self):
+        return "<Stats %s in=%d out=%d seconds=%f peak_buffered=%d>" % (
+            self.name, self.elements_in, self.elements_out, self.seconds, self.peak_buffered)
+
+
+# Functions that estimate the number of elements a stage held when it produced
+# an element (including it), from its statistics and that element, by name of
+# the stage's function
+BUFFERS: Dict[str, Callable[[Stats, Any], int]] = {
+    "butlast": lambda stats, _: stats.elements_in - stats.elements_out + 1,
+    "cycle": lambda stats, _: stats.elements_in,
+    "distinct": lambda stats, _: stats.elements_out,
+    "drop_last": lambda stats, _: stats.elements_in - stats.elements_out + 1,
+    "partition": lambda _, x: len(x),
+    "partition_all": lambda _, x: len(x),
+    "partition_by": lambda _, x: len(x),
+    "reverse": lambda stats, _: stats.elements_in - stats.elements_out + 1,
+}
+
+# Index of the positional argument that is the input of a stage, or None if it
+# has none, by name of the stage's function. It's the last one otherwise.
+INPUTS: Dict[str, Optional[int]] = {
+    "distinct": 0,
+    "flatten": 0,
+    "iterate": None,
+    "partition": 0,
+    "partition_all": 0,
+    "range": None,
+    "reductions": 1,
+    "repeat": None,
+    "repeatedly": None,
+    "tree_seq": None,
+}
+
+
+class Sink(abc.ABC):
+    """
+    Base class of the sinks, which receive the statistics of the stages.
+    Subclasses implement ``report``.
+    """
+
+    @abc.abstractmethod
+    def report(self, stats: Stats) -> None:
+        pass
+
+
+class MemorySink(Sink):
+    """
+    Keep the statistics in the ``stats`` dict, by name of stage. The
+    statistics of stages with the same name are merged.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, Stats] = {}
+
+    def report(self, stats: Stats) -> None:
+        previous = self.stats.get(stats.name)
+        if previous is None:
+            merged = self.stats[stats.name] = Stats(stats.name)
+            merged.merge(stats)
+        else:
+            previous.merge(stats)
+
+
+class LoggingSink(Sink):
+    """
+    Log the statistics of each stage to ``logger`` (by default, the
+    ``clj.instrument`` logger).
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level = level
+
+    def report(self, stats: Stats) -> None:
+        self.logger.log(self.level, "%s: %d in, %d out, %.6fs, %.0f elements/s, %d buffered at most", stats.name,
+                        stats.elements_in, stats.elements_out, stats.seconds, stats.throughput, stats.peak_buffered)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class PrometheusSink(MemorySink):
+    """
+    Like ``MemorySink``, and write the statistics to the file ``path`` in
+    Prometheus’ text format, e.g. for the textfile collector of the Node
+    exporter. The file is replaced atomically after each report.
+    """
+
+    _METRICS = (
+        ("clj_stage_elements_in_total", "counter", "Elements read by the stage.", "elements_in"),
+        ("clj_stage_elements_out_total", "counter", "Elements produced by the stage.", "elements_out"),
+        ("clj_stage_seconds_total", "counter", "Time spent in the stage, excluding upstream stages.", "seconds"),
+        ("clj_stage_peak_buffered", "gauge", "Largest number of elements held by the stage.", "peak_buffered"),
+    )
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    def report(self, stats: Stats) -> None:
+        super().report(stats)
+        self.write()
+
+    def write(self) -> None:
+        lines = []
+        for metric, kind, doc, attribute in self._METRICS:
+            lines.append("# HELP %s %s" % (metric, doc))
+            lines.append("# TYPE %s %s" % (metric, kind))
+            for name, stats in self.stats.items():
+                lines.append("%s{stage=\"%s\"} %s" % (metric, _escape_label(name), repr(getattr(stats, attribute))))
+
+        tmp = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
+
+
+_default_sink: Optional[Sink] = None
+
+
+def enable(sink: Optional[Sink] = None) -> Sink:
+    """
+    Make stages report to ``sink`` by default, and return it. If ``sink`` is
+    not given, a new ``MemorySink`` is used.
+    """
+    global _default_sink
+    _default_sink = MemorySink() if sink is None else sink
+    return _default_sink
+
+
+def disable() -> None:
+    """
+    Stop instrumenting the stages that are not given a sink.
+    """
+    global _default_sink
+    _default_sink = None
+
+
+def default_sink() -> Optional[Sink]:
+    """
+    Return the sink given to ``enable``, or ``None`` if instrumentation is
+    disabled.
+    """
+    return _default_sink
+
+
+def _input(coll: Iterable, stats: Stats) -> Iterator:
+    # The time between the resumption of this generator and the next element
+    # is spent upstream
+    clock = _clock
+    start = clock()
+    for x in coll:
+        stats.seconds -= clock() - start
+        stats.elements_in += 1
+        yield x
+        start = clock()
+    stats.seconds -= clock() - start
+
+
+def _output(it: Iterator, stats: Stats, buffered: Optional[Callable[[Stats, Any], int]], sink: Sink) -> Iterator:
+    clock = _clock
+    seconds = 0.0
+    try:
+        start = clock()
+        for x in it:
+            seconds += clock() - start
+            stats.elements_out += 1
+            if buffered is not None:
+                n = buffered(stats, x)
+                if n > stats.peak_buffered:
+                    stats.peak_buffered = n
+            yield x
+            start = clock()
+        seconds += clock() - start
+    finally:
+        stats.seconds += seconds
+        sink.report(stats)
+
+
+def stage(f: Callable[..., Iterable], *args, name: Optional[str] = None, sink: Optional[Sink] = None,
+          buffered: Optional[Callable[[Stats, Any], int]] = None, input_arg: Any = _nil, **kwargs) -> Iterable:
+    """
+    Return ``f(*args, **kwargs)``, instrumented: its positional argument at
+    index ``input_arg`` is taken as its input, and its result as its output.
+
+    ``name`` defaults to the name of ``f``. ``buffered(stats, x)`` estimates
+    the number of elements the stage held when it produced ``x``. They
+    default to the values of ``BUFFERS`` and ``INPUTS`` for the name of
+    ``f``, if any; otherwise, the input is the last positional argument, and
+    the buffered elements aren't estimated. ``input_arg=None`` means that the
+    stage has no input.
+
+    If ``sink`` is not given and instrumentation wasn't enabled, this is only
+    a call to ``f``.
+    """
+    if sink is None:
+        sink = _default_sink
+        if sink is None:
+            return f(*args, **kwargs)
+
+    fn_name = getattr(f, "__name__", None) or repr(f)
+    stats = Stats(name or fn_name)
+    if buffered is None:
+        buffered = BUFFERS.get(fn_name)
+    if input_arg is _nil:
+        input_arg = INPUTS.get(fn_name, -1)
+
+    if args and input_arg is not None:
+        inputs = list(args)
+        inputs[input_arg] = _input(inputs[input_arg], stats)
+        args = tuple(inputs)
+
+    start = _clock()
+    result = f(*args, **kwargs)
+    # Eager functions do their work here
+    stats.seconds += _clock() - start
+    return _output(iter(result), stats, buffered, sink)
+
+
+def instrumented(f: Callable[..., Iterable], name: Optional[str] = None, sink: Optional[Sink] = None,
+                 buffered: Optional[Callable[[Stats, Any], int]] = None,
+                 input_arg: Any = _nil) -> Callable[..., Iterable]:
+    """
+    Return a function that calls ``stage`` with ``f`` and its arguments.
+    """
+
+    def _f(*args, **kwargs):
+        return stage(f, *args, name=name, sink=sink, buffered=buffered, input_arg=input_arg, **kwargs)
+
+    return _f
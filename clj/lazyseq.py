@@ -0,0 +1,154 @@
+# -*- coding: UTF-8 -*-
+"""
+Memoizing lazy sequences, like Clojure’s: elements are pulled from the
+underlying iterable on demand and cached in a linked list, so a ``LazySeq``
+can be iterated over many times, by many independent iterators.
+
+    >>> s = LazySeq(read_lines(path))
+    >>> s.first(), s.rest().first()
+    ('line 1', 'line 2')
+    >>> list(take(3, s))  # doesn't read more lines than needed
+    ['line 1', 'line 2', 'line 3']
+
+Cells only reference the next ones, so the elements before the first
+``LazySeq`` or iterator that is still referenced can be garbage-collected.
+Keeping a reference to a ``LazySeq`` keeps all its realized elements in
+memory.
+"""
+from typing import Any, Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Value of the cell at the end of a sequence
+_end = object()
+
+
+class _Cell:
+    """
+    A cell of a lazy sequence. Until it's realized, it holds the iterator its
+    value comes from; after that, it holds its value and the next cell.
+    """
+    __slots__ = ("_value", "_next", "_source")
+
+    def __init__(self, source: Iterator):
+        self._source: Optional[Iterator] = source
+        self._value: Any = _end
+        self._next: Optional[_Cell] = None
+
+    def realize(self) -> None:
+        source = self._source
+        if source is None:
+            return
+        # Unset the source first so that a re-entrant call doesn't read it
+        # twice
+        self._source = None
+        try:
+            self._value = next(source, _end)
+        except BaseException:
+            self._source = source
+            raise
+        if self._value is not _end:
+            self._next = _Cell(source)
+
+
+def _iter_cells(cell: _Cell) -> Iterator:
+    # This is a function rather than a method so that the generator doesn't
+    # reference the LazySeq, and thus its head.
+    while True:
+        if cell._source is not None:
+            cell.realize()
+        if cell._value is _end:
+            return
+        yield cell._value
+        cell = cell._next  # type: ignore
+
+
+def _drop_cells(n: int, cell: _Cell) -> Iterator:
+    for _ in range(n):
+        cell.realize()
+        if cell._next is None:
+            return
+        cell = cell._next
+    yield from _iter_cells(cell)
+
+
+def _drop_while_cells(pred: Callable[[Any], Any], cell: _Cell) -> Iterator:
+    while True:
+        cell.realize()
+        if cell._value is _end:
+            return
+        if not pred(cell._value):
+            break
+        cell = cell._next  # type: ignore
+    yield from _iter_cells(cell)
+
+
+class LazySeq(Generic[T]):
+    """
+    A lazy sequence of the elements of ``coll``, which is iterated over at
+    most once. ``None`` is an empty sequence.
+    """
+    __slots__ = ("_cell",)
+
+    def __init__(self, coll: Optional[Iterable[T]] = None):
+        if isinstance(coll, LazySeq):
+            self._cell: _Cell = coll._cell
+        else:
+            self._cell = _Cell(iter(coll if coll is not None else ()))
+
+    @classmethod
+    def _from_cell(cls, cell: _Cell) -> "LazySeq[T]":
+        seq = cls.__new__(cls)
+        seq._cell = cell
+        return seq
+
+    def __iter__(self) -> Iterator[T]:
+        return _iter_cells(self._cell)
+
+    def __bool__(self):
+        self._cell.realize()
+        return self._cell._value is not _end
+
+    def first(self) -> Optional[T]:
+        """
+        Return the first element, or ``None`` if the sequence is empty.
+        """
+        self._cell.realize()
+        value = self._cell._value
+        return None if value is _end else value
+
+    def rest(self) -> "LazySeq[T]":
+        """
+        Return a ``LazySeq`` of the elements after the first one. It shares
+        its elements with this sequence.
+        """
+        cell = self._cell
+        cell.realize()
+        if cell._next is None:
+            return self
+        return LazySeq._from_cell(cell._next)
+
+    def drop(self, n: int) -> "LazySeq[T]":
+        """
+        Return a ``LazySeq`` of the elements after the first ``n`` ones. The
+        elements are skipped when it's first used.
+        """
+        return LazySeq(_drop_cells(n, self._cell))
+
+    def drop_while(self, pred: Callable[[T], Any]) -> "LazySeq[T]":
+        """
+        Return a ``LazySeq`` of the elements starting from the first one for
+        which ``pred`` is logical false.
+        """
+        return LazySeq(_drop_while_cells(pred, self._cell))
+
+    def __repr__(self):
+        # Don't realize anything
+        values = []
+        cell: Optional[_Cell] = self._cell
+        while cell is not None and cell._source is None and cell._value is not _end and len(values) < 10:
+            values.append(repr(cell._value))
+            cell = cell._next
+        if cell is not None and (cell._source is not None or cell._value is not _end):
+            values.append("...")
+        return "<LazySeq (%s)>" % " ".join(values)
@@ -0,0 +1,349 @@
+# -*- coding: UTF-8 -*-
+"""
+Fluent pipelines, i.e. Clojure’s ``->>`` threading macro:
+
+    >>> Seq(coll).map(inc).filter(is_even).distinct().count()
+
+is equivalent to ``count(distinct(filter(is_even, map(inc, coll))))``. The
+stages are only recorded until a terminal operation such as ``count`` or
+``first`` is called, or the pipeline is iterated over. The plan is then
+optimized and run as a single fused loop (see ``clj.transducers``).
+
+Functions passed to ``map`` are assumed to be free of side effects, which lets
+the optimizer skip some calls (e.g. ``Seq(coll).map(f).count()`` doesn't call
+``f``). Use ``map(f, pure=False)`` when this isn’t the case.
+
+``Seq(coll).map(inc).distinct().instrument(sink)`` runs each stage on its own
+and reports its statistics to ``sink``; see ``clj.instrument``.
+"""
+import collections.abc as collections_abc
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from clj.fns import comp, identity
+from clj import instrument
+from clj import transducers as xf
+
+
+class _Stage(NamedTuple):
+    name: str
+    args: Tuple
+    # Only used for maps
+    pure: bool = True
+
+
+def _fn_name(f: Callable) -> str:
+    return getattr(f, "__name__", None) or repr(f)
+
+
+def _format_stage(stage: _Stage) -> str:
+    if stage.name == "map":
+        fns = stage.args
+        name = _fn_name(fns[0]) if len(fns) == 1 else \
+            "comp(%s)" % ", ".join(_fn_name(f) for f in reversed(fns))
+        return "map(%s%s)" % (name, "" if stage.pure else ", pure=False")
+
+    args = []
+    for arg in stage.args:
+        args.append(_fn_name(arg) if callable(arg) else repr(arg))
+    return "%s(%s)" % (stage.name, ", ".join(args))
+
+
+def _merge(a: _Stage, b: _Stage) -> Optional[List[_Stage]]:
+    """
+    Return a list of stages equivalent to the stage ``a`` followed by ``b``,
+    or ``None`` if there's nothing to optimize.
+    """
+    if a.name == "map":
+        if b.name == "map":
+            return [_Stage("map", a.args + b.args, a.pure and b.pure)]
+
+        if a.pure and b.name in ("take", "drop"):
+            return [b, a]
+
+    elif a.name == b.name == "take":
+        return [_Stage("take", (min(a.args[0], b.args[0]),))]
+
+    elif a.name == b.name == "drop":
+        return [_Stage("drop", (max(a.args[0], 0) + max(b.args[0], 0),))]
+
+    return None
+
+
+def _optimize(stages: List[_Stage]) -> List[_Stage]:
+    stages = list(stages)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(stages) - 1):
+            merged = _merge(stages[i], stages[i + 1])
+            if merged is not None:
+                stages[i:i + 2] = merged
+                changed = True
+                break
+
+    return stages
+
+
+def _xform(stage: _Stage) -> xf.Transducer:
+    if stage.name == "map":
+        fns = stage.args
+        return xf.map(fns[0] if len(fns) == 1 else comp(*reversed(fns)))
+    if stage.name == "cat":
+        return xf.cat
+    return getattr(xf, stage.name)(*stage.args)
+
+
+def _count_sized(coll: Any, stages: List[_Stage]) -> Optional[int]:
+    """
+    Count the elements of ``coll`` after ``stages`` without iterating over it,
+    if possible.
+    """
+    if not isinstance(coll, collections_abc.Sized):
+        return None
+
+    n = len(coll)
+    for stage in stages:
+        if stage.name == "take":
+            n = max(min(n, stage.args[0]), 0)
+        elif stage.name == "drop":
+            n = max(n - max(stage.args[0], 0), 0)
+        else:
+            return None
+    return n
+
+
+def _strip_trailing_maps(stages: List[_Stage]) -> List[_Stage]:
+    """
+    Remove the pure maps at the end of ``stages``, which don't change the
+    number of elements.
+    """
+    end = len(stages)
+    while end and stages[end - 1].name == "map" and stages[end - 1].pure:
+        end -= 1
+    return stages[:end]
+
+
+def _count_rf(n: int, _: Any) -> int:
+    return n + 1
+
+
+def _first_rf(_: Any, x: Any) -> Any:
+    return xf.reduced(x)
+
+
+def _last_rf(_: Any, x: Any) -> Any:
+    return x
+
+
+class Seq:
+    """
+    A lazy pipeline over ``coll``. Each stage method returns a new ``Seq``, so
+    a pipeline can be extended in several ways.
+    """
+
+    def __init__(self, coll: Iterable, _stages: Tuple[_Stage, ...] = (), _sink: Optional[instrument.Sink] = None):
+        self._coll = coll
+        self._stages = _stages
+        self._sink = _sink
+
+    def _then(self, name: str, *args: Any, pure: bool = True) -> "Seq":
+        return Seq(self._coll, self._stages + (_Stage(name, args, pure),), self._sink)
+
+    def __repr__(self):
+        return "<Seq %s>" % " ->> ".join([type(self._coll).__name__] + [_format_stage(s) for s in self._stages])
+
+    # Stages
+
+    def distinct(self) -> "Seq":
+        return self._then("distinct")
+
+    def filter(self, pred: Callable[[Any], Any]) -> "Seq":
+        return self._then("filter", pred)
+
+    def remove(self, pred: Callable[[Any], Any]) -> "Seq":
+        return self._then("remove", pred)
+
+    def keep(self, f: Callable[[Any], Any]) -> "Seq":
+        return self._then("keep", f)
+
+    def keep_indexed(self, f: Callable[[int, Any], Any]) -> "Seq":
+        return self._then("keep_indexed", f)
+
+    def cat(self) -> "Seq":
+        return self._then("cat")
+
+    def map(self, f: Callable[[Any], Any], pure: bool = True) -> "Seq":
+        return self._then("map", f, pure=pure)
+
+    def mapcat(self, f: Callable[[Any], Iterable]) -> "Seq":
+        return self._then("mapcat", f)
+
+    def interpose(self, sep: Any) -> "Seq":
+        return self._then("interpose", sep)
+
+    def drop(self, n: int) -> "Seq":
+        return self._then("drop", n)
+
+    def drop_while(self, pred: Callable[[Any], Any]) -> "Seq":
+        return self._then("drop_while", pred)
+
+    def take(self, n: int) -> "Seq":
+        return self._then("take", n)
+
+    def take_nth(self, n: int) -> "Seq":
+        return self._then("take_nth", n)
+
+    def take_while(self, pred: Callable[[Any], Any]) -> "Seq":
+        return self._then("take_while", pred)
+
+    def replace(self, smap: Dict) -> "Seq":
+        return self._then("replace", smap)
+
+    def map_indexed(self, f: Callable[[int, Any], Any]) -> "Seq":
+        return self._then("map_indexed", f)
+
+    def dedupe(self) -> "Seq":
+        return self._then("dedupe")
+
+    def partition(self, n: int) -> "Seq":
+        return self._then("partition", n)
+
+    def partition_all(self, n: int) -> "Seq":
+        return self._then("partition_all", n)
+
+    def partition_by(self, f: Callable[[Any], Hashable]) -> "Seq":
+        return self._then("partition_by", f)
+
+    def instrument(self, sink: Optional[instrument.Sink] = None) -> "Seq":
+        """
+        Return a pipeline whose stages are run one by one rather than fused,
+        and report their statistics to ``sink`` (by default, the sink given to
+        ``clj.instrument.enable``). If ``sink`` isn't given and
+        instrumentation isn't enabled, return this pipeline.
+        """
+        if sink is None:
+            sink = instrument.default_sink()
+            if sink is None:
+                return self
+        return Seq(self._coll, self._stages, sink)
+
+    # Plans
+
+    def _plan(self, terminal: Optional[str] = None) -> Tuple[List[_Stage], Optional[str]]:
+        """
+        Return the optimized stages for ``terminal`` as well as a description
+        of the way the terminal operation is run, if any.
+        """
+        stages = list(self._stages)
+
+        if terminal == "first":
+            return _optimize(stages + [_Stage("take", (1,))]), "stop at the first element"
+
+        if terminal == "count":
+            stages = _optimize(_strip_trailing_maps(_optimize(stages)))
+            if _count_sized(self._coll, stages) is not None:
+                return stages, "computed from len()"
+            return stages, "count the elements"
+
+        return _optimize(stages), None
+
+    def _xform(self, stages: List[_Stage]) -> xf.Transducer:
+        if not stages:
+            return identity
+        return comp(*[_xform(stage) for stage in stages])
+
+    def _source(self, stages: List[_Stage]) -> Tuple[Iterable, List[_Stage]]:
+        """
+        Return the collection and the stages to run: if the pipeline is
+        instrumented, the stages are run by instrumented generators.
+        """
+        if self._sink is None:
+            return self._coll, stages
+
+        coll = self._coll
+        for stage in stages:
+            coll = instrument.stage(xf.sequence, _xform(stage), coll, name=_format_stage(stage), sink=self._sink,
+                                    buffered=instrument.BUFFERS.get(stage.name))
+        return coll, []
+
+    def explain(self, terminal: Optional[str] = None) -> str:
+        """
+        Return a description of the optimized plan. If ``terminal`` is given,
+        e.g. ``"count"``, describe the plan of this terminal operation.
+        """
+        stages, how = self._plan(terminal)
+        lines = ["source: %s" % type(self._coll).__name__]
+        for i, stage in enumerate(stages):
+            lines.append("%d: %s" % (i, _format_stage(stage)))
+        if terminal is not None:
+            lines.append("terminal: %s%s" % (terminal, " (%s)" % how if how else ""))
+        return "\n".join(lines)
+
+    # Terminal operations
+
+    def __iter__(self) -> Iterator:
+        coll, stages = self._source(self._plan()[0])
+        if not stages:
+            return iter(coll)
+        return xf.sequence(self._xform(stages), coll)
+
+    def to_list(self) -> list:
+        """
+        Return a list of the elements.
+        """
+        return list(self)
+
+    def into(self, to: Any) -> Any:
+        """
+        Add the elements to ``to`` and return it; see ``clj.into``.
+        """
+        coll, stages = self._source(self._plan()[0])
+        if not stages:
+            return xf.into(to, coll)
+        return xf.into(to, coll, self._xform(stages))
+
+    def reduce(self, f: Callable[[Any, Any], Any], init: Any) -> Any:
+        """
+        Reduce the elements with ``f``, starting with ``init``.
+        """
+        coll, stages = self._source(self._plan()[0])
+        return xf.transduce(self._xform(stages), f, coll, init)
+
+    def count(self) -> int:
+        """
+        Return the number of elements.
+        """
+        stages, _ = self._plan("count")
+        n = _count_sized(self._coll, stages)
+        if n is not None:
+            return n
+        coll, stages = self._source(stages)
+        return xf.transduce(self._xform(stages), _count_rf, coll, 0)
+
+    def first(self) -> Any:
+        """
+        Return the first element, or ``None`` if there are none. Only the
+        elements needed to find it are consumed.
+        """
+        coll, stages = self._source(self._plan("first")[0])
+        return xf.transduce(self._xform(stages), _first_rf, coll, None)
+
+    def last(self) -> Any:
+        """
+        Return the last element, or ``None`` if there are none.
+        """
+        coll, stages = self._source(self._plan()[0])
+        return xf.transduce(self._xform(stages), _last_rf, coll, None)
+
+    def some(self, pred: Callable[[Any], Any]) -> Any:
+        """
+        Return the first element for which ``pred(x)`` is logical true, or
+        ``None``.
+        """
+        return self.filter(pred).first()
+
+    def every(self, pred: Callable[[Any], Any]) -> bool:
+        """
+        Return ``True`` if ``pred(x)`` is logical true for every element.
+        """
+        return self.remove(pred).take(1).count() == 0
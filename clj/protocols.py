@@ -0,0 +1,104 @@
+# -*- coding: UTF-8 -*-
+"""
+Protocols, like Clojure’s: they let other types plug faster implementations
+into ``clj.seqs`` and ``clj.chunked``.
+
+    >>> from clj import protocols
+    >>> protocols.ICounted.extend(RingBuffer, count=lambda buf: buf.size)
+    >>> protocols.ISliceable.extend(RingBuffer, slice=RingBuffer.islice)
+
+Implementations are looked up by the type of the collection, then its base
+classes, and cached per type. Looking up a protocol nobody extended is almost
+free.
+
+=========================  ========================================  ====================================
+Protocol                   Methods                                   Used by
+=========================  ========================================  ====================================
+``ICounted``               ``count(coll) -> int``                    ``count``, ``last``, ``reverse``,
+                                                                     ``butlast``, ``drop_last``,
+                                                                     ``partition``, ``partition_all``
+``IIndexed``               ``nth(coll, i)``, raises ``IndexError``   ``nth``, ``first``, ``last``,
+                                                                     ``reverse``
+``IReversible``            ``rseq(coll) -> Iterable``                ``last``, ``reverse``
+``ISliceable``             ``slice(coll, start, stop) -> Iterable``  ``drop``, ``take``, ``butlast``,
+                           (``stop`` may be ``None``)                ``drop_last``, ``partition``,
+                                                                     ``partition_all``
+``IChunked``               ``chunks(coll, size) -> Iterable``        ``count``, ``clj.chunked.chunked``
+                           of non-empty sequences of about
+                           ``size`` elements
+``IEmptyableCollection``   ``empty(coll)``                           ``empty``
+=========================  ========================================  ====================================
+"""
+import types
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class Protocol:
+    """
+    A named set of methods that types can implement with ``extend``.
+    """
+
+    def __init__(self, name: str, methods: Tuple[str, ...]):
+        self.name = name
+        self.methods = methods
+        self._implementations: Dict[type, Any] = {}
+        # Implementations by type, including the ones found on a base class
+        # and the types that don't implement the protocol (None)
+        self._cache: Dict[type, Any] = {}
+
+    def __repr__(self):
+        return "<Protocol %s>" % self.name
+
+    def extend(self, cls: type, **methods: Callable) -> None:
+        """
+        Implement the protocol for ``cls`` and its subclasses, with a function
+        for each of its methods.
+        """
+        if set(methods) != set(self.methods):
+            raise TypeError("%s needs the methods %s, got %s" % (self.name, ", ".join(self.methods),
+                                                                 ", ".join(sorted(methods)) or "none"))
+        self._implementations[cls] = types.SimpleNamespace(**methods)
+        self._cache.clear()
+
+    def find(self, coll: Any) -> Any:
+        """
+        Return the implementation of the protocol for ``coll``, whose
+        attributes are the methods, or ``None``.
+        """
+        if not self._implementations:
+            return None
+        cls = type(coll)
+        try:
+            return self._cache[cls]
+        except KeyError:
+            implementation = None
+            for base in cls.__mro__:
+                implementation = self._implementations.get(base)
+                if implementation is not None:
+                    break
+            self._cache[cls] = implementation
+            return implementation
+
+
+def satisfies(protocol: Protocol, x: Any) -> bool:
+    """
+    Return ``True`` if ``x`` is of a type that implements ``protocol``.
+    """
+    return protocol.find(x) is not None
+
+
+ICounted = Protocol("ICounted", ("count",))
+IIndexed = Protocol("IIndexed", ("nth",))
+IReversible = Protocol("IReversible", ("rseq",))
+ISliceable = Protocol("ISliceable", ("slice",))
+IChunked = Protocol("IChunked", ("chunks",))
+IEmptyableCollection = Protocol("IEmptyableCollection", ("empty",))
+
+
+def _count(coll: Any) -> Optional[int]:
+    """
+    Return the number of elements of ``coll`` from its ``ICounted``
+    implementation, if any.
+    """
+    counted = ICounted.find(coll)
+    return None if counted is None else counted.count(coll)
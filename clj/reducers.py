@@ -0,0 +1,216 @@
+# -*- coding: UTF-8 -*-
+"""
+Parallel folds, like Clojure’s ``clojure.core.reducers/fold``: a collection
+is split in pieces that are reduced in parallel, and the partial results are
+combined.
+
+    >>> from clj.reducers import fold, monoid
+    >>> fold(monoid(operator.add, int), square_and_add, range(10 ** 8), n=100_000, executor="process")
+
+Because of the GIL, pure-Python reductions only run in parallel on a pool of
+processes (``executor="process"``); the functions and, for collections that
+aren't ranges, the elements must then be picklable.
+"""
+import collections
+import collections.abc as collections_abc
+import concurrent.futures
+import functools
+import itertools
+from typing import Any, Callable, Deque, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union, cast
+
+from clj.seqs import _make_executor
+
+T = TypeVar('T')
+
+# We use this as a default value for some arguments in order to check if they
+# were provided or not
+_nil = object()
+
+# Number of tasks per worker the pieces are grouped in, to balance the load
+# without submitting a task per piece
+_TASKS_PER_WORKER = 4
+
+# Number of pieces read at once from iterators, and reduced by the same task
+_PIECES_PER_CHUNK = 8
+
+
+class _Monoid:
+    # A class rather than a closure so that it can be pickled
+    def __init__(self, op: Callable[[Any, Any], Any], ctor: Callable[[], Any]):
+        self.op = op
+        self.ctor = ctor
+
+    def __call__(self, *args):
+        if not args:
+            return self.ctor()
+        return self.op(*args)
+
+
+def monoid(op: Callable[[Any, Any], Any], ctor: Callable[[], Any]) -> Callable:
+    """
+    Return a function that calls ``ctor()`` when called without arguments,
+    and ``op(a, b)`` when called with two. It's meant to be used as the
+    ``combinef`` of ``fold``, e.g. ``monoid(operator.add, int)``.
+    """
+    return _Monoid(op, ctor)
+
+
+def _combine(combinef: Callable[[Any, Any], Any], values: List) -> Any:
+    """
+    Combine ``values`` as a balanced tree, keeping their order.
+    """
+    while len(values) > 1:
+        combined = [combinef(values[i], values[i + 1]) for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            combined.append(values[-1])
+        values = combined
+    return values[0]
+
+
+def _reduce_pieces(combinef: Callable, reducef: Callable, init: Tuple, coll: Sequence, start: int, end: int,
+                   n: int) -> Any:
+    """
+    Reduce the elements of ``coll`` from ``start`` to ``end`` by pieces of
+    ``n`` elements, and combine the results. ``init`` is an empty tuple if
+    ``combinef()`` must be used for each piece.
+    """
+    # This is a module-level function so that it can be pickled. Iterating a
+    # slice of each piece is faster than indexing each element, and only
+    # copies one piece at a time (or none, for ranges and NumPy arrays).
+    partials = []
+    for i in range(start, end, n):
+        partials.append(functools.reduce(reducef, coll[i:min(i + n, end)], init[0] if init else combinef()))
+    return _combine(combinef, partials)
+
+
+def _is_indexable(coll: Any) -> bool:
+    """
+    Return ``True`` if ``coll`` can be split in pieces with slices, which
+    ``_reduce_pieces`` uses.
+    """
+    # Deques are sequences, but they can't be sliced
+    if isinstance(coll, (collections.deque, collections_abc.Mapping)):
+        return False
+    # array.array, NumPy arrays, etc. aren't always registered as sequences
+    if not isinstance(coll, collections_abc.Sequence) and not (hasattr(coll, "__getitem__") and
+                                                               hasattr(coll, "__len__")):
+        return False
+    try:
+        coll[0:0]
+    except (TypeError, KeyError, ValueError):
+        return False
+    return True
+
+
+def fold(combinef: Callable, reducef: Callable[[Any, T], Any], coll: Iterable[T], n: int = 512,
+         executor: Union[str, concurrent.futures.Executor] = "thread", workers: Optional[int] = None,
+         init: Any = _nil) -> Any:
+    """
+    Reduce ``coll`` by pieces of about ``n`` elements with ``reducef``, in
+    parallel, and combine the results with ``combinef``. Each reduction starts
+    with ``combinef()``; ``combinef(a, b)`` combines two results. ``combinef``
+    must be associative, and ``combinef()`` its identity. See ``monoid``.
+
+    If ``init`` is given, it's used as the start of each reduction instead of
+    ``combinef()``; it must not be modified by ``reducef``.
+
+    Indexable collections (lists, tuples, ranges, arrays) are split by index
+    rather than copied, except for the parts sent to processes. Other
+    iterables are read by chunks. The pieces are run on a pool of ``workers``
+    threads or processes, as for ``clj.pmap``, unless ``coll`` has at most
+    ``n`` elements. The results are combined as a balanced tree, in the order
+    of the pieces.
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    # A tuple rather than _nil so that it can be sent to other processes
+    start: Tuple = () if init is _nil else (init,)
+
+    if _is_indexable(coll):
+        size = len(coll)  # type: ignore
+        if not size:
+            return _empty_result(combinef, start)
+        if size <= n:
+            return _reduce_pieces(combinef, reducef, start, cast(Sequence, coll), 0, size, n)
+    else:
+        coll = iter(coll)
+
+    pool, owned = _make_executor(executor, workers)
+    try:
+        if isinstance(coll, collections_abc.Iterator):
+            return _fold_iterator(combinef, reducef, start, coll, n, pool)
+        return _fold_indexable(combinef, reducef, start, coll, n, pool)
+    finally:
+        if owned:
+            pool.shutdown()
+
+
+def _empty_result(combinef: Callable, init: Tuple) -> Any:
+    return init[0] if init else combinef()
+
+
+def _workers(pool: concurrent.futures.Executor) -> int:
+    return getattr(pool, "_max_workers", None) or 1
+
+
+def _fold_indexable(combinef: Callable, reducef: Callable, init: Tuple, coll: Any, n: int,
+                    pool: concurrent.futures.Executor) -> Any:
+    size = len(coll)
+    pieces = -(-size // n)
+    # Each task reduces a range of consecutive pieces
+    pieces_per_task = max(pieces // (_workers(pool) * _TASKS_PER_WORKER), 1)
+    step = pieces_per_task * n
+    to_processes = isinstance(pool, concurrent.futures.ProcessPoolExecutor)
+
+    futures = []
+    for start in range(0, size, step):
+        end = min(start + step, size)
+        if to_processes:
+            # Only send the elements of the task; slicing a range doesn't
+            # copy it
+            futures.append(pool.submit(_reduce_pieces, combinef, reducef, init, coll[start:end], 0, end - start, n))
+        else:
+            futures.append(pool.submit(_reduce_pieces, combinef, reducef, init, coll, start, end, n))
+
+    try:
+        return _combine(combinef, [future.result() for future in futures])
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _fold_iterator(combinef: Callable, reducef: Callable, init: Tuple, coll: Iterable, n: int,
+                   pool: concurrent.futures.Executor) -> Any:
+    max_in_flight = 2 * _workers(pool)
+    pending: Deque[concurrent.futures.Future] = collections.deque()
+
+    # Partial results, combined as they come like in a binary counter so that
+    # the combinations form a balanced tree. Each one is a tuple of
+    # (number of pieces, value).
+    partials: List[Tuple[int, Any]] = []
+
+    def add_partial(value):
+        count = 1
+        while partials and partials[-1][0] == count:
+            count *= 2
+            value = combinef(partials.pop()[1], value)
+        partials.append((count, value))
+
+    try:
+        while True:
+            chunk = list(itertools.islice(coll, n * _PIECES_PER_CHUNK))
+            if not chunk:
+                break
+            pending.append(pool.submit(_reduce_pieces, combinef, reducef, init, chunk, 0, len(chunk), n))
+            if len(pending) >= max_in_flight:
+                add_partial(pending.popleft().result())
+
+        while pending:
+            add_partial(pending.popleft().result())
+    finally:
+        for future in pending:
+            future.cancel()
+
+    if not partials:
+        return _empty_result(combinef, init)
+    return _combine(combinef, [value for _, value in partials])
@@ -3,8 +3,20 @@ import random
 import collections
 import itertools
 import collections.abc as collections_abc
+import concurrent.futures
+import os
+import queue
+import sys
+import threading
 
-from typing import Iterable, TypeVar, Any, Callable, Iterator, Union, Tuple, Dict, Optional, List, Set, cast, Deque
+from typing import (Iterable, TypeVar, Any, Callable, Iterator, Union, Tuple, Dict, Optional, List, Set, cast, Deque,
+                    Sequence, Hashable)
+
+from clj import _numpy
+from clj import protocols
+from clj import views
+from clj.lazyseq import LazySeq
+from clj.trackers import Tracker
 
 # We use this as a default value for some arguments in order to check if they
 # were provided or not
@@ -27,18 +39,58 @@ def _make_gen(g: Iterable[T]) -> Iterator[T]:
         yield e
 
 
+# Size of the chunks of IChunked collections when they're counted
+_COUNT_CHUNK_SIZE = 4096
+
+
+def _is_sized(coll: Any) -> bool:
+    """
+    Return ``True`` if ``len(coll)`` is the number of items of ``coll``, which
+    can be iterated over several times.
+    """
+    return isinstance(coll, collections_abc.Sized) and not isinstance(coll, collections_abc.Iterator)
+
+
 # The order of the functions here match the one in the Clojure docs:
 #     http://clojure.org/reference/sequences
 
-def distinct(coll: Iterable[T]) -> Iterable[T]:
+def distinct(coll: Iterable[T], key: Optional[Callable[[T], Hashable]] = None, tracker: Optional[Tracker] = None) \
+        -> Iterable[T]:
     """
     Return a generator of the elements of ``coll`` with duplicates removed.
+
+    If ``key`` is given, elements are duplicates if ``key`` returns the same
+    value for them. By default all keys are kept in memory; pass a
+    ``tracker`` from ``clj.trackers`` to bound it, at the cost of exactness.
     """
-    seen = set()
-    for e in coll:
-        if e not in seen:
-            seen.add(e)
-            yield e
+    if key is None and tracker is None and _numpy.is_numeric_array(coll):
+        yield from _numpy.distinct(coll)
+        return
+
+    if tracker is not None:
+        add = tracker.add
+        if key is None:
+            for e in coll:
+                if not add(e):
+                    yield e
+        else:
+            for e in coll:
+                if not add(key(e)):
+                    yield e
+        return
+
+    seen: Set[Hashable] = set()
+    if key is None:
+        for e in coll:
+            if e not in seen:
+                seen.add(e)
+                yield e
+    else:
+        for e in coll:
+            k = key(e)
+            if k not in seen:
+                seen.add(k)
+                yield e
 
 
 # alias
@@ -126,6 +178,10 @@ def interleave(*colls) -> Iterable:
     """
     Returns a generator of the first item in each coll, then the second etc.
     """
+    if _numpy.can_interleave(colls):
+        yield from _numpy.interleave(colls)
+        return
+
     iterators = [iter(coll) for coll in colls]
 
     try:
@@ -151,23 +207,43 @@ def interpose(sep: T2, coll: Iterable[T]) -> Iterable[Union[T, T2]]:
         yield e
 
 
+def _viewable(coll: Any, protocol: protocols.Protocol) -> bool:
+    """
+    Return ``True`` if a view of ``coll`` should be returned rather than a
+    generator, i.e. it's a sequence that doesn't implement ``protocol``.
+    """
+    return views.is_viewable(coll) and protocol.find(coll) is None
+
+
 def rest(coll: Iterable[T]) -> Iterable[T]:
     """
-    Returns a possibly empty generator of the items after the first.
+    Returns a possibly empty generator of the items after the first, or a view
+    if ``coll`` is a sequence.
     """
     return drop(1, coll)
 
 
 def drop(n: int, coll: Iterable[T]) -> Iterable[T]:
     """
-    Returns a generator of all but the first ``n`` items in ``coll``.
+    Returns a generator of all but the first ``n`` items in ``coll``, or a
+    view if ``coll`` is a sequence (see ``clj.views``).
     """
+    if _viewable(coll, protocols.ISliceable):
+        return views.SliceView(cast(Sequence, coll), max(n, 0))
+    return _drop(n, coll)
+
+
+def _drop(n: int, coll: Iterable[T]) -> Iterator[T]:
     if coll is None:
         return
 
-    for i, e in enumerate(coll):
-        if i >= n:
-            yield e
+    sliceable = protocols.ISliceable.find(coll)
+    if sliceable is not None:
+        yield from sliceable.slice(coll, max(n, 0), None)
+        return
+
+    # drop returns a view of the sequences that don't extend ISliceable
+    yield from itertools.islice(coll, max(n, 0), None)
 
 
 def drop_while(pred: Callable[[T], Any], coll: Iterable[T]) -> Iterable[T]:
@@ -183,21 +259,40 @@ def drop_while(pred: Callable[[T], Any], coll: Iterable[T]) -> Iterable[T]:
 def take(n: int, coll: Iterable[T]) -> Iterable[T]:
     """
     Returns a generator of the first ``n`` items in ``coll``, or all items if
-    there are fewer than ``n``.
+    there are fewer than ``n``. Returns a view if ``coll`` is a sequence.
     """
+    if _viewable(coll, protocols.ISliceable):
+        return views.SliceView(cast(Sequence, coll), 0, max(n, 0))
+    return _take(n, coll)
+
+
+def _take(n: int, coll: Iterable[T]) -> Iterator[T]:
     if n <= 0:
         return
 
-    for i, e in enumerate(coll):
-        yield e
-        if i + 1 >= n:
-            break
+    sliceable = protocols.ISliceable.find(coll)
+    if sliceable is not None:
+        yield from sliceable.slice(coll, 0, n)
+        return
+
+    yield from itertools.islice(coll, n)
 
 
 def take_nth(n: int, coll: Iterable[T]) -> Iterable[T]:
     """
-    Returns a generator of every ``n``th item in ``coll``.
+    Returns a generator of every ``n``th item in ``coll``, or a view if ``n``
+    is positive and ``coll`` is a sequence.
     """
+    if n > 0 and _viewable(coll, protocols.ISliceable):
+        return views.StridedView(cast(Sequence, coll), n)
+    return _take_nth(n, coll)
+
+
+def _take_nth(n: int, coll: Iterable[T]) -> Iterator[T]:
+    if n > 0 and _numpy.is_numeric_array(coll):
+        yield from _numpy.take_nth(n, coll)
+        return
+
     if n <= 0:
         for e in coll:
             while True:
@@ -218,10 +313,42 @@ def take_while(pred: Callable[[T], Any], coll: Iterable[T]) -> Iterable[T]:
     return itertools.takewhile(pred, coll)
 
 
+def _slice_but_last(n: int, coll: Iterable[T]) -> Optional[Iterable[T]]:
+    """
+    Return all but the last ``n`` items of ``coll`` using its ``ISliceable``
+    and ``ICounted`` implementations, or ``None`` if it has none.
+    """
+    sliceable = protocols.ISliceable.find(coll)
+    if sliceable is None:
+        return None
+    size = protocols._count(coll)
+    if size is None:
+        return None
+    return sliceable.slice(coll, 0, max(size - max(n, 0), 0))
+
+
 def butlast(coll: Iterable[T]) -> Iterable[T]:
     """
-    Return a generator of all but the last item in ``coll``, in linear time.
+    Return a generator of all but the last item in ``coll``, in linear time,
+    or a view if ``coll`` is a sequence.
+    """
+    if _viewable(coll, protocols.ISliceable):
+        return views.SliceView(cast(Sequence, coll), 0, max(len(cast(Sequence, coll)) - 1, 0))
+    return _drop_last(1, coll)
+
+
+def drop_last(n: int, coll: Iterable[T]) -> Iterable[T]:
+    """
+    Return a generator of all but the last ``n`` items in ``coll``, or a view
+    if ``coll`` is a sequence.
     """
+    if _viewable(coll, protocols.ISliceable):
+        return views.SliceView(cast(Sequence, coll), 0, max(len(cast(Sequence, coll)) - max(n, 0), 0))
+    return _drop_last(n, coll)
+
+
+def _butlast(coll: Iterable[T]) -> Iterator[T]:
+    # Only called by _drop_last, once its other paths were tried
     first_ = True
     last_e: Optional[T] = None
     for e in coll:
@@ -234,13 +361,22 @@ def butlast(coll: Iterable[T]) -> Iterable[T]:
         last_e = e
 
 
-def drop_last(n: int, coll: Iterable[T]) -> Iterable[T]:
-    """
-    Return a generator of all but the last ``n`` items in ``coll``.
-    """
+def _drop_last(n: int, coll: Iterable[T]) -> Iterator[T]:
+    if _numpy.is_numeric_array(coll):
+        yield from _numpy.drop_last(n, coll)
+        return
+
+    sliced = _slice_but_last(n, coll)
+    if sliced is not None:
+        yield from sliced
+        return
+
+    if _is_sized(coll):
+        yield from itertools.islice(coll, max(len(cast(list, coll)) - max(n, 0), 0))
+        return
+
     if n == 1:
-        for e in butlast(coll):
-            yield e
+        yield from _butlast(coll)
         return
 
     queue: Deque[T] = collections.deque()
@@ -256,30 +392,69 @@ def drop_last(n: int, coll: Iterable[T]) -> Iterable[T]:
         yield queue.popleft()
 
 
-def flatten(x: Iterable) -> Iterable:
+def flatten(x: Iterable, max_depth: Optional[int] = None, leaf_types: Tuple[type, ...] = (bytes, str)) -> Iterable:
     """
     Takes any nested combination of sequential things (``list``s, ``tuple``s,
     etc.) and returns their contents as a single, flat sequence.
-    """
-    # FIXME:
-    #   > RecursionError: maximum recursion depth exceeded in comparison
-    #   When called with a very deep list (~1000 levels of depth)
-
-    # Avoid lookup at each loop without leaking [Iterable] in the module scope
-    # by using [from collections import Iterable].
-    iterable_class = collections.abc.Iterable
-    for e in x:
-        if isinstance(e, iterable_class) and not isinstance(e, (bytes, str)):
-            for sub_e in flatten(e):
-                yield sub_e
-        else:
+
+    ``max_depth`` limits the number of levels that are flattened: nested
+    iterables deeper than that are returned as they are. Instances of
+    ``leaf_types`` are not flattened even if they are iterable. Strings of one
+    character are always leaves, since they iterate over themselves.
+    """
+    # The elements at the top of a stack of this size are not flattened
+    max_stack = -1 if max_depth is None else max(max_depth, 0) + 1
+
+    # Whether elements of a given type are flattened. Checking the type in a
+    # dict is much faster than isinstance() with an ABC.
+    is_branch: Dict[type, bool] = {}
+    iterable_class = collections_abc.Iterable
+
+    # Use an explicit stack of iterators rather than recursion so that there
+    # is no depth limit, and each element is only yielded once.
+    stack = [iter(x)]
+    while stack:
+        for e in stack[-1]:
+            e_type = type(e)
+            branch = is_branch.get(e_type)
+            if branch is None:
+                branch = is_branch[e_type] = issubclass(e_type, iterable_class) and not issubclass(e_type, leaf_types)
+
+            if branch and len(stack) != max_stack and not (isinstance(e, str) and len(e) == 1):
+                stack.append(iter(e))
+                break
             yield e
+        else:
+            stack.pop()
 
 
 def reverse(coll: Iterable[T]) -> Iterable[T]:
     """
-    Return an iterator of the items in ``coll`` in reverse order. Not lazy.
+    Return an iterator of the items in ``coll`` in reverse order, or a view if
+    ``coll`` is a sequence. Not lazy.
     """
+    if _viewable(coll, protocols.IReversible) and protocols.IIndexed.find(coll) is None:
+        return views.ReversedView(cast(Sequence, coll))
+    return _reverse(coll)
+
+
+def _reverse(coll: Iterable[T]) -> Iterator[T]:
+    reversible = protocols.IReversible.find(coll)
+    if reversible is not None:
+        yield from reversible.rseq(coll)
+        return
+    indexed = protocols.IIndexed.find(coll)
+    if indexed is not None:
+        size = protocols._count(coll)
+        if size is not None:
+            for i in _range(size - 1, -1, -1):
+                yield indexed.nth(coll, i)
+            return
+
+    if _numpy.is_numeric_array(coll):
+        yield from _numpy.reverse(coll)
+        return
+
     for e in reversed(list(coll)):
         yield e
 
@@ -293,56 +468,316 @@ def shuffle(coll: Iterable[T]) -> Iterable[T]:
     return coll
 
 
-def _iter(coll, n=0):
-    # If it's an iterator, we already consumed the beginning
-    if isinstance(coll, collections.abc.Iterator):
-        return coll
-    return coll[n:]
+def split_at(n: int, coll: Iterable[T]) -> Tuple[Iterable[T], Iterable[T]]:
+    """
+    Returns a tuple of ``(take(n, coll), drop(n coll))``, as two ``LazySeq``s
+    that share the elements read from ``coll``. Both are lazy, and can be
+    iterated over several times. If ``coll`` is a sequence, they are views of
+    it instead.
+    """
+    if _viewable(coll, protocols.ISliceable):
+        n = min(max(n, 0), len(cast(Sequence, coll)))
+        return views.SliceView(cast(Sequence, coll), 0, n), views.SliceView(cast(Sequence, coll), n)
+
+    seq = LazySeq(coll)
+    return LazySeq(itertools.islice(seq, max(n, 0))), seq.drop(n)
 
 
-def split_at(n: int, coll: Iterable[T]) -> Tuple[Iterable[T], Iterable[T]]:
+def split_with(pred: Callable[[T], Any], coll: Iterable[T]) -> Tuple[LazySeq[T], LazySeq[T]]:
     """
-    Returns a tuple of ``(take(n, coll), drop(n coll))``.
+    Returns a tuple of ``(take_while(pred, coll), drop_while(pred coll))``, as
+    two ``LazySeq``s; see ``split_at``. ``pred`` is called on the elements of
+    the prefix by both.
     """
-    if n <= 0:
-        return [], coll
+    seq = LazySeq(coll)
+    return LazySeq(itertools.takewhile(pred, seq)), seq.drop_while(pred)
 
-    if coll is None:
-        return [], []
 
-    # Unfortunately we must consume all elements for the first case because
-    # unlike Clojure's lazy lists, Python's generators yield their elements
-    # only once.
-    taken = []
-    for i, e in enumerate(coll):
-        taken.append(e)
-        if i + 1 >= n:
-            break
+def _make_executor(executor: Union[str, concurrent.futures.Executor], workers: Optional[int]) \
+        -> Tuple[concurrent.futures.Executor, bool]:
+    """
+    Return a tuple of ``(executor, owned)`` where ``owned`` is ``True`` if the
+    executor was created here and must be shut down by the caller.
+    """
+    if isinstance(executor, concurrent.futures.Executor):
+        return executor, False
+    if executor == "thread":
+        return concurrent.futures.ThreadPoolExecutor(workers), True
+    if executor == "process":
+        return concurrent.futures.ProcessPoolExecutor(workers), True
+    raise ValueError("Unknown executor: %r" % (executor,))
+
 
-    return taken, _iter(coll, n)
+def _apply_chunk(f: Callable, chunk: List[tuple]) -> list:
+    # Module-level so that it can be pickled
+    return list(itertools.starmap(f, chunk))
 
 
-def split_with(pred: Callable[[T], Any], coll: Iterable[T]) -> Tuple[Iterable[T], Iterable[T]]:
+def pmap(f: Callable[..., T2], *colls: Iterable, workers: Optional[int] = None,
+         executor: Union[str, concurrent.futures.Executor] = "thread", chunksize: Optional[int] = None,
+         ordered: bool = True, max_in_flight: Optional[int] = None) -> Iterator[T2]:
     """
-    Returns a tuple of ``(take_while(pred, coll), drop_while(pred coll))``.
+    Like ``map``, except ``f`` is applied in parallel on a pool of ``workers``
+    threads (``executor="thread"``) or processes (``executor="process"``).
+    ``executor`` can also be an existing ``concurrent.futures.Executor``,
+    which is then not shut down.
+
+    Unlike ``Executor.map``, this is lazy: the elements of ``colls`` are read
+    by chunks of ``chunksize`` elements (default: 1 for threads, 64 for
+    processes) and at most ``max_in_flight`` chunks (default: twice the number
+    of workers) are submitted ahead of the consumer. Results are yielded in
+    order unless ``ordered=False``, in which case the chunks are yielded as
+    soon as they're done.
+
+    When using processes, ``f`` and the elements must be picklable.
     """
-    # See note in split_at.
-    taken = []
-    for i, e in enumerate(coll):
-        if pred(e):
-            taken.append(e)
-        else:
-            middle = e
-            break
+    if chunksize is not None and chunksize <= 0:
+        raise ValueError("chunksize must be positive")
+
+    pool, owned = _make_executor(executor, workers)
+    processes = isinstance(pool, concurrent.futures.ProcessPoolExecutor)
+
+    if chunksize is None:
+        chunksize = 64 if processes else 1
+
+    if max_in_flight is None:
+        max_in_flight = 2 * (workers or os.cpu_count() or 1)
+    max_in_flight = max(max_in_flight, 1)
+
+    args = zip(*colls)
+    pending: Deque[concurrent.futures.Future] = collections.deque()
+
+    def next_result() -> list:
+        if ordered:
+            return pending.popleft().result()
+
+        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        future = done.pop()
+        pending.remove(future)
+        return future.result()
+
+    try:
+        while True:
+            chunk = list(itertools.islice(args, chunksize))
+            if not chunk:
+                break
+
+            pending.append(pool.submit(_apply_chunk, f, chunk))
+            if len(pending) >= max_in_flight:
+                yield from next_result()
+
+        while pending:
+            yield from next_result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            # Before Python 3.9, a process pool that's not waited for hangs
+            # the exit of the interpreter
+            pool.shutdown(wait=processes)
+
+
+def _seque_produce(coll: Iterable, q: "queue.Queue", stop: threading.Event, chunksize: int) -> None:
+    it = iter(coll)
+    try:
+        while not stop.is_set():
+            chunk = list(itertools.islice(it, chunksize))
+            if not chunk:
+                q.put(_nil)
+                return
+            q.put(chunk)
+    except BaseException as e:
+        q.put(e)
+    finally:
+        # The consumer is gone: close the iterator from this thread, where it
+        # runs
+        close = getattr(it, "close", None)
+        if stop.is_set() and close is not None:
+            close()
+
+
+def seque(coll: Iterable[T], n: int = 100, executor: Optional[concurrent.futures.Executor] = None,
+          chunksize: int = 1) -> Iterator[T]:
+    """
+    Return a generator of the elements of ``coll``, which is read in a
+    background thread up to ``n`` elements ahead of the consumer. Reading
+    ``coll`` can then overlap with the consumer's work when either releases
+    the GIL (I/O, ``zlib``, ``hashlib``, NumPy…), or on free-threaded builds.
+
+    The thread is started on the first ``next``, in a thread pool if
+    ``executor`` is a ``ThreadPoolExecutor``. Exceptions raised while reading
+    ``coll`` are raised by the generator. When it's closed or
+    garbage-collected before the end, e.g. after ``take``, the thread stops
+    reading and closes ``coll`` if it can.
+
+    Elements are passed by lists of ``chunksize``, which reduces the overhead
+    per element for fast producers.
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    if chunksize <= 0:
+        raise ValueError("chunksize must be positive")
+    if isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        raise ValueError("seque needs threads, not processes")
+
+    q: queue.Queue = queue.Queue(max(n // chunksize, 1))
+    stop = threading.Event()
+    if executor is None:
+        # A daemon thread rather than a pool, so that a producer blocked on a
+        # consumer that's never closed doesn't prevent the interpreter from
+        # exiting
+        threading.Thread(target=_seque_produce, args=(coll, q, stop, chunksize), name="clj-seque",
+                         daemon=True).start()
     else:
-        return taken, []
+        executor.submit(_seque_produce, coll, q, stop, chunksize)
+
+    try:
+        while True:
+            item = q.get()
+            if item is _nil:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield from item
+    finally:
+        stop.set()
+        # Unblock the producer if it's waiting for room in the queue
+        try:
+            while True:
+                q.get_nowait()
+        except queue.Empty:
+            pass
 
-    def dropped_while():
-        yield middle
-        for el in _iter(coll, i + 1):
-            yield el
 
-    return taken, dropped_while()
+# Position of the closed iterators of fork, so that they're never the slowest
+_CLOSED = sys.maxsize
+
+# Maximum number of elements the iterators of fork take at once
+_FORK_CHUNK_SIZE = 64
+
+
+class _Fork:
+    """
+    State shared by the iterators returned by ``fork``: the number of
+    elements each one took from its ``tee`` iterator.
+    """
+
+    def __init__(self, n: int, max_lag: Optional[int], block: bool):
+        self.max_lag = max_lag
+        self.positions = [0] * n
+        self.error: Optional[BaseException] = None
+        # The tee iterators share the source, so they're read with the lock.
+        # It's reentrant because iterators can be garbage-collected, and
+        # closed, while the lock is held.
+        self.lock = threading.RLock()
+        self.cond = threading.Condition(self.lock) if block else None
+
+    def room(self, i: int, size: int) -> int:
+        """
+        Return how many elements iterator ``i`` can take, at most ``size``,
+        waiting if needed. Must be called with the lock.
+        """
+        if self.max_lag is None:
+            return size
+        while True:
+            lag = self.positions[i] - min(self.positions)
+            if lag < self.max_lag:
+                return min(size, self.max_lag - lag)
+            if self.cond is None:
+                raise BufferError("fork: iterator %d is %d elements ahead of the slowest one" % (i, lag))
+            self.cond.wait()
+
+    def advance(self, i: int, n: int) -> None:
+        self.positions[i] += n
+        if self.cond is not None:
+            self.cond.notify_all()
+
+    def close(self, i: int) -> None:
+        with self.lock:
+            self.positions[i] = _CLOSED
+            if self.cond is not None:
+                self.cond.notify_all()
+
+
+class _ForkIterator(Iterator[T]):
+    """
+    One of the iterators returned by ``fork``.
+    """
+
+    def __init__(self, state: _Fork, i: int, it: Iterator[T]):
+        self._state = state
+        self._i = i
+        self._it = it
+        self._chunk: Iterator[T] = iter(())
+        # Elements are taken by chunks, so that reading them doesn't go
+        # through the lock; the chunks grow so that the source isn't read
+        # too far ahead of the first elements
+        self._size = 1
+
+    def __next__(self) -> T:
+        try:
+            return next(self._chunk)
+        except StopIteration:
+            pass
+
+        state = self._state
+        with state.lock:
+            if state.positions[self._i] == _CLOSED:
+                raise StopIteration
+            try:
+                chunk = list(itertools.islice(self._it, state.room(self._i, self._size)))
+            except BufferError:
+                raise
+            except BaseException as e:
+                # The other iterators would stop silently
+                state.error = e
+                raise
+            if not chunk:
+                if state.error is not None:
+                    raise state.error
+                raise StopIteration
+            state.advance(self._i, len(chunk))
+
+        self._size = min(self._size * 2, _FORK_CHUNK_SIZE)
+        self._chunk = iter(chunk)
+        return next(self._chunk)
+
+    def close(self) -> None:
+        """
+        Stop reading, so that this iterator no longer holds elements in
+        memory or slows the others down.
+        """
+        self._chunk = iter(())
+        self._it = iter(())
+        self._state.close(self._i)
+
+    def __del__(self):
+        self.close()
+
+
+def fork(coll: Iterable[T], n: int = 2, max_lag: Optional[int] = None, block: bool = False) \
+        -> Tuple[Iterator[T], ...]:
+    """
+    Return a tuple of ``n`` independent iterators over ``coll``, like
+    ``itertools.tee``. ``coll`` is read once; each element is kept in memory
+    until every iterator has read it, so the memory used is bounded by the
+    lag between the fastest and the slowest iterators. The iterators are
+    thread-safe.
+
+    If ``max_lag`` is given, an iterator that would get more than
+    ``max_lag`` elements ahead of the slowest one raises ``BufferError``, or
+    waits for it if ``block=True``, which only makes sense when they're read
+    from different threads. The iterators take up to 64 elements at once
+    from ``coll``, so the memory used is at most ``max_lag`` elements plus
+    64 per iterator. Closed iterators and garbage-collected ones no longer
+    count.
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if max_lag is not None and max_lag <= 0:
+        raise ValueError("max_lag must be positive")
+    state = _Fork(n, max_lag, block)
+    return tuple(_ForkIterator(state, i, it) for i, it in enumerate(itertools.tee(coll, n)))
 
 
 def replace(smap: Dict[T, T2], coll: Iterable[T]) -> Iterable[Union[T, T2]]:
@@ -360,6 +795,15 @@ def reductions(f: Callable, coll: Iterable[T], init: Any = _nil) -> Iterable:
     Yield the intermediate values of the reduction (as per ``reduce``) of
     ``coll`` by ``f``, starting with ``init``.
     """
+    ufunc = _numpy.accumulator(f, coll)
+    if ufunc is not None:
+        yield from _numpy.reductions(f, ufunc, coll, init, init is not _nil)
+        return
+
+    if coll is not None:
+        # Make sure the first element is consumed by _first and not read again below
+        coll = iter(coll)
+
     first_value, is_empty = _first(coll)
     if is_empty:
         if init is _nil:
@@ -413,6 +857,13 @@ def first(coll: Iterable[T]) -> Optional[T]:
     """
     Returns the first item in the collection. If ``coll`` is empty, returns ``None``.
     """
+    indexed = protocols.IIndexed.find(coll)
+    if indexed is not None:
+        try:
+            return indexed.nth(coll, 0)
+        except IndexError:
+            return None
+
     first_value: Optional[T] = _first(coll)[0]
     return first_value
 
@@ -452,6 +903,15 @@ def nth(coll: Iterable[T], n: int, not_found: Any = _nil) -> Any:
     time, for other iterables.
     """
     if n >= 0:
+        indexed = protocols.IIndexed.find(coll)
+        if indexed is not None:
+            try:
+                return indexed.nth(coll, n)
+            except IndexError:
+                if not_found is not _nil:
+                    return not_found
+                raise
+
         if hasattr(coll, "__getitem__"):
             try:
                 return cast(list, coll)[n]
@@ -460,9 +920,14 @@ def nth(coll: Iterable[T], n: int, not_found: Any = _nil) -> Any:
                     return not_found
                 raise
 
-        for i, e in enumerate(coll):
-            if i == n:
-                return e
+        if _is_sized(coll) and isinstance(coll, collections_abc.Reversible) and n >= len(cast(list, coll)) // 2:
+            # e.g. dict views: start from the closest end
+            size = len(cast(list, coll))
+            e = _nil if n >= size else next(itertools.islice(reversed(coll), size - 1 - n, None), _nil)
+        else:
+            e = next(itertools.islice(coll, n, None), _nil)
+        if e is not _nil:
+            return e
 
     if not_found is _nil:
         raise IndexError("%s index out of range" % type(coll))
@@ -472,8 +937,22 @@ def nth(coll: Iterable[T], n: int, not_found: Any = _nil) -> Any:
 
 def last(coll: Iterable[T]) -> Optional[T]:
     """
-    Return the last item in ``coll``, in linear time. Return ``None`` if ``coll`` is empty.
+    Return the last item in ``coll``, in constant time if it's a sequence or
+    can be reversed, in linear time otherwise. Return ``None`` if ``coll`` is
+    empty.
     """
+    reversible = protocols.IReversible.find(coll)
+    if reversible is not None:
+        return next(iter(reversible.rseq(coll)), None)
+    indexed = protocols.IIndexed.find(coll)
+    if indexed is not None:
+        size = protocols._count(coll)
+        if size is not None:
+            return indexed.nth(coll, size - 1) if size else None
+
+    if isinstance(coll, collections_abc.Reversible) and not isinstance(coll, collections_abc.Iterator):
+        return next(reversed(coll), None)
+
     e = None
     for item in coll:
         e = item
@@ -500,6 +979,178 @@ def group_by(f: Callable[[T], T2], coll: Iterable[T]) -> Dict[T2, List[T]]:
     return dict(groups)
 
 
+def reduce_by(keyfn: Callable[[T], T2], f: Callable[[Any, T], Any], coll: Iterable[T], init: Any = _nil) \
+        -> Dict[T2, Any]:
+    """
+    Returns a ``dict`` of the reductions by ``f`` of the elements of ``coll``
+    that have the same ``keyfn``. This is like reducing each list returned by
+    ``group_by``, but it only keeps one value per key in memory.
+
+    Each reduction starts with ``init`` if it's given, else with the first
+    element of the key. ``init`` is shared by all the keys, so ``f`` must not
+    modify it. Use ``merge_with`` to combine the results of several calls.
+    """
+    acc: Dict[T2, Any] = {}
+    get = acc.get
+    if init is _nil:
+        for e in coll:
+            k = keyfn(e)
+            value = get(k, _nil)
+            acc[k] = e if value is _nil else f(value, e)
+    else:
+        for e in coll:
+            k = keyfn(e)
+            acc[k] = f(get(k, init), e)
+    return acc
+
+
+def frequencies(coll: Iterable[T]) -> Dict[T, int]:
+    """
+    Returns a ``dict`` of the distinct elements of ``coll`` to the number of
+    times they appear, in the order they first appear.
+    """
+    if _numpy.is_numeric_array(coll):
+        return _numpy.frequencies(coll)
+    return dict(collections.Counter(coll))
+
+
+def aggregate_by(keyfn: Callable[[T], T2], aggregates: Dict[str, Tuple], coll: Iterable[T]) \
+        -> Dict[T2, Dict[str, Any]]:
+    """
+    Like ``reduce_by`` with several reductions at once. ``aggregates`` maps
+    names to ``(f, init)`` tuples; the result maps each key to a ``dict`` of
+    the same names to the reduction of the elements of the key by ``f``,
+    starting with ``init``. The elements are read only once. Each ``init`` is
+    shared by all the keys, so its ``f`` must not modify it.
+
+        >>> aggregate_by(len, {"n": (lambda n, _: n + 1, 0), "first": (lambda a, w: a or w, None)},
+        ...              ["a", "bc", "d"])
+        {1: {'n': 2, 'first': 'a'}, 2: {'n': 1, 'first': 'bc'}}
+
+    An aggregate can also be a ``(f, init, combine)`` tuple, where ``combine``
+    is used by ``merge_aggregates`` to combine two of its values.
+    """
+    names = list(aggregates)
+    fs = [aggregate[0] for aggregate in aggregates.values()]
+    inits = [aggregate[1] for aggregate in aggregates.values()]
+    acc = _aggregator(len(fs))(coll, keyfn, fs, inits)
+    return {k: dict(zip(names, values)) for k, values in acc.items()}
+
+
+_aggregators: Dict[int, Callable] = {}
+
+
+def _aggregator(n: int) -> Callable:
+    """
+    Return a function that runs ``n`` aggregations in a single loop. Like for
+    fused transducers, we generate its code so that there's no inner loop on
+    the aggregations for each element.
+    """
+    fn = _aggregators.get(n)
+    if fn is not None:
+        return fn
+
+    lines = ["def _aggregate(coll, keyfn, fs, inits):",
+             "    %s, = fs" % ", ".join("f%d" % i for i in _range(n)) if n else "    pass",
+             "    acc = {}",
+             "    get = acc.get",
+             "    for e in coll:",
+             "        k = keyfn(e)",
+             "        values = get(k)",
+             "        if values is None:",
+             "            values = acc[k] = list(inits)"]
+    lines += ["        values[{i}] = f{i}(values[{i}], e)".format(i=i) for i in _range(n)]
+    lines.append("    return acc")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<clj.seqs aggregate_by %d>" % n, "exec"), namespace)
+    fn = _aggregators[n] = namespace["_aggregate"]
+    return fn
+
+
+def multi_reduce(coll: Iterable[T], reductions: Dict[str, Tuple]) -> Dict[str, Any]:
+    """
+    Reduce ``coll`` with several functions in a single pass. ``reductions``
+    maps names to ``(f, init)`` tuples, like the aggregates of
+    ``aggregate_by``; the result maps the same names to the reduction of
+    ``coll`` by ``f``, starting with ``init``.
+
+        >>> multi_reduce(range(5), {"count": (lambda n, _: n + 1, 0), "sum": (operator.add, 0),
+        ...                         "last": (lambda _, e: e, None)})
+        {'count': 5, 'sum': 10, 'last': 4}
+
+    Unlike in ``aggregate_by``, ``init`` is only used once, so ``f`` can
+    modify it, e.g. ``(lambda d, e: d.setdefault(e.key, []).append(e) or d, {})``,
+    but then ``reductions`` must not be reused.
+    """
+    names = list(reductions)
+    fs = [reduction[0] for reduction in reductions.values()]
+    inits = [reduction[1] for reduction in reductions.values()]
+    return dict(zip(names, _multi_reducer(len(fs))(coll, fs, inits)))
+
+
+_multi_reducers: Dict[int, Callable] = {}
+
+
+def _multi_reducer(n: int) -> Callable:
+    """
+    Return a function that runs ``n`` reductions in a single loop, with the
+    values in local variables. Its code is generated, like ``_aggregator``.
+    """
+    fn = _multi_reducers.get(n)
+    if fn is not None:
+        return fn
+
+    variables = ", ".join("v%d" % i for i in _range(n))
+    lines = ["def _multi_reduce(coll, fs, inits):"]
+    if n:
+        lines += ["    %s, = fs" % ", ".join("f%d" % i for i in _range(n)),
+                  "    %s, = inits" % variables]
+    lines.append("    for e in coll:")
+    lines += ["        v{i} = f{i}(v{i}, e)".format(i=i) for i in _range(n)] or ["        pass"]
+    lines.append("    return [%s]" % variables)
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<clj.seqs multi_reduce %d>" % n, "exec"), namespace)
+    fn = _multi_reducers[n] = namespace["_multi_reduce"]
+    return fn
+
+
+def merge_with(f: Callable[[Any, Any], Any], *maps: Optional[Dict]) -> Dict:
+    """
+    Returns a ``dict`` with the keys and values of all ``maps``. When a key is
+    in several ones, its values are combined with ``f(value_so_far, value)``.
+
+    Use it to combine the results of ``reduce_by`` or ``frequencies`` on
+    several parts of a collection, e.g. ``merge_with(operator.add, *counts)``.
+    """
+    result: Dict = {}
+    for m in maps:
+        if not m:
+            continue
+        for k, v in m.items():
+            result[k] = f(result[k], v) if k in result else v
+    return result
+
+
+def merge_aggregates(aggregates: Dict[str, Tuple], *results: Optional[Dict[Any, Dict[str, Any]]]) \
+        -> Dict[Any, Dict[str, Any]]:
+    """
+    Combine the ``results`` of ``aggregate_by`` with the same ``aggregates``
+    on several parts of a collection. Each aggregate is combined with its
+    ``combine`` function if it has one, else with its ``f``, which is right
+    when ``f`` combines values of the same type, e.g. ``operator.add`` or
+    ``max``.
+    """
+    combines = {name: aggregate[2] if len(aggregate) > 2 else aggregate[0]
+                for name, aggregate in aggregates.items()}
+
+    def merge(values, other_values):
+        return {name: combines[name](value, other_values[name]) for name, value in values.items()}
+
+    return merge_with(merge, *results)
+
+
 def _make_pred(pred: Union[Callable[[T], T2], Set[T]]) -> Callable[[T], Union[T2, bool]]:
     if isinstance(pred, set):
         return lambda x: x in cast(Set[T], pred)
@@ -651,8 +1302,8 @@ def range(*args: int) -> Iterator[int]:
         n += 1
 
 
-def tree_seq(has_branch: Callable[[Any], Any], get_children: Callable[[Any], Iterable], root: Any) \
-        -> Iterable:
+def tree_seq(has_branch: Callable[[Any], Any], get_children: Callable[[Any], Iterable], root: Any, bfs: bool = False,
+             max_depth: Optional[int] = None, unique: bool = False) -> Iterable:
     """
     Returns a generator of the nodes in a tree, via a depth-first walk.
     ``has_branch`` must be a function of one argument that returns ``True`` if
@@ -660,18 +1311,71 @@ def tree_seq(has_branch: Callable[[Any], Any], get_children: Callable[[Any], Ite
     be a function of one argument that returns an iterable of the children.
     Will only be called on nodes for which ``has_branch`` returns true.
     ``root`` is the root node of the tree.
-    """
-    yield root
-    if has_branch(root):
-        for child in get_children(root):
-            for subchild in tree_seq(has_branch, get_children, child):
-                yield subchild
+
+    If ``bfs`` is true, walk the tree breadth-first instead. ``max_depth``
+    limits the depth of the returned nodes; the root is at depth 0. If
+    ``unique`` is true, nodes that are reachable from several parents, as in
+    a DAG, are only returned (and walked) the first time; nodes are compared
+    by identity.
+    """
+    if max_depth is not None:
+        max_depth = max(max_depth, 0)
+
+    # Nodes by id. Keep references to them so that their ids are not reused.
+    seen: Dict[int, Any] = {}
+
+    if bfs:
+        yield root
+        if unique:
+            seen[id(root)] = root
+
+        queue: Deque[Tuple[Iterator, int]] = collections.deque()
+        if max_depth != 0 and has_branch(root):
+            queue.append((iter(get_children(root)), 1))
+
+        while queue:
+            children, depth = queue.popleft()
+            for node in children:
+                if unique:
+                    if id(node) in seen:
+                        continue
+                    seen[id(node)] = node
+
+                yield node
+                if depth != max_depth and has_branch(node):
+                    queue.append((iter(get_children(node)), depth + 1))
+        return
+
+    # The children of the nodes at the top of a stack of this size are not
+    # walked
+    max_stack = -1 if max_depth is None else max_depth + 1
+
+    # Use an explicit stack of iterators rather than recursion so that there
+    # is no depth limit, and each node is only yielded once.
+    stack = [iter((root,))]
+    while stack:
+        for node in stack[-1]:
+            if unique:
+                if id(node) in seen:
+                    continue
+                seen[id(node)] = node
+
+            yield node
+            if len(stack) != max_stack and has_branch(node):
+                stack.append(iter(get_children(node)))
+                break
+        else:
+            stack.pop()
 
 
 def dedupe(coll: Iterable[T]) -> Iterable[T]:
     """
     Returns a generator of the elements of coll with consecutive duplicates removed.
     """
+    if _numpy.is_numeric_array(coll):
+        yield from _numpy.dedupe(coll)
+        return
+
     initial = True
     prev = None
     for e in coll:
@@ -685,6 +1389,9 @@ def empty(coll: T) -> Optional[T]:
     """
     Returns an empty collection of the same type as ``coll``, or ``None``.
     """
+    emptyable = protocols.IEmptyableCollection.find(coll)
+    if emptyable is not None:
+        return emptyable.empty(coll)
     if _is_collection_abc(coll):
         return type(coll)()
     return None
@@ -697,8 +1404,14 @@ def count(coll: Iterable) -> int:
     """
     Returns the number of items in the collection. Also works on strings.
     """
+    size = protocols._count(coll)
+    if size is not None:
+        return size
     if hasattr(coll, "__len__"):
         return len(cast(list, coll))
+    chunked = protocols.IChunked.find(coll)
+    if chunked is not None:
+        return sum(map(len, chunked.chunks(coll, _COUNT_CHUNK_SIZE)))
 
     n = 0
     for _ in coll:
@@ -706,46 +1419,115 @@ def count(coll: Iterable) -> int:
     return n
 
 
-def partition(coll: Iterable[T], n: int, step: Optional[int] = None, pad: Optional[Iterable[T2]] = None) \
-        -> Iterator[List[Union[T, T2]]]:
+def _partition_tail(tail: List, n: int, step: int, pad: Optional[Iterable], all_: bool, make: Callable[[List], Any]) \
+        -> Iterator:
+    """
+    Yield the incomplete partitions that start with ``tail``, which has fewer
+    than ``n`` elements, i.e. all of them for ``partition_all``, or the padded
+    first one for ``partition``.
+    """
+    if all_:
+        while tail:
+            yield make(tail)
+            tail = tail[step:]
+    elif pad is not None and tail:
+        tail.extend(itertools.islice(pad, n - len(tail)))
+        yield make(tail)
+
+
+def _partition(coll: Iterable, n: int, step: Optional[int], pad: Optional[Iterable], all_: bool, as_tuple: bool) \
+        -> Iterator:
+    if step is None:
+        step = n
+    if n <= 0 or step <= 0:
+        return
+
+    make: Callable[[Iterable], Any] = tuple if as_tuple else list
+
+    if _numpy.is_numeric_array(coll):
+        partitions, tail = _numpy.windows(coll, n, step, as_tuple)
+        yield from partitions
+        yield from _partition_tail(tail, n, step, pad, all_, make)
+        return
+
+    sliceable = protocols.ISliceable.find(coll)
+    if sliceable is not None:
+        size = protocols._count(coll)
+        if size is not None:
+            start = 0
+            while start + n <= size:
+                yield make(sliceable.slice(coll, start, start + n))
+                start += step
+            if start < size:
+                yield from _partition_tail(list(sliceable.slice(coll, start, size)), n, step, pad, all_, make)
+            return
+
+    it = iter(coll)
+
+    if step == n:
+        # zip_longest groups the elements in C; only the last group is padded
+        for group in itertools.zip_longest(*[it] * n, fillvalue=_nil):
+            if group[-1] is _nil:
+                tail = list(itertools.takewhile(lambda e: e is not _nil, group))
+                yield from _partition_tail(tail, n, step, pad, all_, make)
+                return
+            yield group if as_tuple else list(group)
+        return
+
+    if step > n:
+        # Take n elements, then skip step-n ones
+        skip = step - n
+        while True:
+            current = list(itertools.islice(it, n))
+            if len(current) < n:
+                yield from _partition_tail(current, n, step, pad, all_, make)
+                return
+
+            yield make(current) if as_tuple else current
+            next(itertools.islice(it, skip, skip), None)
+
+    # Partitions overlap: keep the last n elements in a ring buffer, so that
+    # moving to the next partition costs O(step) rather than O(n).
+    window: Deque = collections.deque(itertools.islice(it, n), maxlen=n)
+    if len(window) < n:
+        yield from _partition_tail(list(window), n, step, pad, all_, make)
+        return
+
+    yield make(window)
+    wait = step
+    for e in it:
+        window.append(e)
+        wait -= 1
+        if not wait:
+            yield make(window)
+            wait = step
+
+    # The next partition starts after the first `wait` elements of the window
+    yield from _partition_tail(list(itertools.islice(window, wait, None)), n, step, pad, all_, make)
+
+
+def partition(coll: Iterable[T], n: int, step: Optional[int] = None, pad: Optional[Iterable[T2]] = None,
+              as_tuple: bool = False) -> Iterator[Sequence[Union[T, T2]]]:
     """
     Returns a generator of lists of ``n`` items each, at offsets ``step`` apart. If ``step`` is not supplied, defaults
     to ``n``, i.e. the partitions do not overlap. If a ``pad`` collection is supplied, use its elements as necessary to
     complete last partition up to ``n`` items. In case there are not enough padding elements, return a partition with
     fewer than ``n`` items.
 
-    Note: ``step!=n`` is not supported for now.
+    If ``as_tuple`` is true, the partitions are tuples rather than lists. They are a bit cheaper to create.
 
     Note: in Clojure, ``(partition 0 [1 2 3])`` returns an infinite lazy sequence of empty lists. To avoid issues this
-    Python implementation returns an empty generator if called with n≤0.
+    Python implementation returns an empty generator if called with n≤0 or step≤0.
     """
-    if n <= 0:
-        return
-
-    if step is not None and step != n:
-        # TODO
-        raise NotImplementedError("Step != n is not supported for now.")
+    return _partition(coll, n, step, pad, False, as_tuple)
 
-    current_partition: List[Union[T, T2]] = []
-    partition_index = 0
-    partition_end = n
 
-    for element in coll:
-        current_partition.append(element)
-        partition_index += 1
-        if partition_index == partition_end:
-            yield current_partition
-            current_partition = []
-            partition_index = 0
-            partition_end = n
-
-    if pad is not None and 0 < partition_index < partition_end:
-        for pad_element in pad:
-            current_partition.append(pad_element)
-            if partition_index == partition_end:
-                break
-
-        yield current_partition
+def partition_all(coll: Iterable[T], n: int, step: Optional[int] = None, as_tuple: bool = False) \
+        -> Iterator[Sequence[T]]:
+    """
+    Like ``partition``, but also returns the partitions at the end with fewer than ``n`` items.
+    """
+    return _partition(coll, n, step, None, True, as_tuple)
 
 
 def partition_by(f: Callable[[T], Any], coll: Iterable[T]) -> Iterable[List[T]]:
@@ -0,0 +1,169 @@
+# -*- coding: UTF-8 -*-
+"""
+Trackers remember the keys ``clj.distinct`` has seen. The default is an
+unbounded set; the trackers here trade exactness for bounded memory on long
+streams:
+
+    >>> distinct(events, key=event_id, tracker=LRUTracker(100_000))
+
+Each tracker counts its lookups and hits, and estimates its memory footprint
+(``nbytes``).
+"""
+import abc
+import collections
+import math
+import sys
+from typing import Hashable, Set
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x: int) -> int:
+    # splitmix64's finalizer: spreads the bits of Python's hashes, which are
+    # the identity for small ints
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class Tracker(abc.ABC):
+    """
+    Base class of the trackers. Subclasses implement ``_add`` and ``nbytes``.
+    """
+
+    def __init__(self):
+        self.lookups = 0
+        self.hits = 0
+
+    @abc.abstractmethod
+    def _add(self, key: Hashable) -> bool:
+        pass
+
+    def add(self, key: Hashable) -> bool:
+        """
+        Record ``key`` and return ``True`` if it was seen before.
+        """
+        self.lookups += 1
+        if self._add(key):
+            self.hits += 1
+            return True
+        return False
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Proportion of the lookups of keys that were seen before.
+        """
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    @property
+    @abc.abstractmethod
+    def nbytes(self) -> int:
+        """
+        Approximate memory footprint of the tracker, in bytes. This doesn't
+        include the keys themselves.
+        """
+
+    def __repr__(self):
+        return "<%s lookups=%d hit_rate=%.3f nbytes=%d>" % (type(self).__name__, self.lookups, self.hit_rate,
+                                                             self.nbytes)
+
+
+class SetTracker(Tracker):
+    """
+    Exact tracker that remembers all keys. Its memory grows with the number
+    of distinct keys.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._keys: Set[Hashable] = set()
+
+    def _add(self, key: Hashable) -> bool:
+        if key in self._keys:
+            return True
+        self._keys.add(key)
+        return False
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._keys)
+
+
+class LRUTracker(Tracker):
+    """
+    Tracker that remembers the ``maxsize`` most recently seen keys. A key
+    that is seen again after more than ``maxsize`` other distinct keys is
+    considered new.
+    """
+
+    def __init__(self, maxsize: int):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        super().__init__()
+        self.maxsize = maxsize
+        self._keys: "collections.OrderedDict[Hashable, None]" = collections.OrderedDict()
+
+    def _add(self, key: Hashable) -> bool:
+        keys = self._keys
+        if key in keys:
+            keys.move_to_end(key)
+            return True
+
+        keys[key] = None
+        if len(keys) > self.maxsize:
+            keys.popitem(last=False)
+        return False
+
+    def __len__(self):
+        return len(self._keys)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._keys)
+
+
+class BloomTracker(Tracker):
+    """
+    Probabilistic tracker with a fixed memory footprint, sized so that after
+    ``capacity`` distinct keys the probability that a new key is mistaken for
+    a seen one is ``error_rate``. Seen keys are never mistaken for new ones.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        super().__init__()
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        # Optimal number of bits and of hash functions
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _add(self, key: Hashable) -> bool:
+        # Double hashing: the i-th bit is h1 + i*h2
+        h = hash(key) & _MASK64
+        h1 = _mix64(h)
+        h2 = _mix64(h ^ 0x9E3779B97F4A7C15) | 1
+        bits = self._bits
+        num_bits = self.num_bits
+
+        seen = True
+        for i in range(self.num_hashes):
+            position = (h1 + i * h2) % num_bits
+            mask = 1 << (position & 7)
+            if not bits[position >> 3] & mask:
+                bits[position >> 3] |= mask
+                seen = False
+        return seen
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._bits)
@@ -0,0 +1,831 @@
+# -*- coding: UTF-8 -*-
+"""
+Transducers: composable transformations that are independent of their input
+and output. See https://clojure.org/reference/transducers
+
+A reducing function takes two arguments ``(result, x)`` for a step and one
+argument ``(result)`` for the completion. A transducer is a function that takes
+a reducing function and returns another one. Transducers compose with
+``clj.comp``, and the leftmost one is applied first on the data:
+
+    >>> xf = comp(map(inc), filter(is_even), take(3))
+    >>> transduce(xf, operator.add, range(100), 0)
+    12
+
+Because a whole chain runs as a single nested step function there is no
+intermediate generator between the stages.
+"""
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar, cast
+
+from clj.fns import identity
+
+T = TypeVar('T')
+
+ReducingFn = Callable[..., Any]
+Transducer = Callable[[ReducingFn], ReducingFn]
+
+# Marker for the missing ``x`` argument of the completion arity, as well as
+# for optional arguments.
+_nil = object()
+
+
+class Reduced:
+    """
+    Wrapper around a value that signals the end of a reduction.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __repr__(self):
+        return "Reduced(%r)" % (self.value,)
+
+
+def reduced(x: Any) -> Reduced:
+    """
+    Wraps ``x`` in such a way that a reduction will terminate with the value ``x``.
+    """
+    return Reduced(x)
+
+
+def is_reduced(x: Any) -> bool:
+    """
+    Returns ``True`` if ``x`` is the result of a call to ``reduced``.
+    """
+    return isinstance(x, Reduced)
+
+
+def ensure_reduced(x: Any) -> Reduced:
+    """
+    If ``x`` is already reduced, returns it, else returns ``reduced(x)``.
+    """
+    return x if isinstance(x, Reduced) else Reduced(x)
+
+
+def unreduced(x: Any) -> Any:
+    """
+    If ``x`` is reduced, returns the value that was wrapped, else returns ``x``.
+    """
+    return x.value if isinstance(x, Reduced) else x
+
+
+def completing(f: Callable[[Any, Any], Any], cf: Callable[[Any], Any] = identity) -> ReducingFn:
+    """
+    Takes a two-argument reducing function ``f`` and returns a function suitable
+    for transduce by adding a completion arity that calls ``cf`` (default:
+    ``identity``) on the result.
+    """
+
+    def rf(result, x=_nil):
+        if x is _nil:
+            return cf(result)
+        return f(result, x)
+
+    rf._clj_completing = True  # type: ignore
+    return rf
+
+
+def _completing(f: Callable) -> ReducingFn:
+    if getattr(f, "_clj_completing", False):
+        return f
+    return completing(f)
+
+
+def _reduce(rf: ReducingFn, result: Any, coll: Iterable) -> Any:
+    for x in coll:
+        result = rf(result, x)
+        if isinstance(result, Reduced):
+            return result.value
+    return result
+
+
+def transduce(xform: Transducer, f: Callable, coll: Iterable, init: Any = _nil) -> Any:
+    """
+    Reduce ``coll`` with ``xform(f)``, starting with ``init``. If ``init`` is
+    not supplied, ``f()`` is used instead. ``f`` is a two-argument reducing
+    function; use ``completing`` to give it a completion step.
+    """
+    rf = _completing(f)
+    stages, rest = _split(xform)
+    for xf in reversed(rest):
+        rf = xf(rf)
+
+    if init is _nil:
+        init = f()
+
+    kinds, args = stages
+    return rf(_fused(kinds, "rf")(coll, args, init, rf))
+
+
+def _conj_list(result: list, x: Any) -> list:
+    result.append(x)
+    return result
+
+
+def _conj_set(result: set, x: Any) -> set:
+    result.add(x)
+    return result
+
+
+def _conj_dict(result: dict, x: Any) -> dict:
+    k, v = x
+    result[k] = v
+    return result
+
+
+def _conj_append(result: Any, x: Any) -> Any:
+    result.append(x)
+    return result
+
+
+def _conj_add(result: Any, x: Any) -> Any:
+    result.add(x)
+    return result
+
+
+def _conj_fn(to: Any) -> Callable[[Any, Any], Any]:
+    if isinstance(to, list):
+        return _conj_list
+    if isinstance(to, set):
+        return _conj_set
+    if isinstance(to, dict):
+        return _conj_dict
+    if hasattr(to, "append"):
+        return _conj_append
+    if hasattr(to, "add"):
+        return _conj_add
+    raise TypeError("Don't know how to add elements to %s" % type(to))
+
+
+def into(to: T, coll: Iterable, xform: Optional[Transducer] = None) -> T:
+    """
+    Adds all the items of ``coll`` to ``to`` and returns it. If a transducer
+    ``xform`` is supplied, the items are transformed before being added.
+    ``to`` is modified in-place; it can be a ``list``, a ``set``, a ``dict``
+    (``coll`` must then yield key/value pairs) or any object with an
+    ``append`` or ``add`` method.
+
+    ``(into to xform from)`` becomes ``into(to, from, xform)``.
+    """
+    conj = _conj_fn(to)
+
+    if xform is not None:
+        if _split(xform)[1]:
+            return cast(T, transduce(xform, conj, coll, to))
+        coll = sequence(xform, coll)
+
+    if isinstance(to, (set, dict)):
+        to.update(coll)
+    elif hasattr(to, "extend"):
+        cast(Any, to).extend(coll)
+    else:
+        _reduce(conj, to, coll)
+    return to
+
+
+def sequence(xform: Transducer, coll: Iterable) -> Iterator:
+    """
+    Returns a generator of the items of ``coll`` transformed by ``xform``.
+    """
+    (kinds, args), rest = _split(xform)
+    if not rest:
+        return _fused(kinds, "yield")(coll, args)
+
+    buf: List[Any] = []
+
+    def rf(result, x=_nil):
+        if x is not _nil:
+            buf.append(x)
+        return result
+
+    for xf in reversed(rest):
+        rf = xf(rf)
+
+    return _fused(kinds, "buffered")(coll, args, rf, buf)
+
+
+# Fusion
+#
+# The transducers below tag the functions they return with their kind and
+# argument. The longest prefix of tagged transducers of a composition is
+# compiled into a single loop where the code of each stage is inlined, so
+# there is no function call per stage and per element except for the
+# user-supplied functions. The remaining transducers, if any, are applied as
+# usual on the reducing function called at the end of the loop.
+#
+# The generated code depends only on the kinds of the stages, so it's cached.
+
+# Python limits the number of nested blocks and indentation levels
+_MAX_FUSED_STAGES = 50
+_MAX_FUSED_LOOPS = 16
+
+
+def _stage(kind: str, arg: Any, xform: Callable[[ReducingFn], ReducingFn]) -> Transducer:
+    xform._clj_stage = (kind, arg)  # type: ignore
+    return xform
+
+
+def _flatten(xform: Transducer, xforms: List[Transducer]) -> List[Transducer]:
+    fns = getattr(xform, "_clj_fns", None)
+    if fns is None:
+        xforms.append(xform)
+    else:
+        for xf in fns:
+            _flatten(xf, xforms)
+    return xforms
+
+
+def _split(xform: Transducer) -> Tuple[Tuple[Tuple[str, ...], List[Any]], List[Transducer]]:
+    """
+    Split a transducer in a fusable prefix, returned as a tuple of
+    ``(kinds, args)``, and the list of the remaining transducers.
+    """
+    xforms = _flatten(xform, [])
+    kinds: List[str] = []
+    args: List[Any] = []
+    loops = 0
+    for i, xf in enumerate(xforms):
+        stage = getattr(xf, "_clj_stage", None)
+        if stage is not None and stage[0] in _LOOPS:
+            loops += 1
+        if stage is None or i == _MAX_FUSED_STAGES or loops > _MAX_FUSED_LOOPS:
+            return (tuple(kinds), args), xforms[i:]
+        kinds.append(stage[0])
+        args.append(stage[1])
+
+    return (tuple(kinds), args), []
+
+
+_SETUP = {
+    "distinct": ["seen{i} = set()", "add{i} = seen{i}.add"],
+    "keep_indexed": ["i{i} = -1"],
+    "drop": ["n{i} = a{i}"],
+    "drop_while": ["dropping{i} = True"],
+    "take": ["n{i} = a{i}"],
+    "take_nth": ["i{i} = -1"],
+    "replace": ["get{i} = a{i}.get"],
+    "map_indexed": ["i{i} = -1"],
+    "dedupe": ["prev{i} = _nil"],
+    "partition": ["buf{i} = []"],
+    "partition_all": ["buf{i} = []"],
+    "partition_by": ["buf{i} = []", "prev{i} = _nil"],
+}
+
+# Stages that loop over the elements of their input
+_LOOPS = {"cat", "mapcat"}
+
+# Stages that may have elements to flush when the input is exhausted
+_FLUSHED = {"partition_all", "partition_by"}
+
+
+def _indent(lines: List[str]) -> List[str]:
+    return ["    " + line for line in lines]
+
+
+def _stage_code(kind: str, inner: List[str]) -> List[str]:
+    # "x" is the current element. Stages that drop it don't run the inner
+    # code; stages that end the reduction set "stop" and break out of the
+    # innermost loop; stages that loop propagate it.
+    if kind == "distinct":
+        return ["if x not in seen{i}:", "    add{i}(x)"] + _indent(inner)
+    if kind == "filter":
+        return ["if a{i}(x):"] + _indent(inner)
+    if kind == "remove":
+        return ["if not a{i}(x):"] + _indent(inner)
+    if kind == "keep":
+        return ["x = a{i}(x)", "if x is not None:"] + _indent(inner)
+    if kind == "keep_indexed":
+        return ["i{i} += 1", "x = a{i}(i{i}, x)", "if x is not None:"] + _indent(inner)
+    if kind == "cat":
+        return ["for x{i} in x:", "    x = x{i}"] + _indent(inner) + ["if stop:", "    break"]
+    if kind == "map":
+        return ["x = a{i}(x)"] + inner
+    if kind == "mapcat":
+        return ["for x{i} in a{i}(x):", "    x = x{i}"] + _indent(inner) + ["if stop:", "    break"]
+    if kind == "drop":
+        return ["if n{i} > 0:", "    n{i} -= 1", "else:"] + _indent(inner)
+    if kind == "drop_while":
+        return ["if not dropping{i} or not a{i}(x):", "    dropping{i} = False"] + _indent(inner)
+    if kind == "take":
+        return ["if n{i} > 0:", "    n{i} -= 1"] + _indent(inner) + ["if n{i} <= 0:", "    stop = True", "    break"]
+    if kind == "take_nth":
+        return ["i{i} += 1", "if i{i} % a{i} == 0:"] + _indent(inner)
+    if kind == "take_while":
+        return ["if not a{i}(x):", "    stop = True", "    break"] + inner
+    if kind == "replace":
+        return ["x = get{i}(x, x)"] + inner
+    if kind == "map_indexed":
+        return ["i{i} += 1", "x = a{i}(i{i}, x)"] + inner
+    if kind == "dedupe":
+        return ["if prev{i} is _nil or not x == prev{i}:", "    prev{i} = x"] + _indent(inner)
+    if kind in ("partition", "partition_all"):
+        return ["buf{i}.append(x)", "if len(buf{i}) == a{i}:", "    x, buf{i} = buf{i}, []"] + _indent(inner)
+    if kind == "partition_by":
+        # The element starts the next partition only if the reduction didn't
+        # end when the previous one was passed down.
+        return ["v{i} = a{i}(x)",
+                "if prev{i} is _nil or v{i} == prev{i}:",
+                "    prev{i} = v{i}",
+                "    buf{i}.append(x)",
+                "else:",
+                "    prev{i} = v{i}",
+                "    y{i} = x",
+                "    x, buf{i} = buf{i}, []"] + _indent(inner) + ["    buf{i}.append(y{i})"]
+    raise ValueError("Unknown stage: %s" % kind)
+
+
+_TERMINALS = {
+    # transduce: thread the result through the reducing function
+    "rf": (
+        "def _fused(coll, args, result, rf):",
+        ["result = rf(result, x)",
+         "if isinstance(result, Reduced):", "    result = result.value", "    stop = True", "    break"],
+        ["return result"],
+    ),
+    # sequence without any remaining transducer
+    "yield": (
+        "def _fused(coll, args):",
+        ["yield x"],
+        [],
+    ),
+    # sequence with remaining transducers that add their output to buf
+    "buffered": (
+        "def _fused(coll, args, rf, buf):",
+        ["result = rf(None, x)", "if buf:", "    yield from buf", "    del buf[:]",
+         "if isinstance(result, Reduced):", "    stop = True", "    break"],
+        ["rf(None)", "yield from buf"],
+    ),
+}
+
+_fused_cache: Dict[Tuple[Tuple[str, ...], str], Callable] = {}
+
+
+def _compile(kinds: Tuple[str, ...], terminal: str) -> Callable:
+    header, code, footer = _TERMINALS[terminal]
+
+    setup = ["stop = False"]
+    for i, kind in enumerate(kinds):
+        setup.append("a{i} = args[{i}]".format(i=i))
+        setup.extend(line.format(i=i) for line in _SETUP.get(kind, []))
+
+    # Code run on an element that goes out of the stage i
+    inners: Dict[int, List[str]] = {}
+    for i in reversed(range(len(kinds))):
+        inners[i] = code
+        code = [line.replace("{i}", str(i)) for line in _stage_code(kinds[i], code)]
+
+    # When the input is exhausted, or the reduction ended, the pending
+    # partitions are passed down. We use a one-iteration loop so that the
+    # stages that end the reduction can break out of it. The stop flag set
+    # by an upstream stage is cleared, or the loops below would end early.
+    flush: List[str] = []
+    for i, kind in enumerate(kinds):
+        if kind in _FLUSHED:
+            flush += ["if buf{i}:".format(i=i),
+                      "    stop = False",
+                      "    for x in (buf{i},):".format(i=i),
+                      "        buf{i} = []".format(i=i)] + _indent(_indent(inners[i]))
+
+    body = setup + ["for x in coll:"] + _indent(code) + flush + footer
+    source = "\n".join([header] + _indent(body))
+    namespace = {"Reduced": Reduced, "_nil": _nil}
+    exec(compile(source, "<clj.transducers fused %s>" % ",".join(kinds), "exec"), namespace)
+    return cast(Callable, namespace["_fused"])
+
+
+def _fused(kinds: Tuple[str, ...], terminal: str) -> Callable:
+    key = (kinds, terminal)
+    fn = _fused_cache.get(key)
+    if fn is None:
+        fn = _fused_cache[key] = _compile(kinds, terminal)
+    return fn
+
+
+# The transducers are in the same order as in clj.seqs
+
+def distinct() -> Transducer:
+    """
+    Returns a transducer that removes duplicates.
+    """
+
+    def xform(rf):
+        seen = set()
+
+        def step(result, x=_nil):
+            if x is _nil:
+                return rf(result)
+            if x in seen:
+                return result
+            seen.add(x)
+            return rf(result, x)
+
+        return step
+
+    return _stage("distinct", None, xform)
+
+
+def filter(pred: Callable[[Any], Any]) -> Transducer:
+    """
+    Returns a transducer that keeps the items for which ``pred(item)`` returns
+    a truthy value.
+    """
+
+    def xform(rf):
+        def step(result, x=_nil):
+            if x is _nil:
+                return rf(result)
+            if pred(x):
+                return rf(result, x)
+            return result
+
+        return step
+
+    return _stage("filter", pred, xform)
+
+
+def remove(pred: Callable[[Any], Any]) -> Transducer:
+    """
+    Returns a transducer that removes the items for which ``pred(item)``
+    returns a truthy value.
+    """
+
+    def xform(rf):
+        def step(result, x=_nil):
+            if x is _nil:
+                return rf(result)
+            if pred(x):
+                return result
+            return rf(result, x)
+
+        return step
+
+    return _stage("remove", pred, xform)
+
+
+def keep(f: Callable[[Any], Any]) -> Transducer:
+    """
+    Returns a transducer of the non-``None`` results of ``f(item)``.
+    """
+
+    def xform(rf):
+        def step(result, x=_nil):
+            if x is _nil:
+                return rf(result)
+            v = f(x)
+            if v is None:
+                return result
+            return rf(result, v)
+
+        return step
+
+    return _stage("keep", f, xform)
+
+
+def keep_indexed(f: Callable[[int, Any], Any]) -> Transducer:
+    """
+    Returns a transducer of the non-``None`` results of ``f(index, item)``.
+    """
+
+    def xform(rf):
+        i = -1
+
+        def step(result, x=_nil):
+            nonlocal i
+            if x is _nil:
+                return rf(result)
+            i += 1
+            v = f(i, x)
+            if v is None:
+                return result
+            return rf(result, v)
+
+        return step
+
+    return _stage("keep_indexed", f, xform)
+
+
+def cat(rf: ReducingFn) -> ReducingFn:
+    """
+    A transducer which concatenates the contents of each input, which must be
+    an iterable, into the reduction.
+    """
+
+    def step(result, x=_nil):
+        if x is _nil:
+            return rf(result)
+        for e in x:
+            result = rf(result, e)
+            if isinstance(result, Reduced):
+                return result
+        return result
+
+    return step
+
+
+_stage("cat", None, cat)
+
+
+def map(f: Callable[[Any], Any]) -> Transducer:
+    """
+    Returns a transducer that applies ``f`` to each item.
+    """
+
+    def xform(rf):
+        def step(result, x=_nil):
+            if x is _nil:
+                return rf(result)
+            return rf(result, f(x))
+
+        return step
+
+    return _stage("map", f, xform)
+
+
+def mapcat(f: Callable[[Any], Iterable]) -> Transducer:
+    """
+    Returns a transducer that applies ``f`` to each item and concatenates the
+    results. Thus function ``f`` should return a collection.
+    """
+
+    def xform(rf):
+        return map(f)(cat(rf))
+
+    return _stage("mapcat", f, xform)
+
+
+def interpose(sep: Any) -> Transducer:
+    """
+    Returns a transducer that separates the items with ``sep``.
+    """
+
+    def xform(rf):
+        started = False
+
+        def step(result, x=_nil):
+            nonlocal started
+            if x is _nil:
+                return rf(result)
+            if started:
+                result = rf(result, sep)
+                if isinstance(result, Reduced):
+                    return result
+            else:
+                started = True
+            return rf(result, x)
+
+        return step
+
+    return xform
+
+
+def drop(n: int) -> Transducer:
+    """
+    Returns a transducer that drops the first ``n`` items.
+    """
+
+    def xform(rf):
+        remaining = n
+
+        def step(result, x=_nil):
+            nonlocal remaining
+            if x is _nil:
+                return rf(result)
+            if remaining > 0:
+                remaining -= 1
+                return result
+            return rf(result, x)
+
+        return step
+
+    return _stage("drop", n, xform)
+
+
+def drop_while(pred: Callable[[Any], Any]) -> Transducer:
+    """
+    Returns a transducer that drops the items as long as ``pred(item)`` returns
+    a truthy value.
+    """
+
+    def xform(rf):
+        dropping = True
+
+        def step(result, x=_nil):
+            nonlocal dropping
+            if x is _nil:
+                return rf(result)
+            if dropping:
+                if pred(x):
+                    return result
+                dropping = False
+            return rf(result, x)
+
+        return step
+
+    return _stage("drop_while", pred, xform)
+
+
+def take(n: int) -> Transducer:
+    """
+    Returns a transducer that keeps the first ``n`` items and then ends the
+    reduction.
+    """
+
+    def xform(rf):
+        remaining = n
+
+        def step(result, x=_nil):
+            nonlocal remaining
+            if x is _nil:
+                return rf(result)
+            if remaining > 0:
+                remaining -= 1
+                result = rf(result, x)
+            if remaining <= 0:
+                return ensure_reduced(result)
+            return result
+
+        return step
+
+    return _stage("take", n, xform)
+
+
+def take_nth(n: int) -> Transducer:
+    """
+    Returns a transducer that keeps every ``n``th item.
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+
+    def xform(rf):
+        i = -1
+
+        def step(result, x=_nil):
+            nonlocal i
+            if x is _nil:
+                return rf(result)
+            i += 1
+            if i % n == 0:
+                return rf(result, x)
+            return result
+
+        return step
+
+    return _stage("take_nth", n, xform)
+
+
+def take_while(pred: Callable[[Any], Any]) -> Transducer:
+    """
+    Returns a transducer that keeps the items as long as ``pred(item)`` returns
+    a truthy value and then ends the reduction.
+    """
+
+    def xform(rf):
+        def step(result, x=_nil):
+            if x is _nil:
+                return rf(result)
+            if pred(x):
+                return rf(result, x)
+            return Reduced(result)
+
+        return step
+
+    return _stage("take_while", pred, xform)
+
+
+def replace(smap: Dict[Any, Any]) -> Transducer:
+    """
+    Returns a transducer that replaces the items that are keys of ``smap`` by
+    their corresponding value.
+    """
+    get = smap.get
+
+    def xform(rf):
+        def step(result, x=_nil):
+            if x is _nil:
+                return rf(result)
+            return rf(result, get(x, x))
+
+        return step
+
+    return _stage("replace", smap, xform)
+
+
+def map_indexed(f: Callable[[int, Any], Any]) -> Transducer:
+    """
+    Returns a transducer that applies ``f`` to the index and the item.
+    """
+
+    def xform(rf):
+        i = -1
+
+        def step(result, x=_nil):
+            nonlocal i
+            if x is _nil:
+                return rf(result)
+            i += 1
+            return rf(result, f(i, x))
+
+        return step
+
+    return _stage("map_indexed", f, xform)
+
+
+def dedupe() -> Transducer:
+    """
+    Returns a transducer that removes consecutive duplicates.
+    """
+
+    def xform(rf):
+        prev: Any = _nil
+
+        def step(result, x=_nil):
+            nonlocal prev
+            if x is _nil:
+                return rf(result)
+            if prev is not _nil and x == prev:
+                return result
+            prev = x
+            return rf(result, x)
+
+        return step
+
+    return _stage("dedupe", None, xform)
+
+
+def _partition(n: int, keep_incomplete: bool) -> Transducer:
+    def xform(rf):
+        buf: List[Any] = []
+
+        def step(result, x=_nil):
+            nonlocal buf
+            if x is _nil:
+                if buf and keep_incomplete:
+                    chunk, buf = buf, []
+                    result = unreduced(rf(result, chunk))
+                return rf(result)
+            buf.append(x)
+            if len(buf) == n:
+                chunk, buf = buf, []
+                return rf(result, chunk)
+            return result
+
+        return step
+
+    return xform
+
+
+def partition(n: int) -> Transducer:
+    """
+    Returns a transducer that groups the items in lists of ``n`` items. An
+    incomplete trailing list is dropped.
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    return _stage("partition", n, _partition(n, False))
+
+
+def partition_all(n: int) -> Transducer:
+    """
+    Returns a transducer that groups the items in lists of ``n`` items. The
+    last list may contain fewer than ``n`` items.
+    """
+    if n <= 0:
+        raise ValueError("n must be positive")
+    return _stage("partition_all", n, _partition(n, True))
+
+
+def partition_by(f: Callable[[Any], Hashable]) -> Transducer:
+    """
+    Returns a transducer that splits the items each time ``f(item)`` returns a
+    new value.
+    """
+
+    def xform(rf):
+        buf: List[Any] = []
+        prev: Any = _nil
+
+        def step(result, x=_nil):
+            nonlocal buf, prev
+            if x is _nil:
+                if buf:
+                    chunk, buf = buf, []
+                    result = unreduced(rf(result, chunk))
+                return rf(result)
+
+            value = f(x)
+            if prev is _nil or value == prev:
+                prev = value
+                buf.append(x)
+                return result
+
+            prev = value
+            chunk, buf = buf, []
+            result = rf(result, chunk)
+            if not isinstance(result, Reduced):
+                buf.append(x)
+            return result
+
+        return step
+
+    return _stage("partition_by", f, xform)
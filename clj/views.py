@@ -0,0 +1,152 @@
+# -*- coding: UTF-8 -*-
+"""
+Views of sequences, which ``drop``, ``rest``, ``take``, ``butlast``,
+``drop_last``, ``reverse``, ``take_nth`` and ``split_at`` return for lists,
+tuples, strings, buffers and other sequences instead of copying them:
+
+    >>> v = rest(reverse(big_list))  # no copy
+    >>> len(v), v[0], v[:10]
+
+A view is a sequence: it supports ``len``, indexing and iteration, and its
+slices are views of the same collection. Views of ``bytes``, ``bytearray``,
+``array.array`` and ``memoryview`` objects use a ``memoryview``, which means
+that a ``bytearray`` or an ``array.array`` can't be resized while views of it
+exist.
+
+Views see changes to the elements of the collection, but not to its length:
+they must not be used once it's shorter than when they were created.
+"""
+import array
+import collections
+import collections.abc as collections_abc
+import itertools
+from typing import Any, Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+
+# Built-in sequences whose iterators can be moved to any index, with the
+# __setstate__ method used to unpickle them
+_SEEKABLE = {list, tuple, str}
+
+
+def is_viewable(coll: Any) -> bool:
+    """
+    Return ``True`` if views of ``coll`` can be created, i.e. it's a sequence
+    with constant-time indexing.
+    """
+    if isinstance(coll, memoryview):
+        return coll.ndim == 1
+    if isinstance(coll, array.array):
+        # Only registered as a Sequence since Python 3.10
+        return True
+    # Indexing a deque isn't O(1)
+    return isinstance(coll, collections_abc.Sequence) and not isinstance(coll, collections.deque)
+
+
+def _buffer(coll: Any) -> Any:
+    """
+    Return the object a view of ``coll`` indexes.
+    """
+    if isinstance(coll, (bytes, bytearray)) or (isinstance(coll, array.array) and coll.typecode != "u"):
+        return memoryview(coll)
+    return coll
+
+
+def _as_slice(indices: range) -> slice:
+    # For non-empty ranges of indices. With a negative step, a negative stop
+    # means "before the first element" in a range, but counts from the end in
+    # a slice.
+    stop: Optional[int] = indices.stop
+    if indices.step < 0 and indices.stop < 0:
+        stop = None
+    return slice(indices.start, stop, indices.step)
+
+
+class SequenceView(collections_abc.Sequence):
+    """
+    Base class of the views: the elements of a collection at a range of
+    indices.
+    """
+
+    __slots__ = ("_base", "_indices")
+
+    def _init(self, coll: Sequence, s: slice) -> None:
+        if isinstance(coll, SequenceView):
+            self._base: Any = coll._base
+            self._indices: range = coll._indices[s]
+        else:
+            self._base = _buffer(coll)
+            self._indices = range(len(coll))[s]
+
+    @classmethod
+    def _of(cls, base: Any, indices: range) -> "SequenceView":
+        view = cls.__new__(cls)
+        view._base = base
+        view._indices = indices
+        return view
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return SliceView._of(self._base, self._indices[i])
+        return self._base[self._indices[i]]
+
+    def __iter__(self) -> Iterator:
+        base = self._base
+        indices = self._indices
+        if not indices:
+            return iter(())
+        if isinstance(base, (memoryview, range)):
+            # Slices of memoryviews and ranges don't copy anything
+            return iter(base[_as_slice(indices)])
+        if indices.step in (1, -1) and type(base) in _SEEKABLE:
+            it = iter(base) if indices.step == 1 else reversed(base)
+            it.__setstate__(indices.start)  # type: ignore
+            return itertools.islice(it, len(indices))
+        return map(base.__getitem__, indices)
+
+    def __reversed__(self) -> Iterator:
+        return iter(ReversedView(self))
+
+    def __repr__(self):
+        base = self._base.obj if isinstance(self._base, memoryview) else self._base
+        return "<%s of %s, %d items>" % (type(self).__name__, type(base).__name__, len(self))
+
+
+class SliceView(SequenceView):
+    """
+    View of ``coll[start:stop:step]``.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, coll: Sequence[T], start: Optional[int] = None, stop: Optional[int] = None,
+                 step: Optional[int] = None):
+        self._init(coll, slice(start, stop, step))
+
+
+class ReversedView(SequenceView):
+    """
+    View of ``coll`` in reverse order.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, coll: Sequence[T]):
+        self._init(coll, slice(None, None, -1))
+
+
+class StridedView(SequenceView):
+    """
+    View of every ``step``-th element of ``coll``, starting at ``start``.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, coll: Sequence[T], step: int, start: int = 0):
+        if step <= 0:
+            raise ValueError("step must be positive")
+        self._init(coll, slice(start, None, step))
+
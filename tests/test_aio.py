@@ -0,0 +1,339 @@
+# -*- coding: UTF-8 -*-
+
+import asyncio
+import unittest
+
+import clj as c
+from clj import aio
+from clj.trackers import LRUTracker
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def _alist(agen):
+    return [e async for e in agen]
+
+
+def alist(agen):
+    return run(_alist(agen))
+
+
+async def arange(*args):
+    for e in range(*args):
+        await asyncio.sleep(0)
+        yield e
+
+
+async def ainc(x):
+    await asyncio.sleep(0)
+    return x + 1
+
+
+async def ais_even(x):
+    return x % 2 == 0
+
+
+async def test_infinite_range():
+    """
+    Async test generator that fails if its 10k-th element is consumed.
+    """
+    n = 0
+    while True:
+        yield n
+        n += 1
+        assert n <= 10000
+
+
+class TestAio(unittest.TestCase):
+
+    def test_distinct(self):
+        self.assertEqual([], alist(aio.distinct([])))
+        self.assertEqual([2, 1, 3], alist(aio.distinct([2, 1, 3, 1, 2, 3])))
+        self.assertEqual([0, 1], alist(aio.distinct(aio.map(lambda x: x % 2, arange(10)))))
+        self.assertEqual([0, 1], alist(aio.distinct(arange(10), key=ais_even)))
+
+        tracker = LRUTracker(1)
+        self.assertEqual([0, 1, 0], alist(aio.distinct([0, 1, 1, 0], tracker=tracker)))
+        self.assertEqual(1, tracker.hits)
+
+    def test_filter_remove(self):
+        self.assertEqual([0, 2, 4], alist(aio.filter(c.is_even, arange(6))))
+        self.assertEqual([0, 2, 4], alist(aio.filter(ais_even, range(6))))
+        self.assertEqual([1, 3, 5], alist(aio.remove(ais_even, arange(6))))
+
+    def test_keep(self):
+        self.assertEqual([1, 2], alist(aio.keep(c.identity, [1, None, 2])))
+        self.assertEqual(["a", "c"], alist(aio.keep_indexed(lambda i, e: e if i % 2 == 0 else None, "abcd")))
+
+    def test_amap(self):
+        self.assertEqual([], alist(aio.amap(ainc, [])))
+        self.assertEqual([1, 2, 3], alist(aio.amap(ainc, range(3))))
+        self.assertEqual([1, 2, 3], alist(aio.amap(c.inc, arange(3), concurrency=1)))
+        self.assertEqual(list(range(1, 101)), alist(aio.amap(ainc, arange(100), concurrency=7)))
+        self.assertEqual(list(range(1, 101)), sorted(alist(aio.amap(ainc, range(100), ordered=False))))
+        self.assertEqual([0, 1, 2], alist(aio.take(3, aio.amap(c.identity, test_infinite_range()))))
+        self.assertRaises(ValueError, alist, aio.amap(ainc, [1], concurrency=0))
+
+    def test_amap_concurrency(self):
+        running = 0
+        max_running = 0
+
+        async def f(x):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(running, max_running)
+            await asyncio.sleep(0.001 * (x % 3))
+            running -= 1
+            return x
+
+        self.assertEqual(list(range(50)), alist(aio.amap(f, range(50), concurrency=5)))
+        self.assertEqual(5, max_running)
+
+    def test_amap_unordered(self):
+        async def f(x):
+            await asyncio.sleep(0.05 if x == 0 else 0)
+            return x
+
+        self.assertEqual(0, alist(aio.amap(f, range(5), ordered=False))[-1])
+
+    def test_amap_exception(self):
+        cancelled = []
+
+        async def f(x):
+            if x == 2:
+                raise ZeroDivisionError()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(x)
+                raise
+
+        with self.assertRaises(ZeroDivisionError):
+            alist(aio.amap(f, range(10), concurrency=4, ordered=False))
+        self.assertEqual([0, 1, 3], sorted(cancelled))
+
+    def test_amap_cancel(self):
+        started = []
+        cancelled = []
+        finished = []
+
+        async def f(x):
+            started.append(x)
+            try:
+                await asyncio.sleep(0 if x < 3 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(x)
+                raise
+            finished.append(x)
+            return x
+
+        async def consume():
+            results = aio.amap(f, range(100), concurrency=5)
+            taken = [e async for e in aio.take(3, results)]
+            await results.aclose()
+            return taken
+
+        self.assertEqual([0, 1, 2], run(consume()))
+        self.assertEqual([0, 1, 2], finished)
+        self.assertEqual(started[3:], cancelled)
+        self.assertLessEqual(len(started), 3 + 5)
+
+    def test_amapcat_akeep(self):
+        async def f(x):
+            return [x] * x
+
+        self.assertEqual([1, 2, 2, 3, 3, 3], alist(aio.amapcat(f, arange(4))))
+        self.assertEqual([1, 3], alist(aio.akeep(lambda x: ainc(x) if x % 2 == 0 else None, range(4))))
+
+    def test_cons_concat(self):
+        self.assertEqual([1], alist(aio.cons(1, [])))
+        self.assertEqual([0, 0, 1], alist(aio.cons(0, arange(2))))
+        self.assertEqual([], alist(aio.concat()))
+        self.assertEqual([0, 1, 2, 0], alist(aio.concat(arange(2), [2], arange(1))))
+
+    def test_map(self):
+        self.assertEqual([1, 2, 3], alist(aio.map(c.inc, arange(3))))
+        self.assertEqual([1, 2, 3], alist(aio.map(ainc, range(3))))
+        self.assertEqual([9, 12], alist(aio.map(lambda *xs: sum(xs), [1, 2, 3], arange(2, 6), [6, 7])))
+        self.assertEqual([0, 1], alist(aio.take(2, aio.map(c.identity, test_infinite_range()))))
+
+    def test_mapcat(self):
+        self.assertEqual(["a", "b", "c", "d"], alist(aio.mapcat(lambda s: s.split(","), ["a,b", "c,d"])))
+        self.assertEqual([0, 0, 1], alist(aio.mapcat(lambda n: arange(n), arange(3))))
+
+    def test_cycle(self):
+        self.assertEqual([1, 2, 1, 2, 1], alist(aio.take(5, aio.cycle(arange(1, 3)))))
+        self.assertEqual([], alist(aio.cycle([])))
+
+    def test_interleave_interpose(self):
+        self.assertEqual([0, 500, 1, 501], alist(aio.interleave(arange(2), range(500, 1000))))
+        self.assertEqual([], alist(aio.interleave()))
+        self.assertEqual(["a", ",", "b"], alist(aio.interpose(",", ["a", "b"])))
+
+    def test_drop_take(self):
+        self.assertEqual([2, 3, 4], alist(aio.rest([1, 2, 3, 4])))
+        self.assertEqual([], alist(aio.drop(1000, arange(4))))
+        self.assertEqual([0, 1], alist(aio.drop(-3, [0, 1])))
+        self.assertEqual([3, 1], alist(aio.drop_while(lambda n: n < 3, [1, 2, 3, 1])))
+        self.assertEqual([], alist(aio.take(0, test_infinite_range())))
+        self.assertEqual([0, 1, 2], alist(aio.take(3, test_infinite_range())))
+        self.assertEqual([0, 2, 4], alist(aio.take_nth(2, arange(6))))
+        self.assertEqual([1, 2], alist(aio.take_while(lambda n: n < 3, [1, 2, 3, 1])))
+
+    def test_butlast_drop_last(self):
+        self.assertEqual([], alist(aio.butlast([])))
+        self.assertEqual([0, 1], alist(aio.butlast(arange(3))))
+        self.assertEqual([0, 1], alist(aio.drop_last(3, arange(5))))
+        self.assertEqual([0, 1], alist(aio.drop_last(-1, arange(2))))
+
+    def test_flatten(self):
+        self.assertEqual([1, 2, 3, 4, "ab"], alist(aio.flatten([[], [1, [[arange(2, 4)], []], 4], "ab"])))
+
+        deep = ["foo"]
+        for _ in range(2000):
+            deep = [deep]
+        self.assertEqual(["foo"], alist(aio.flatten(deep)))
+
+        self.assertEqual([1, [2]], alist(aio.flatten([arange(1, 2), [[2]]], max_depth=1)))
+        self.assertEqual([1, (2,)], alist(aio.flatten([[1], (2,)], leaf_types=(tuple,))))
+
+    def test_reverse_shuffle(self):
+        self.assertEqual([2, 1, 0], alist(aio.reverse(arange(3))))
+        self.assertEqual([0, 1, 2], sorted(run(aio.shuffle(arange(3)))))
+
+    def test_split(self):
+        async def split_at(n, coll):
+            taken, rest = await aio.split_at(n, coll)
+            return taken, await _alist(rest)
+
+        self.assertEqual(([], []), run(split_at(0, [])))
+        self.assertEqual(([1], [2, 3]), run(split_at(1, [1, 2, 3])))
+        self.assertEqual(([0, 1], [2, 3]), run(split_at(2, arange(4))))
+
+        async def split_with(pred, coll):
+            taken, rest = await aio.split_with(pred, coll)
+            return taken, await _alist(rest)
+
+        self.assertEqual(([], []), run(split_with(c.is_odd, [])))
+        self.assertEqual(([1, 2], [3, 4, 1]), run(split_with(lambda n: n < 3, [1, 2, 3, 4, 1])))
+        self.assertEqual(([0], [1, 2]), run(split_with(ais_even, arange(3))))
+
+    def test_replace_reductions(self):
+        self.assertEqual(["b", "c"], alist(aio.replace({"a": "b"}, ["a", "c"])))
+        self.assertEqual([None], alist(aio.reductions(lambda a, b: a + b, [])))
+        self.assertEqual([5], alist(aio.reductions(lambda a, b: a + b, [], 5)))
+        self.assertEqual([0, 1, 3, 6], alist(aio.reductions(lambda a, b: a + b, arange(4))))
+
+        async def add(a, b):
+            return a + b
+
+        self.assertEqual([10, 10, 11], alist(aio.reductions(add, arange(2), 10)))
+
+    def test_map_indexed(self):
+        self.assertEqual([5, 4, 3], alist(aio.map_indexed(lambda i, e: i + e, [5, 3, 1])))
+
+    def test_first(self):
+        self.assertIsNone(run(aio.first([])))
+        self.assertIsNone(run(aio.first(None)))
+        self.assertEqual(0, run(aio.first(test_infinite_range())))
+        self.assertEqual(1, run(aio.second(test_infinite_range())))
+        self.assertEqual(42, run(aio.ffirst([[42, 1], 2])))
+        self.assertIsNone(run(aio.ffirst([])))
+        self.assertEqual([2, 3], alist(aio.nfirst([arange(1, 4)])))
+
+    def test_nth_last(self):
+        nope = object()
+        self.assertEqual(nope, run(aio.nth([], 0, nope)))
+        self.assertEqual(nope, run(aio.nth(arange(3), -1, nope)))
+        self.assertEqual(20, run(aio.nth(test_infinite_range(), 20)))
+        self.assertEqual(2, run(aio.nth([1, 2], 1)))
+        with self.assertRaises(IndexError):
+            run(aio.nth(arange(3), 5))
+
+        self.assertIsNone(run(aio.last([])))
+        self.assertEqual(2, run(aio.last(arange(3))))
+
+    def test_zipmap_group_by(self):
+        self.assertEqual({"a": 0, "b": 1}, run(aio.zipmap("ab", arange(5))))
+        self.assertEqual({0: [0, 2], 1: [1]}, run(aio.group_by(lambda e: e % 2, arange(3))))
+
+    def test_aggregations(self):
+        async def parity(e):
+            return e % 2
+
+        self.assertEqual({0: 6, 1: 9}, run(aio.reduce_by(parity, lambda a, b: a + b, arange(6))))
+        self.assertEqual({0: 7, 1: 10}, run(aio.reduce_by(parity, lambda a, b: a + b, arange(6), 1)))
+        self.assertEqual({"b": 2, "a": 1}, run(aio.frequencies("bab")))
+        self.assertEqual({0: {"n": 3, "max": 4}, 1: {"n": 2, "max": 3}},
+                         run(aio.aggregate_by(parity, {"n": (lambda n, _: n + 1, 0), "max": (max, -1)}, arange(5))))
+        self.assertEqual({"a": 3}, aio.merge_with(lambda a, b: a + b, {"a": 1}, {"a": 2}))
+
+    def test_predicates(self):
+        self.assertEqual(2, run(aio.some({4, 5, 6, 2}, arange(4))))
+        async def gt2(e):
+            return e > 2
+
+        self.assertEqual(3, run(aio.some(gt2, arange(5))))
+        self.assertIsNone(run(aio.some(lambda e: e > 10, arange(5))))
+        self.assertTrue(run(aio.every(ais_even, [0, 2])))
+        self.assertFalse(run(aio.every({1}, arange(2))))
+        self.assertTrue(run(aio.not_every({1}, arange(2))))
+        self.assertTrue(run(aio.not_any(c.is_odd, [0, 2])))
+
+    def test_dorun(self):
+        els = []
+
+        async def gen():
+            for x in range(3):
+                els.append(x)
+                yield x
+
+        self.assertIsNone(run(aio.dorun(gen())))
+        self.assertEqual([0, 1, 2], els)
+
+    def test_generators(self):
+        self.assertEqual([42, 42], alist(aio.take(2, aio.repeatedly(lambda: ainc(41)))))
+        self.assertEqual([1, 1], alist(aio.repeatedly(lambda: 1, 2)))
+        self.assertEqual([0, 1, 2], alist(aio.take(3, aio.iterate(ainc, 0))))
+        self.assertEqual([2, 2, 2], alist(aio.take(3, aio.repeat(2))))
+        self.assertEqual([2, 2], alist(aio.repeat(2, 2)))
+        self.assertEqual([0, 1, 2], alist(aio.take(3, aio.range())))
+        self.assertEqual([2], alist(aio.range(2, 1, -1)))
+
+    def test_tree_seq(self):
+        t = [[1, 2, [3]], [4]]
+        self.assertEqual([t, [1, 2, [3]], 1, 2, [3], 3, [4], 4], alist(aio.tree_seq(c.is_seq, c.identity, t)))
+
+        async def children(node):
+            return arange(node)
+
+        self.assertEqual([3, 0, 1, 0, 2, 0, 1, 0], alist(aio.tree_seq(lambda n: n > 0, children, 3)))
+        self.assertEqual([3, 0, 1, 2, 0, 0, 1, 0], alist(aio.tree_seq(lambda n: n > 0, children, 3, bfs=True)))
+        self.assertEqual([3, 0, 1, 2], alist(aio.tree_seq(lambda n: n > 0, children, 3, max_depth=1)))
+
+        shared = [1]
+        self.assertEqual([[shared, shared], shared, 1],
+                         alist(aio.tree_seq(c.is_seq, c.identity, [shared, shared], unique=True)))
+
+    def test_dedupe(self):
+        self.assertEqual([1, 2, 1], alist(aio.dedupe([1, 1, 2, 2, 1])))
+
+    def test_count(self):
+        self.assertEqual(10, run(aio.count("qwertyuiop")))
+        self.assertEqual(3, run(aio.count(arange(3))))
+
+    def test_partition(self):
+        self.assertEqual([[0, 1], [2, 3]], alist(aio.partition(arange(5), 2)))
+        self.assertEqual([[0, 1], [2, 3], [4, 5]], alist(aio.partition(arange(5), 2, pad=[5, 6])))
+        self.assertEqual([], alist(aio.partition(arange(5), 0)))
+        self.assertEqual([[0, 1, 2], [1, 2, 3], [2, 3, 4], [3, 4, 9]], alist(aio.partition(arange(5), 3, 1, pad=[9])))
+        self.assertEqual([(0, 1), (3, 4)], alist(aio.partition(arange(6), 2, 3, as_tuple=True)))
+
+        self.assertEqual([[0, 1], [2, 3], [4]], alist(aio.partition_all(arange(5), 2)))
+        self.assertEqual([[0, 1, 2], [2, 3, 4], [4]], alist(aio.partition_all(arange(5), 3, 2)))
+
+        self.assertEqual([[1, 1, 1], [2, 2], [3, 3]],
+                         alist(aio.partition_by(ais_even, [1, 1, 1, 2, 2, 3, 3])))
+        self.assertEqual([], alist(aio.partition_by(c.identity, [])))
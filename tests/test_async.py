@@ -0,0 +1,342 @@
+# -*- coding: UTF-8 -*-
+
+import asyncio
+import threading
+import time
+import unittest
+
+import clj as c
+from clj import async_ as a
+from clj import transducers as xf
+
+THREADS = 32
+N = 10_000
+
+
+def run_threads(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def put_all(ch, coll, close=True):
+    thread = threading.Thread(target=lambda: [a.put(ch, e) for e in coll] and close and ch.close())
+    thread.start()
+    return thread
+
+
+class TestAsync(unittest.TestCase):
+
+    def test_unbuffered(self):
+        ch = a.chan()
+        self.assertFalse(a.offer(ch, 1))
+        self.assertIsNone(a.poll(ch))
+        put_all(ch, range(100))
+        self.assertEqual(list(range(100)), list(ch))
+        self.assertTrue(ch.closed)
+        self.assertFalse(a.put(ch, 1))
+        self.assertIsNone(a.take(ch))
+
+    def test_buffered(self):
+        ch = a.chan(2)
+        # An empty buffer is false
+        self.assertEqual("<Channel <Buffer 0/2>>", repr(ch))
+        self.assertTrue(a.put(ch, 1))
+        self.assertTrue(a.offer(ch, 2))
+        self.assertFalse(a.offer(ch, 3))
+        self.assertEqual(1, a.poll(ch))
+        self.assertEqual(2, a.take(ch))
+        self.assertIsNone(a.poll(ch))
+        self.assertRaises(ValueError, a.put, ch, None)
+        self.assertRaises(ValueError, a.chan, -1)
+
+        # A put waits for room
+        thread = put_all(ch, range(5), close=False)
+        time.sleep(0.01)
+        self.assertTrue(thread.is_alive())
+        self.assertEqual(list(range(5)), [a.take(ch) for _ in range(5)])
+        thread.join()
+
+    def test_dropping_sliding(self):
+        ch = a.chan(a.dropping_buffer(2))
+        self.assertEqual([True] * 4, [a.put(ch, e) for e in range(4)])
+        ch.close()
+        self.assertEqual([0, 1], list(ch))
+
+        ch = a.chan(a.sliding_buffer(2))
+        self.assertEqual([True] * 4, [a.put(ch, e) for e in range(4)])
+        ch.close()
+        self.assertEqual([2, 3], list(ch))
+
+    def test_close(self):
+        # Buffered values and pending puts can still be taken
+        ch = a.chan(1)
+        a.put(ch, 1)
+        thread = put_all(ch, [2], close=False)
+        time.sleep(0.01)
+        ch.close()
+        ch.close()
+        self.assertFalse(a.put(ch, 3))
+        self.assertEqual([1, 2], list(ch))
+        thread.join()
+
+        # Pending takes get None
+        ch = a.chan()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(a.take(ch))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.01)
+        ch.close()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([None] * 3, results)
+
+    def test_xf(self):
+        ch = a.chan(10, c.comp(xf.filter(c.is_even), xf.mapcat(lambda x: [x] * x), xf.partition_all(3)))
+        for e in range(5):
+            a.put(ch, e)
+        ch.close()
+        self.assertEqual([[2, 2, 4], [4, 4, 4]], list(ch))
+
+        # A reduced result closes the channel
+        ch = a.chan(10, xf.take(2))
+        self.assertEqual([True, True, False], [a.put(ch, e) for e in range(3)])
+        self.assertTrue(ch.closed)
+        self.assertEqual([0, 1], list(ch))
+
+        self.assertRaises(ValueError, a.chan, None, xf.map(c.inc))
+
+    def test_xf_pending_puts(self):
+        # The puts pending when the channel is closed go through the
+        # transducer, before its completion step
+        # The buffer is full after the first put with map, and after the
+        # second one with partition_all
+        for xform, full_after, expected in ((xf.map(lambda x: x * 10), 1, [10, 20, 30]),
+                                            (xf.partition_all(2), 2, [[1, 2], [3]])):
+            ch = a.chan(1, xform)
+            results = []
+
+            def put(e, ch=ch, results=results):
+                results.append(a.put(ch, e))
+
+            for e in range(1, full_after + 1):
+                put(e)
+            threads = [threading.Thread(target=put, args=(e,)) for e in range(full_after + 1, 4)]
+            for thread in threads:
+                # One at a time, so that the puts are pending in order
+                thread.start()
+                time.sleep(0.01)
+            ch.close()
+            self.assertEqual(expected, list(ch))
+            for thread in threads:
+                thread.join()
+            self.assertEqual([True] * 3, results)
+
+        # When the transducer ends, the other pending puts are dropped
+        ch = a.chan(1, xf.take(2))
+        a.put(ch, 1)
+        results = []
+        threads = [threading.Thread(target=lambda e=e: results.append(a.put(ch, e))) for e in (2, 3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.01)
+        self.assertEqual(1, a.take(ch))
+        for thread in threads:
+            thread.join()
+        self.assertEqual([True, True], results)
+        self.assertTrue(ch.closed)
+        self.assertIn(a.take(ch), (2, 3))
+        self.assertIsNone(a.take(ch))
+
+    def test_ex_handler(self):
+        errors = []
+
+        def handle(e):
+            errors.append(e)
+            return -1 if isinstance(e, ZeroDivisionError) else None
+
+        ch = a.chan(10, xf.map(lambda x: 1 // x), handle)
+        for e in (1, 0, "a"):
+            a.put(ch, e)
+        ch.close()
+        self.assertEqual([1, -1], list(ch))
+        self.assertEqual([ZeroDivisionError, TypeError], [type(e) for e in errors])
+
+        ch = a.chan(10, xf.map(lambda x: 1 // x))
+        with self.assertLogs("clj.async_", "ERROR"):
+            a.put(ch, 0)
+        self.assertIsNone(a.poll(ch))
+
+    def test_alts(self):
+        ch1, ch2 = a.chan(1), a.chan(1)
+        self.assertEqual(("default", None), a.alts([ch1, ch2], default="default"))
+        a.put(ch2, 2)
+        self.assertEqual((2, ch2), a.alts([ch1, ch2]))
+
+        # With priority, the first operation that can complete is done
+        a.put(ch1, 1)
+        a.put(ch2, 2)
+        self.assertEqual((1, ch1), a.alts([ch1, ch2], priority=True))
+        self.assertEqual((True, ch1), a.alts([(ch1, 3), ch2], priority=True))
+        self.assertEqual(2, a.poll(ch2))
+
+        # Only one operation is done: the pending take on ch3 is withdrawn
+        ch3 = a.chan()
+        self.assertEqual((3, ch1), a.alts([ch3, ch1], priority=True))
+        self.assertFalse(a.offer(ch3, 1))
+
+        # A put and a take on the same channel don't match each other
+        ch = a.chan()
+        self.assertEqual((0, None), a.alts([ch, (ch, 1)], default=0))
+        self.assertRaises(ValueError, a.alts, [])
+
+        # No operation is done if one of them puts None
+        ch1, ch2 = a.chan(), a.chan()
+        self.assertRaises(ValueError, a.alts, [(ch1, 1), (ch2, None)], priority=True)
+        self.assertIsNone(a.poll(ch1))
+
+    def test_alts_threads(self):
+        # Each value is taken once even though alts are pending on several
+        # channels at once
+        channels = [a.chan() for _ in range(4)]
+        results = []
+
+        def take():
+            while True:
+                value, _ = a.alts(channels)
+                if value is None:
+                    return
+                results.append(value)
+
+        takers = [threading.Thread(target=take) for _ in range(8)]
+        for thread in takers:
+            thread.start()
+        run_threads([lambda ch=ch, i=i: [a.put(ch, e) for e in range(i, N, len(channels))]
+                     for i, ch in enumerate(channels)])
+        for ch in channels:
+            ch.close()
+        for thread in takers:
+            thread.join()
+        self.assertEqual(list(range(N)), sorted(results))
+
+    def test_timeout(self):
+        start = time.monotonic()
+        timeouts = [a.timeout(0.05), a.timeout(0.01)]
+        self.assertEqual((None, timeouts[1]), a.alts([a.chan()] + timeouts))
+        self.assertIsNone(a.take(timeouts[0]))
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_onto_chan(self):
+        ch = a.chan(5)
+        done = a.onto_chan(ch, range(10), close=False)
+        self.assertEqual(list(range(10)), [a.take(ch) for _ in range(10)])
+        self.assertIsNone(a.take(done))
+        self.assertFalse(ch.closed)
+
+        self.assertEqual(list(range(10)), list(a.to_chan(range(10))))
+        self.assertEqual([], list(a.to_chan([])))
+
+    def test_async(self):
+        async def main():
+            ch = a.chan()
+            put_all(ch, range(100))
+            self.assertEqual(list(range(100)), [e async for e in ch])
+
+            # Between coroutines
+            ch = a.chan(1)
+
+            async def produce():
+                for e in range(100):
+                    await a.aput(ch, e)
+                ch.close()
+
+            task = asyncio.ensure_future(produce())
+            self.assertEqual(list(range(100)), [e async for e in ch])
+            await task
+
+            ch1, ch2 = a.chan(), a.chan()
+            put_all(ch2, [2], close=False)
+            self.assertEqual((2, ch2), await a.aalts([ch1, ch2]))
+            self.assertEqual((0, None), await a.aalts([ch1], default=0))
+            ch1.close()
+            self.assertFalse(await a.aput(ch1, 1))
+
+            # A cancelled take is withdrawn
+            ch = a.chan()
+            task = asyncio.ensure_future(a.atake(ch))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertFalse(a.offer(ch, 1))
+
+        asyncio.run(main())
+
+    def test_stress(self):
+        for buf in (None, 1, 64):
+            ch = a.chan(buf)
+            results = [[] for _ in range(THREADS // 2)]
+            takers = [threading.Thread(target=lambda result=result: result.extend(ch)) for result in results]
+            for thread in takers:
+                thread.start()
+            run_threads([lambda i=i: [a.put(ch, e) for e in range(i, N, THREADS // 2)] for i in range(THREADS // 2)])
+            ch.close()
+            for thread in takers:
+                thread.join()
+            self.assertEqual(list(range(N)), sorted(c.concat(*results)))
+
+    def test_pipeline(self):
+        def slow_inc(x):
+            time.sleep(0.001 * (x % 3))
+            return x + 1
+
+        for n in (1, 4, THREADS):
+            to = a.chan(10)
+            done = a.pipeline(n, to, xf.map(slow_inc), a.to_chan(range(100)))
+            self.assertEqual(list(range(1, 101)), list(to))
+            self.assertIsNone(a.take(done))
+
+        # Each value can produce any number of results
+        to = a.chan(10)
+        a.pipeline(4, to, c.comp(xf.filter(c.is_odd), xf.mapcat(lambda x: [x, x])), a.to_chan(range(10)))
+        self.assertEqual([1, 1, 3, 3, 5, 5, 7, 7, 9, 9], list(to))
+
+        to = a.chan(10)
+        done = a.pipeline(4, to, xf.map(slow_inc), a.to_chan(range(100)), ordered=False, close=False)
+        self.assertEqual(list(range(1, 101)), sorted(a.take(to) for _ in range(100)))
+        a.take(done)
+        self.assertFalse(to.closed)
+
+        self.assertRaises(ValueError, a.pipeline, 0, to, xf.map(c.inc), to)
+
+    def test_pipeline_error(self):
+        for ordered in (True, False):
+            to = a.chan(10)
+            a.pipeline(4, to, xf.map(lambda x: 10 // x), a.to_chan([1, 0, 2]), ordered=ordered,
+                       ex_handler=lambda e: type(e).__name__)
+            result = list(to)
+            if not ordered:
+                result.sort(key=str)
+            self.assertEqual([10, "ZeroDivisionError", 5] if ordered else [10, 5, "ZeroDivisionError"], result)
+
+    def test_pipeline_none(self):
+        # None results can't be put on to, and don't stop the pipeline
+        for ordered in (True, False):
+            to = a.chan(10)
+            done = a.pipeline(4, to, xf.map(lambda x: None if x == 1 else x), a.to_chan(range(4)), ordered=ordered,
+                              ex_handler=lambda e: type(e).__name__)
+            self.assertEqual([0, 2, 3, "ValueError"], sorted(to, key=str))
+            self.assertIsNone(a.take(done))
+
+            to = a.chan(10)
+            with self.assertLogs("clj.async_", "ERROR"):
+                done = a.pipeline(4, to, xf.map(lambda x: None), a.to_chan(range(4)), ordered=ordered)
+                self.assertEqual([], list(to))
+                self.assertIsNone(a.take(done))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# -*- coding: UTF-8 -*-
+
+import random
+import unittest
+
+import clj as c
+from clj import chunked as ch
+
+
+def test_infinite_range():
+    """
+    Test generator that fails if its 10k-th element is consumed.
+    """
+    n = 0
+    while True:
+        yield n
+        n += 1
+        assert n <= 10000
+
+
+class TestChunked(unittest.TestCase):
+
+    def test_chunked(self):
+        self.assertEqual([], list(ch.chunked([]).chunks()))
+        self.assertEqual([[0, 1], [2, 3], [4]], list(ch.chunked([0, 1, 2, 3, 4], 2).chunks()))
+        self.assertEqual([(0, 1, 2), (3,)], list(ch.chunked((0, 1, 2, 3), 3).chunks()))
+        self.assertEqual([range(0, 2), range(2, 3)], list(ch.chunked(range(3), 2).chunks()))
+        self.assertEqual([[0, 1], [2]], list(ch.chunked(iter(range(3)), 2).chunks()))
+        self.assertEqual(list(range(100)), list(ch.chunked(range(100))))
+        self.assertEqual([32, 32, 32, 4], [len(chunk) for chunk in ch.chunked(range(100)).chunks()])
+
+        s = ch.chunked([1, 2])
+        self.assertIs(s, ch.chunked(s))
+
+        self.assertRaises(ValueError, ch.chunked, [], 0)
+
+    def test_lazy(self):
+        s = ch.take(3, ch.map(c.inc, ch.chunked(test_infinite_range(), 4)))
+        self.assertEqual([1, 2, 3], list(s))
+
+        s = ch.filter(c.is_even, ch.drop(5, test_infinite_range()))
+        self.assertEqual([6, 8], list(c.take(2, s)))
+
+    def test_map_filter(self):
+        self.assertEqual([1, 2, 3], list(ch.map(c.inc, range(3))))
+        self.assertEqual([0, 2], list(ch.filter(c.is_even, range(4))))
+        self.assertEqual([1, 3], list(ch.remove(c.is_even, range(4))))
+        self.assertEqual([1, False], list(ch.keep(c.identity, [1, None, False])))
+
+        # No empty chunks
+        self.assertEqual([[4, 5], [6]], list(ch.filter(lambda x: x > 3, ch.chunked(range(7), 2)).chunks()))
+
+    def test_take_drop(self):
+        self.assertEqual([], list(ch.take(0, [1, 2])))
+        self.assertEqual([], list(ch.take(-1, [1, 2])))
+        self.assertEqual([1, 2], list(ch.take(5, [1, 2])))
+        self.assertEqual([[0, 1], [2]], list(ch.take(3, ch.chunked([0, 1, 2, 3], 2)).chunks()))
+
+        self.assertEqual([1, 2], list(ch.drop(0, [1, 2])))
+        self.assertEqual([1, 2], list(ch.drop(-3, [1, 2])))
+        self.assertEqual([], list(ch.drop(3, [1, 2])))
+        self.assertEqual([[3], [4, 5]], list(ch.drop(3, ch.chunked([0, 1, 2, 3, 4, 5], 2)).chunks()))
+
+    def test_partition(self):
+        self.assertEqual([[0, 1], [2, 3]], list(ch.partition(range(5), 2)))
+        self.assertEqual([[0, 1, 2], [2, 3, 4], [4, "a"]], list(ch.partition(range(5), 3, 2, ["a"])))
+        self.assertEqual([[0, 1], [4, 5]], list(ch.partition(ch.chunked(range(8), 3), 2, 4)))
+
+    def test_distinct_count(self):
+        self.assertEqual([2, 1, 3], list(ch.distinct(ch.chunked([2, 1, 3, 1, 2, 3], 2))))
+        self.assertEqual([2, 1], list(ch.distinct([2, 1, 3, 1, 2, 3], key=c.is_odd)))
+
+        self.assertEqual(0, ch.count([]))
+        self.assertEqual(3, ch.count(range(3)))
+        self.assertEqual(3, ch.count(iter(range(3))))
+        self.assertEqual(50, ch.count(ch.filter(c.is_even, ch.chunked(range(100), 7))))
+
+    def test_equivalent_to_seqs(self):
+        rnd = random.Random(42)
+        for _ in range(200):
+            coll = [rnd.randint(0, 30) for _ in range(rnd.randint(0, 100))]
+            size = rnd.randint(1, 10)
+            n = rnd.randint(0, 50)
+
+            def chunks():
+                return ch.chunked(rnd.choice([coll, tuple(coll), iter(coll)]), size)
+
+            self.assertEqual(list(c.take(n, coll)), list(ch.take(n, chunks())))
+            self.assertEqual(list(c.drop(n, coll)), list(ch.drop(n, chunks())))
+            self.assertEqual(list(c.distinct(coll)), list(ch.distinct(chunks())))
+            self.assertEqual(list(c.keep(lambda x: x // 3 or None, coll)),
+                             list(ch.keep(lambda x: x // 3 or None, chunks())))
+
+            step = rnd.choice([None, rnd.randint(1, 8)])
+            pad = rnd.choice([None, [], [99, 98]])
+            self.assertEqual(list(c.partition(coll, 4, step, pad)), list(ch.partition(chunks(), 4, step, pad)))
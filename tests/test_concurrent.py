@@ -0,0 +1,106 @@
+# -*- coding: UTF-8 -*-
+
+import threading
+import unittest
+
+import clj as c
+from clj.concurrent import fan_out, locked
+
+THREADS = 32
+N = 100_000
+
+
+def run_threads(targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcurrent(unittest.TestCase):
+
+    def test_locked(self):
+        for batch in (1, 7, 64):
+            it = locked(c.map(c.inc, range(N)), batch=batch)
+            results = [[] for _ in range(THREADS)]
+            run_threads([lambda result=result: result.extend(it) for result in results])
+
+            self.assertEqual(list(range(1, N + 1)), sorted(c.concat(*results)))
+            # Each thread reads the elements in order
+            for result in results:
+                self.assertEqual(sorted(result), result)
+            self.assertRaises(StopIteration, next, it)
+
+        self.assertRaises(ValueError, locked, [], batch=0)
+
+    def test_next_batch(self):
+        it = locked(range(10), batch=4)
+        self.assertEqual([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9], []], [it.next_batch() for _ in range(4)])
+
+    def test_locked_error(self):
+        def gen():
+            yield 1
+            raise KeyError("oops")
+
+        it = locked(gen(), batch=4)
+        self.assertRaises(KeyError, next, it)
+        self.assertRaises(StopIteration, next, it)
+
+    def test_fan_out(self):
+        for batch, maxsize in ((1, 1), (64, 4)):
+            consumers = fan_out(c.map(c.inc, range(N)), THREADS, batch=batch, maxsize=maxsize)
+            self.assertEqual(THREADS, len(consumers))
+            results = [[] for _ in range(THREADS)]
+            run_threads([lambda consumer=consumer, result=result: result.extend(consumer)
+                         for consumer, result in zip(consumers, results)])
+
+            self.assertEqual(list(range(1, N + 1)), sorted(c.concat(*results)))
+            for result in results:
+                self.assertEqual(sorted(result), result)
+            self.assertEqual([], list(consumers[0]))
+
+        for kwargs in ({"n_consumers": 0}, {"n_consumers": 1, "batch": 0}, {"n_consumers": 1, "maxsize": 0}):
+            self.assertRaises(ValueError, fan_out, [], **kwargs)
+
+    def test_fan_out_slow_consumer(self):
+        # The elements go to the consumers that have room for them, and the
+        # end reaches the second one while the first one is full
+        slow, fast = fan_out(range(1000), 2, batch=10, maxsize=2)
+        n = len(list(fast))
+        # At most maxsize batches wait for the slow one
+        self.assertGreaterEqual(n, 980)
+        self.assertEqual(1000 - n, len(list(slow)))
+
+    def test_fan_out_error(self):
+        def gen():
+            yield from range(100)
+            raise KeyError("oops")
+
+        consumers = fan_out(gen(), 4, batch=10)
+        errors = []
+
+        def consume(consumer):
+            try:
+                c.dorun(consumer)
+            except KeyError as e:
+                errors.append(e)
+
+        run_threads([lambda consumer=consumer: consume(consumer) for consumer in consumers])
+        self.assertEqual(4, len(errors))
+
+    def test_fan_out_close(self):
+        closed = threading.Event()
+
+        def gen():
+            try:
+                yield from c.range()
+            finally:
+                closed.set()
+
+        consumers = fan_out(gen(), 3, batch=5, maxsize=1)
+        self.assertEqual(0, next(consumers[0]))
+        for consumer in consumers:
+            consumer.close()  # type: ignore
+        # The producer stops reading the infinite sequence
+        self.assertTrue(closed.wait(5))
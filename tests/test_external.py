@@ -0,0 +1,128 @@
+# -*- coding: UTF-8 -*-
+
+import os
+import random
+import tempfile
+import unittest
+
+import clj as c
+from clj import external
+
+
+def test_infinite_range():
+    """
+    Test generator that fails if its 10k-th element is consumed.
+    """
+    n = 0
+    while True:
+        yield n
+        n += 1
+        assert n <= 10000
+
+
+class TestExternal(unittest.TestCase):
+
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.tmpdir = self._tmpdir.name
+        # Measure every element, so that small budgets are exceeded
+        self._sample_every = external.SAMPLE_EVERY
+        external.SAMPLE_EVERY = 1
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+        external.SAMPLE_EVERY = self._sample_every
+
+    def assertCleanedUp(self):
+        self.assertEqual([], os.listdir(self.tmpdir))
+
+    def test_check(self):
+        self.assertRaises(ValueError, external.group_by, c.identity, [], memory=0)
+        self.assertRaises(ValueError, external.distinct, [], partitions=0)
+        self.assertRaises(ValueError, external.sort_by, None, [], memory=-1)
+
+    def test_group_by(self):
+        self.assertEqual([], list(external.group_by(c.identity, [], tmpdir=self.tmpdir)))
+
+        words = ["apple", "bob", "cat", "dog", "avocado", "banana", "cherry", "blue"] * 50
+        expected = c.group_by(lambda w: w[0], words)
+
+        # In memory, same order as group_by
+        self.assertEqual(list(expected.items()), list(external.group_by(lambda w: w[0], words, tmpdir=self.tmpdir)))
+
+        for memory in (1, 1000, 10000):
+            for partitions in (1, 3):
+                groups = external.group_by(lambda w: w[0], words, memory=memory, partitions=partitions,
+                                           tmpdir=self.tmpdir)
+                self.assertEqual(expected, dict(groups))
+                self.assertCleanedUp()
+
+    def test_distinct(self):
+        self.assertEqual([], list(external.distinct([], tmpdir=self.tmpdir)))
+
+        rnd = random.Random(42)
+        coll = [rnd.randint(0, 500) for _ in range(3000)]
+        expected = list(c.distinct(coll))
+        self.assertEqual(expected, list(external.distinct(coll, tmpdir=self.tmpdir)))
+
+        for memory in (1, 1000, 10000):
+            for partitions in (1, 7):
+                result = list(external.distinct(iter(coll), memory=memory, partitions=partitions,
+                                                tmpdir=self.tmpdir))
+                self.assertEqual(sorted(expected), sorted(result))
+                self.assertCleanedUp()
+
+        result = list(external.distinct(coll, key=lambda x: x % 17, memory=200, tmpdir=self.tmpdir))
+        self.assertEqual(sorted(c.distinct(coll, key=lambda x: x % 17)), sorted(result))
+
+    def test_distinct_lazy(self):
+        # Nothing is spilled until the budget is exceeded
+        self.assertEqual([0, 1, 2], list(c.take(3, external.distinct(test_infinite_range(), tmpdir=self.tmpdir))))
+        self.assertCleanedUp()
+
+        # Unpicklable elements are fine if they're not spilled
+        fns = [c.inc, c.dec, c.inc]
+        self.assertEqual([c.inc, c.dec], list(external.distinct(fns, key=id, tmpdir=self.tmpdir)))
+
+    def test_close(self):
+        coll = list(range(1000)) * 2
+        it = external.distinct(coll, memory=1000, tmpdir=self.tmpdir)
+        self.assertEqual(0, next(it))
+        self.assertEqual(set(range(1000)), set(it) | {0})
+        self.assertCleanedUp()
+
+        it = external.sort_by(None, reversed(coll), memory=1000, tmpdir=self.tmpdir)
+        self.assertEqual([0, 0, 1], [next(it), next(it), next(it)])
+        self.assertNotEqual([], os.listdir(self.tmpdir))
+        it.close()
+        self.assertCleanedUp()
+
+    def test_sort_by(self):
+        self.assertEqual([], list(external.sort_by(None, [], tmpdir=self.tmpdir)))
+
+        rnd = random.Random(42)
+        coll = [(rnd.randint(0, 100), i) for i in range(5000)]
+        for keyfn in (None, c.first):
+            for reverse in (False, True):
+                expected = sorted(coll, key=keyfn, reverse=reverse)
+                self.assertEqual(expected, list(external.sort_by(keyfn, coll, reverse=reverse, tmpdir=self.tmpdir)))
+                for memory in (1000, 100000):
+                    result = external.sort_by(keyfn, iter(coll), memory=memory, reverse=reverse, tmpdir=self.tmpdir)
+                    # The sort is stable
+                    self.assertEqual(expected, list(result))
+                    self.assertCleanedUp()
+
+    def test_sample(self):
+        external.SAMPLE_EVERY = 100
+        coll = list(range(1000)) * 2
+        self.assertEqual(sorted(coll), list(external.sort_by(None, iter(coll), memory=5000, tmpdir=self.tmpdir)))
+        self.assertEqual(set(range(1000)), set(external.distinct(coll, memory=5000, tmpdir=self.tmpdir)))
+        self.assertEqual(c.group_by(c.is_even, coll),
+                         dict(external.group_by(c.is_even, coll, memory=5000, tmpdir=self.tmpdir)))
+
+    def test_sort_by_many_runs(self):
+        # More runs than can be merged at once
+        rnd = random.Random(42)
+        coll = [rnd.random() for _ in range(3000)]
+        self.assertEqual(sorted(coll), list(external.sort_by(None, coll, memory=1000, tmpdir=self.tmpdir)))
+        self.assertCleanedUp()
@@ -1,5 +1,6 @@
 # -*- coding: UTF-8 -*-
 
+import traceback
 import unittest
 
 import clj as c
@@ -41,6 +42,26 @@ class TestFns(unittest.TestCase):
         self.assertEquals(27, fn(7))
         self.assertEquals(107, fn(27))
 
+        # All the arities
+        for n in range(1, 8):
+            fn = c.comp(*[c.inc] * n)
+            self.assertEquals(n, fn(0))
+            self.assertEquals(n, c.comp(*[c.inc] * (n - 1), lambda x: x + 1)(x=0))
+
+        self.assertEquals("6", c.comp(str, sum)([1, 2, 3]))
+        self.assertEquals("6", c.comp(str, lambda *xs: sum(xs))(1, 2, 3))
+        self.assertIsNone(c.comp()(1, 2))
+        self.assertIs(c.inc, c.comp(c.inc))
+
+        # Nested compositions are flattened, so they don't add calls
+        fn = c.comp(c.comp(str, c.inc), twice, c.comp(c.dec))
+        self.assertEquals("5", fn(3))
+
+        def depth(_):
+            return len(traceback.extract_stack())
+
+        self.assertEquals(c.comp(depth, c.inc, c.inc, c.inc)(0), c.comp(c.comp(depth, c.inc), c.comp(c.inc, c.inc))(0))
+
     def test_complement(self):
         odd = lambda e: e & 1
         even = c.complement(odd)
@@ -48,6 +69,12 @@ class TestFns(unittest.TestCase):
         self.assertTrue(even(2))
         self.assertFalse(even(41))
 
+        # Double complements return booleans
+        odd_again = c.complement(even)
+        self.assertIs(True, odd_again(41))
+        self.assertIs(False, odd_again(2))
+        self.assertIs(True, c.complement(odd_again)(2))
+
     def test_constantly(self):
         x = object()
         fn = c.constantly(x)
@@ -60,6 +87,27 @@ class TestFns(unittest.TestCase):
         self.assertEquals([3, 2, 1], fn(2))
 
         self.assertEquals([43], c.juxt(c.inc)(42))
+        self.assertEquals([], c.juxt()(42))
+
+        for n in range(1, 6):
+            fns = [c.inc, c.dec, c.identity, str, float][:n]
+            expected = [f(2) for f in fns]
+            self.assertEquals(expected, c.juxt(*fns)(2))
+            self.assertEquals(tuple(expected), c.juxt(*fns, as_tuple=True)(2))
+            self.assertEquals([3] * n, c.juxt(*[lambda x: x + 1] * n)(x=2))
+
+        self.assertEquals([2, 3], c.juxt(max, sum)([1, 2]))
+        self.assertEquals((2, 1), c.juxt(max, min, as_tuple=True)(1, 2))
+        # Nested juxtapositions aren't flattened: their results are nested
+        self.assertEquals([[2, 0], 1], c.juxt(c.juxt(c.inc, c.dec), c.identity)(1))
+
+    def test_partial(self):
+        add3 = lambda a, b, c: a + b + c
+        self.assertEquals(6, c.partial(add3, 1)(2, 3))
+        self.assertEquals(6, c.partial(c.partial(add3, 1), 2)(3))
+        self.assertEquals("1-2", c.partial("-".join)(["1", "2"]))
+        self.assertEquals(3, c.partial(int, base=2)("11"))
+        self.assertIs(c.inc, c.partial(c.inc))
 
     def test_is_distinct(self):
         self.assertTrue(c.is_distinct(42))
@@ -0,0 +1,126 @@
+# -*- coding: UTF-8 -*-
+
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+import clj as c
+from clj import instrument as ins
+from clj.pipeline import Seq
+
+
+def slow_inc(x):
+    time.sleep(0.001)
+    return x + 1
+
+
+class TestInstrument(unittest.TestCase):
+
+    def tearDown(self):
+        ins.disable()
+
+    def test_disabled(self):
+        self.assertIsNone(ins.default_sink())
+        coll = [1, 2, 3]
+        # Only a call to the function
+        self.assertIs(coll, ins.stage(c.identity, coll))
+        self.assertEqual([2, 3, 4], list(ins.instrumented(c.map)(c.inc, coll)))
+
+    def test_stage(self):
+        sink = ins.MemorySink()
+        result = ins.stage(c.distinct, ins.stage(c.map, c.inc, [1, 2, 1, 3, 2, 5], sink=sink), sink=sink)
+        # Nothing is reported until the stage is exhausted
+        self.assertEqual({}, sink.stats)
+        self.assertEqual([2, 3, 4, 6], list(result))
+
+        stats = sink.stats["map"]
+        self.assertEqual((6, 6, 0), (stats.elements_in, stats.elements_out, stats.peak_buffered))
+        stats = sink.stats["distinct"]
+        self.assertEqual((6, 4, 4), (stats.elements_in, stats.elements_out, stats.peak_buffered))
+
+        # Source stages have no input
+        c.dorun(ins.stage(c.range, 10, sink=sink, name="source"))
+        self.assertEqual((0, 10), (sink.stats["source"].elements_in, sink.stats["source"].elements_out))
+        c.dorun(ins.stage(c.take, 3, ins.stage(c.repeat, [1, 2], sink=sink), sink=sink))
+        self.assertEqual([(0, 3), (3, 3)], [(sink.stats[name].elements_in, sink.stats[name].elements_out)
+                                            for name in ("repeat", "take")])
+
+        # Explicit input
+        self.assertEqual([(1, 2), (3, 4)], list(ins.stage(c.partition_all, range(1, 5), 2, 2, True, input_arg=0,
+                                                          sink=sink)))
+        self.assertEqual(4, sink.stats["partition_all"].elements_in)
+
+    def test_time(self):
+        sink = ins.MemorySink()
+        c.dorun(ins.stage(c.filter, c.is_even, ins.stage(c.map, slow_inc, range(20), sink=sink), sink=sink))
+        # The time spent upstream isn't counted
+        self.assertGreaterEqual(sink.stats["map"].seconds, 0.02)
+        self.assertLess(sink.stats["filter"].seconds, 0.01)
+        self.assertGreater(sink.stats["map"].throughput, 0)
+        self.assertLess(sink.stats["map"].throughput, 1000)
+
+    def test_buffered(self):
+        sink = ins.enable()
+        c.dorun(ins.stage(c.drop_last, 3, range(10)))
+        c.dorun(ins.stage(c.partition, range(10), 4))
+        c.dorun(ins.stage(c.reverse, range(10)))
+        c.dorun(ins.stage(c.take, 10, ins.stage(c.cycle, range(3))))
+        c.dorun(ins.stage(c.partition_by, c.is_even, [1, 3, 5, 2], buffered=lambda stats, x: 42))
+        self.assertEqual({"drop_last": 4, "partition": 4, "reverse": 10, "cycle": 3, "take": 0, "partition_by": 42},
+                         {name: stats.peak_buffered for name, stats in sink.stats.items()})
+        # Merged with the previous run
+        c.dorun(ins.stage(c.drop_last, 5, range(10)))
+        self.assertEqual((20, 12, 6), (sink.stats["drop_last"].elements_in, sink.stats["drop_last"].elements_out,
+                                       sink.stats["drop_last"].peak_buffered))
+
+    def test_close(self):
+        sink = ins.MemorySink()
+        it = ins.stage(c.map, c.inc, c.range(), sink=sink)
+        self.assertEqual([1, 2, 3], [next(it), next(it), next(it)])
+        it.close()  # type: ignore
+        self.assertEqual(3, sink.stats["map"].elements_out)
+
+    def test_logging(self):
+        logger = logging.getLogger("test_instrument")
+        with self.assertLogs(logger, logging.DEBUG) as logs:
+            c.dorun(ins.stage(c.map, c.inc, range(5), sink=ins.LoggingSink(logger, logging.DEBUG)))
+        self.assertEqual(1, len(logs.output))
+        self.assertTrue(logs.output[0].startswith("DEBUG:test_instrument:map: 5 in, 5 out, "))
+
+    def test_abstract_sink(self):
+        class NoReport(ins.Sink):
+            pass
+
+        self.assertRaises(TypeError, ins.Sink)
+        self.assertRaises(TypeError, NoReport)
+
+    def test_prometheus(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "clj.prom")
+            sink = ins.PrometheusSink(path)
+            c.dorun(ins.stage(c.map, c.inc, range(5), name='map "inc"', sink=sink))
+            with open(path) as f:
+                lines = f.read().splitlines()
+            self.assertIn("# TYPE clj_stage_elements_in_total counter", lines)
+            self.assertIn('clj_stage_elements_out_total{stage="map \\"inc\\""} 5', lines)
+            self.assertIn('clj_stage_peak_buffered{stage="map \\"inc\\""} 0', lines)
+            self.assertEqual(["clj.prom"], os.listdir(tmpdir))
+
+    def test_pipeline(self):
+        seq = Seq(range(10)).map(c.inc).filter(c.is_even).partition(2)
+        self.assertIs(seq, seq.instrument())
+
+        sink = ins.MemorySink()
+        instrumented = seq.instrument(sink)
+        self.assertEqual([[2, 4], [6, 8]], list(instrumented))
+        self.assertEqual({"map(inc)": (10, 10), "filter(is_even)": (10, 5), "partition(2)": (5, 2)},
+                         {name: (stats.elements_in, stats.elements_out) for name, stats in sink.stats.items()})
+        self.assertEqual(2, sink.stats["partition(2)"].peak_buffered)
+
+        self.assertEqual(2, instrumented.count())
+        self.assertEqual([2, 4], instrumented.first())
+        self.assertEqual([6, 8], instrumented.last())
+        self.assertEqual([[2, 4], [6, 8]], instrumented.into([]))
+        self.assertEqual(10, Seq(range(10)).map(c.inc).instrument(sink).distinct().count())
@@ -0,0 +1,130 @@
+# -*- coding: UTF-8 -*-
+
+import gc
+import unittest
+import weakref
+
+import clj as c
+from clj.lazyseq import LazySeq
+
+
+def test_infinite_range():
+    """
+    Test generator that fails if its 10k-th element is consumed.
+    """
+    n = 0
+    while True:
+        yield n
+        n += 1
+        assert n <= 10000
+
+
+class Counted:
+    """
+    Iterable that counts the elements read from it.
+    """
+
+    def __init__(self, coll):
+        self.coll = coll
+        self.reads = 0
+
+    def __iter__(self):
+        for e in self.coll:
+            self.reads += 1
+            yield e
+
+
+class TestLazySeq(unittest.TestCase):
+
+    def test_empty(self):
+        for s in (LazySeq(), LazySeq(None), LazySeq([]), LazySeq(iter([]))):
+            self.assertFalse(s)
+            self.assertIsNone(s.first())
+            self.assertFalse(s.rest())
+            self.assertEqual([], list(s))
+
+    def test_first_rest(self):
+        coll = Counted(test_infinite_range())
+        s = LazySeq(coll)
+        self.assertEqual(0, coll.reads)
+        self.assertEqual(0, s.first())
+        self.assertEqual(0, s.first())
+        self.assertEqual(1, coll.reads)
+        self.assertEqual(1, s.rest().first())
+        self.assertEqual(2, s.rest().rest().first())
+        self.assertEqual(3, coll.reads)
+        self.assertTrue(s)
+
+    def test_iterate_many_times(self):
+        coll = Counted(range(5))
+        s = LazySeq(coll)
+        self.assertEqual([0, 1], list(c.take(2, s)))
+        self.assertEqual(2, coll.reads)
+        self.assertEqual([0, 1, 2, 3, 4], list(s))
+        self.assertEqual([0, 1, 2, 3, 4], list(s))
+        self.assertEqual(5, coll.reads)
+
+    def test_independent_iterators(self):
+        s = LazySeq(iter(range(4)))
+        a, b = iter(s), iter(s)
+        self.assertEqual([0, 1], [next(a), next(a)])
+        self.assertEqual(0, next(b))
+        self.assertEqual([2, 3], list(a))
+        self.assertEqual([1, 2, 3], list(b))
+        self.assertIs(s._cell, LazySeq(s)._cell)
+
+    def test_drop(self):
+        coll = Counted(range(5))
+        s = LazySeq(coll)
+        dropped = s.drop(2)
+        self.assertEqual(0, coll.reads)
+        self.assertEqual([2, 3, 4], list(dropped))
+        self.assertEqual([0, 1, 2, 3, 4], list(s))
+        self.assertEqual(5, coll.reads)
+        self.assertEqual([], list(s.drop(10)))
+        self.assertEqual([0, 1, 2, 3, 4], list(s.drop(-1)))
+        self.assertEqual([3, 4], list(s.drop(1).drop(2)))
+
+        self.assertEqual([3, 4, 1], list(LazySeq([1, 2, 3, 4, 1]).drop_while(lambda x: x < 3)))
+        self.assertEqual([], list(LazySeq([1, 2]).drop_while(lambda x: x < 3)))
+
+    def test_release_head(self):
+        class Node:
+            pass
+
+        refs = []
+
+        def nodes():
+            for _ in range(5):
+                node = Node()
+                refs.append(weakref.ref(node))
+                yield node
+
+        s = LazySeq(nodes())
+        it = iter(s)
+        del s
+        for _ in range(3):
+            next(it)
+        gc.collect()
+        self.assertEqual([False, False, True], [r() is not None for r in refs])
+
+    def test_exception(self):
+        def boom():
+            yield 1
+            raise RuntimeError("boom!")
+
+        s = LazySeq(boom())
+        self.assertEqual(1, s.first())
+        self.assertRaises(RuntimeError, list, s)
+
+    def test_repr(self):
+        s = LazySeq(range(20))
+        self.assertEqual("<LazySeq (...)>", repr(s))
+        s.rest()
+        self.assertEqual("<LazySeq (0 ...)>", repr(s))
+        list(s)
+        self.assertEqual("<LazySeq (0 1 2 3 4 5 6 7 8 9 ...)>", repr(s))
+
+        s = LazySeq(())
+        self.assertFalse(s)
+        self.assertEqual("<LazySeq ()>", repr(s))
@@ -0,0 +1,133 @@
+# -*- coding: UTF-8 -*-
+
+import array
+import operator
+import random
+import unittest
+
+import clj as c
+from clj import _numpy
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+
+def assert_same(test, expected, actual):
+    """
+    Assert that two lists have the same elements, with the same types, NaNs
+    included.
+    """
+    test.assertEqual(len(expected), len(actual))
+    for e, a in zip(expected, actual):
+        test.assertIs(type(e), type(a))
+        if isinstance(e, (list, tuple)):
+            assert_same(test, e, a)
+        elif e != e:
+            test.assertNotEqual(a, a)
+        else:
+            test.assertEqual(e, a)
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestNumpy(unittest.TestCase):
+
+    def setUp(self):
+        # Make sure the lazy functions work on several chunks
+        self._chunk_size = _numpy.CHUNK_SIZE
+        _numpy.CHUNK_SIZE = 7
+
+    def tearDown(self):
+        _numpy.CHUNK_SIZE = self._chunk_size
+
+    def assertSameAsList(self, f, arr):
+        """
+        Check that ``f`` returns the same thing on ``arr`` as on a list of its
+        elements, which isn't vectorized.
+        """
+        self.assertTrue(_numpy.is_numeric_array(arr))
+        assert_same(self, list(f(list(arr))), list(f(arr)))
+
+    def arrays(self):
+        rnd = random.Random(42)
+        for size in (0, 1, 2, 6, 7, 8, 30):
+            ints = [rnd.randint(0, 5) for _ in range(size)]
+            floats = [rnd.choice([0.5, -0.0, 0.0, 1.5, float("nan")]) for _ in range(size)]
+            yield np.array(ints, dtype=np.int64)
+            yield np.array(ints, dtype=np.uint8)
+            yield np.array(ints, dtype=bool)
+            yield np.array(floats)
+            yield np.array(floats, dtype=np.float32)
+            yield array.array("q", ints)
+            yield array.array("d", floats)
+            # Values too far apart to be counted in a table
+            yield np.array([i * 10 ** 6 for i in ints], dtype=np.int64)
+            yield np.array([2 ** 64 - 1 - i for i in ints], dtype=np.uint64)
+            yield np.array([i - 3 for i in ints], dtype=np.int8)
+
+    def test_is_numeric_array(self):
+        self.assertFalse(_numpy.is_numeric_array([1, 2]))
+        self.assertFalse(_numpy.is_numeric_array(np.array(["a", "b"])))
+        self.assertFalse(_numpy.is_numeric_array(np.array([1, None])))
+        self.assertFalse(_numpy.is_numeric_array(np.zeros((2, 2))))
+        self.assertFalse(_numpy.is_numeric_array(np.ma.array([1, 2], mask=[0, 1])))
+        self.assertFalse(_numpy.is_numeric_array(array.array("u", "ab")))
+        self.assertTrue(_numpy.is_numeric_array(np.arange(3)))
+        self.assertTrue(_numpy.is_numeric_array(array.array("i", [1, 2])))
+
+    def test_same_results(self):
+        for arr in self.arrays():
+            self.assertSameAsList(c.distinct, arr)
+            self.assertSameAsList(c.dedupe, arr)
+            self.assertSameAsList(lambda coll: c.frequencies(coll).items(), arr)
+            self.assertSameAsList(c.reverse, arr)
+            self.assertSameAsList(c.butlast, arr)
+            for n in (-1, 0, 1, 3, 100):
+                self.assertSameAsList(lambda coll: c.drop_last(n, coll), arr)
+            for n in (1, 2, 5):
+                self.assertSameAsList(lambda coll: c.take_nth(n, coll), arr)
+            for n, step in ((3, None), (3, 1), (3, 5), (1, 2)):
+                for as_tuple in (False, True):
+                    self.assertSameAsList(lambda coll: c.partition(coll, n, step, as_tuple=as_tuple), arr)
+                    self.assertSameAsList(lambda coll: c.partition_all(coll, n, step, as_tuple=as_tuple), arr)
+                self.assertSameAsList(lambda coll: c.partition(coll, n, step, pad=[42]), arr)
+            self.assertSameAsList(lambda coll: c.interleave(coll, coll[::-1]), arr)
+
+    def test_reductions(self):
+        with np.errstate(over="ignore"):
+            for arr in self.arrays():
+                for f in (operator.add, operator.sub, operator.mul, np.add, np.maximum, np.fmin):
+                    if f is operator.sub and getattr(arr, "dtype", None) == bool:
+                        continue
+                    self.assertSameAsList(lambda coll: c.reductions(f, coll), arr)
+                    self.assertSameAsList(lambda coll: c.reductions(f, coll, np.int8(1)), arr)
+                    self.assertSameAsList(lambda coll: c.reductions(f, coll, 0.5), arr)
+
+            # Same overflows
+            arr = np.array([100, 100, 100], dtype=np.int8)
+            self.assertEqual([100, -56, 44], list(c.reductions(operator.add, arr)))
+
+        self.assertIsNone(_numpy.accumulator(operator.add, array.array("i", [1])))
+        self.assertIsNone(_numpy.accumulator(max, np.arange(3)))
+        self.assertIsNone(_numpy.accumulator(np.greater, np.arange(3)))
+        self.assertIs(np.add, _numpy.accumulator(operator.add, np.arange(3)))
+
+    def test_interleave(self):
+        a = np.arange(3)
+        self.assertEqual([0, 3, 1, 4, 2, 5], list(c.interleave(a, a + 3)))
+        self.assertEqual([0, 3, 1, 4], list(c.interleave(a, np.arange(3, 5))))
+        self.assertEqual([], list(c.interleave(a, np.arange(0))))
+
+        # Mixed types aren't vectorized
+        self.assertFalse(_numpy.can_interleave((a, a.astype(float))))
+        self.assertFalse(_numpy.can_interleave((a, array.array("q", [1]))))
+        self.assertFalse(_numpy.can_interleave((a,)))
+        assert_same(self, [np.int64(0), 1.5], list(c.interleave(a.astype(np.int64), [1.5])))
+
+    def test_lazy(self):
+        arr = np.arange(10 ** 7) // 2
+        self.assertEqual([0, 1, 2], list(c.take(3, c.dedupe(arr))))
+        self.assertEqual([0, 1, 3], list(c.take(3, c.take_nth(3, arr))))
+        self.assertEqual([[0, 0], [1, 1]], list(c.take(2, c.partition(arr, 2))))
+        self.assertEqual([0, 0, 1, 2], list(c.take(4, c.reductions(operator.add, arr))))
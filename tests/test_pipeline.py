@@ -0,0 +1,115 @@
+# -*- coding: UTF-8 -*-
+
+import operator
+import unittest
+
+import clj as c
+from clj.pipeline import Seq
+
+
+def test_infinite_range():
+    """
+    Test generator that fails if its 10k-th element is consumed.
+    """
+    n = 0
+    while True:
+        yield n
+        n += 1
+        assert n <= 10000
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_readme_example(self):
+        coll = [1, 2, 3, 1, 5, 7, 3]
+        self.assertEqual(c.count(c.distinct(c.filter(c.is_even, c.map(c.inc, coll)))),
+                         Seq(coll).map(c.inc).filter(c.is_even).distinct().count())
+
+    def test_iter(self):
+        self.assertEqual([], list(Seq([])))
+        self.assertEqual([1, 2], list(Seq([1, 2])))
+        self.assertEqual([2, 3], list(Seq([1, 2]).map(c.inc)))
+        self.assertEqual([0, 1, 2], list(Seq(test_infinite_range()).take(3)))
+        self.assertEqual([[1, 2], [3]], Seq([1, 2, 3]).partition_all(2).to_list())
+        self.assertEqual([1, 0, 2], Seq([[1], [2]]).cat().interpose(0).to_list())
+
+    def test_immutable(self):
+        s = Seq(range(10)).map(c.inc)
+        evens = s.filter(c.is_even)
+        self.assertEqual(list(range(1, 11)), s.to_list())
+        self.assertEqual([2, 4, 6, 8, 10], evens.to_list())
+
+    def test_terminals(self):
+        s = Seq(range(10)).map(c.inc).filter(c.is_even)
+        self.assertEqual(2, s.first())
+        self.assertEqual(10, s.last())
+        self.assertEqual(30, s.reduce(operator.add, 0))
+        self.assertEqual({2, 4, 6, 8, 10}, s.into(set()))
+        self.assertEqual(4, s.some(lambda x: x > 3))
+        self.assertIsNone(s.some(lambda x: x > 30))
+        self.assertTrue(s.every(c.is_even))
+        self.assertFalse(s.every(lambda x: x < 10))
+
+        self.assertIsNone(Seq([]).first())
+        self.assertIsNone(Seq([]).last())
+        self.assertEqual(0, Seq([]).count())
+
+    def test_first_is_lazy(self):
+        self.assertEqual(20, Seq(test_infinite_range()).filter(lambda x: x >= 20).first())
+        self.assertEqual(3, Seq(test_infinite_range()).map(c.inc).drop(2).first())
+
+    def test_merge_maps(self):
+        s = Seq([1, 2]).map(c.inc).map(str)
+        self.assertEqual(["2", "3"], s.to_list())
+        self.assertEqual("source: list\n0: map(comp(str, inc))", s.explain())
+
+    def test_collapse_take_drop(self):
+        s = Seq(range(100)).drop(3).drop(4).take(10).take(5)
+        self.assertEqual([7, 8, 9, 10, 11], s.to_list())
+        self.assertEqual("source: range\n0: drop(7)\n1: take(5)", s.explain())
+
+        self.assertEqual("0: drop(3)", Seq([]).drop(-2).drop(3).explain().split("\n")[1])
+
+    def test_push_take_before_maps(self):
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return x * 2
+
+        s = Seq(range(100)).map(f).drop(2).take(3)
+        self.assertEqual("source: range\n0: drop(2)\n1: take(3)\n2: map(f)", s.explain())
+        self.assertEqual([4, 6, 8], s.to_list())
+        self.assertEqual([2, 3, 4], calls)
+
+        s = Seq(range(100)).map(f, pure=False).take(3)
+        self.assertEqual("source: range\n0: map(f, pure=False)\n1: take(3)", s.explain())
+
+    def test_count(self):
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return x
+
+        s = Seq(range(100)).map(f).drop(10).take(20).map(c.inc)
+        self.assertEqual(20, s.count())
+        self.assertEqual([], calls)
+        self.assertEqual("source: range\n0: drop(10)\n1: take(20)\nterminal: count (computed from len())",
+                         s.explain("count"))
+
+        self.assertEqual(3, Seq(iter(range(3))).map(f).count())
+        self.assertEqual([], calls)
+
+        self.assertEqual(3, Seq(range(3)).map(f, pure=False).count())
+        self.assertEqual([0, 1, 2], calls)
+
+        self.assertEqual(5, Seq(range(10)).filter(c.is_even).count())
+        self.assertEqual(3, Seq(test_infinite_range()).take(3).count())
+
+    def test_explain_first(self):
+        self.assertEqual("source: list\n0: take(1)\n1: map(inc)\nterminal: first (stop at the first element)",
+                         Seq([1]).map(c.inc).explain("first"))
+
+    def test_repr(self):
+        self.assertEqual("<Seq list ->> map(inc) ->> take(2)>", repr(Seq([]).map(c.inc).take(2)))
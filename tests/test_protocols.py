@@ -0,0 +1,123 @@
+# -*- coding: UTF-8 -*-
+
+import unittest
+
+import clj as c
+from clj import chunked as ch
+from clj import protocols
+from clj import views
+
+
+class Column:
+    """
+    A collection whose elements can't be iterated over, so that the tests
+    fail if the protocols aren't used.
+    """
+
+    def __init__(self, values):
+        self.values = list(values)
+
+    def __iter__(self):
+        raise AssertionError("Column was iterated over")
+
+
+class SubColumn(Column):
+    pass
+
+
+class Rows(list):
+    """
+    A list that extends ``ISliceable``, which must be used instead of views.
+    The slices taken are recorded in ``slices``.
+    """
+    slices: list = []
+
+
+def _slice_rows(rows, start, stop):
+    Rows.slices.append((start, stop))
+    return list.__getitem__(rows, slice(start, stop))
+
+
+protocols.ICounted.extend(Column, count=lambda col: len(col.values))
+protocols.IIndexed.extend(Column, nth=lambda col, i: col.values[i])
+protocols.IReversible.extend(Column, rseq=lambda col: reversed(col.values))
+protocols.ISliceable.extend(Column, slice=lambda col, start, stop: col.values[start:stop])
+protocols.IChunked.extend(Column, chunks=lambda col, size: [col.values[i:i + size]
+                                                            for i in range(0, len(col.values), size)])
+protocols.IEmptyableCollection.extend(Column, empty=lambda col: Column([]))
+protocols.ISliceable.extend(Rows, slice=_slice_rows)
+
+
+class TestProtocols(unittest.TestCase):
+
+    def test_extend(self):
+        protocol = protocols.Protocol("IFoo", ("foo", "bar"))
+        self.assertIsNone(protocol.find(42))
+        self.assertRaises(TypeError, protocol.extend, int, foo=abs)
+
+        protocol.extend(object, foo=abs, bar=str)
+        self.assertEqual(1, protocol.find(-1).foo(-1))
+        # The cache is cleared
+        protocol.extend(int, foo=c.inc, bar=str)
+        self.assertEqual(0, protocol.find(-1).foo(-1))
+        self.assertEqual(1, protocol.find(-1.0).foo(-1.0))
+        # bool is a subclass of int
+        self.assertTrue(protocols.satisfies(protocol, True))
+        self.assertEqual(2, protocol.find(True).foo(True))
+
+        self.assertTrue(protocols.satisfies(protocols.ICounted, SubColumn([])))
+        self.assertFalse(protocols.satisfies(protocols.ICounted, []))
+
+    def test_seqs(self):
+        for cls in (Column, SubColumn):
+            col = cls(range(10))
+            empty = cls([])
+
+            self.assertEqual(10, c.count(col))
+            self.assertEqual(0, c.count(empty))
+            self.assertEqual(3, c.nth(col, 3))
+            self.assertEqual(42, c.nth(col, 10, 42))
+            self.assertRaises(IndexError, c.nth, col, 10)
+            self.assertEqual(0, c.first(col))
+            self.assertIsNone(c.first(empty))
+            self.assertEqual(9, c.last(col))
+            self.assertIsNone(c.last(empty))
+            self.assertEqual(list(range(9, -1, -1)), list(c.reverse(col)))
+            self.assertEqual([7, 8, 9], list(c.drop(7, col)))
+            self.assertEqual([1, 2, 3, 4, 5, 6, 7, 8, 9], list(c.rest(col)))
+            self.assertEqual([0, 1, 2], list(c.take(3, col)))
+            self.assertEqual(list(range(9)), list(c.butlast(col)))
+            self.assertEqual(list(range(7)), list(c.drop_last(3, col)))
+            self.assertEqual([], list(c.drop_last(11, col)))
+            self.assertEqual([[0, 1, 2], [3, 4, 5], [6, 7, 8]], list(c.partition(col, 3)))
+            self.assertEqual([(0, 1, 2), (2, 3, 4), (4, 5, 6), (6, 7, 8), (8, 9, -1)],
+                             list(c.partition(col, 3, 2, pad=[-1], as_tuple=True)))
+            self.assertEqual([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]], list(c.partition_all(col, 4)))
+            self.assertEqual([[0, 1], [5, 6]], list(c.partition_all(col, 2, 5)))
+            self.assertIsInstance(c.empty(col), Column)
+
+    def test_sliceable_sequence(self):
+        rows = Rows(range(10))
+        self.assertEqual([7, 8, 9], list(c.drop(7, rows)))
+        self.assertEqual([0, 1, 2], list(c.take(3, rows)))
+        self.assertEqual([(7, None), (0, 3)], Rows.slices)
+        # No view is returned, even where the protocol isn't used
+        self.assertNotIsInstance(c.take_nth(3, rows), views.StridedView)
+        self.assertEqual([0, 3, 6, 9], list(c.take_nth(3, rows)))
+        head, tail = c.split_at(4, rows)
+        self.assertNotIsInstance(head, views.SliceView)
+        self.assertEqual(([0, 1, 2, 3], [4, 5, 6, 7, 8, 9]), (list(head), list(tail)))
+
+    def test_chunked(self):
+        col = Column(range(10))
+        self.assertEqual([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]], list(ch.chunked(col, 4).chunks()))
+        self.assertEqual([1, 3, 5, 7, 9], list(ch.map(c.inc, ch.filter(c.is_even, col))))
+
+    def test_counted_by_chunks(self):
+        protocol = protocols.IChunked
+
+        class Chunks:
+            pass
+
+        protocol.extend(Chunks, chunks=lambda coll, size: [[1, 2], [3]])
+        self.assertEqual(3, c.count(Chunks()))
@@ -0,0 +1,88 @@
+# -*- coding: UTF-8 -*-
+
+import array
+import operator
+import unittest
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from clj.reducers import fold, monoid
+
+
+def add_square(acc, x):
+    return acc + x * x
+
+
+def append(acc, x):
+    return acc + [x]
+
+
+class TestReducers(unittest.TestCase):
+
+    def test_monoid(self):
+        plus = monoid(operator.add, int)
+        self.assertEqual(0, plus())
+        self.assertEqual(3, plus(1, 2))
+
+    def test_fold(self):
+        plus = monoid(operator.add, int)
+        expected = sum(x * x for x in range(10000))
+        for coll in (list(range(10000)), tuple(range(10000)), range(10000), array.array("q", range(10000)),
+                     deque(range(10000)), iter(range(10000)), (x for x in range(10000))):
+            self.assertEqual(expected, fold(plus, add_square, coll, n=100))
+
+        self.assertEqual(expected, fold(operator.add, add_square, range(10000), n=7, init=0))
+        self.assertEqual(expected, fold(plus, add_square, range(10000), n=100000))
+
+        # Indexable collections that can't be sliced are read as iterables
+        class Squares:
+            def __len__(self):
+                return 10000
+
+            def __getitem__(self, i):
+                if not isinstance(i, int):
+                    raise TypeError("indices must be integers")
+                if i >= 10000:
+                    raise IndexError(i)
+                return i * i
+
+        self.assertEqual(expected, fold(plus, operator.add, Squares(), n=100))
+
+    def test_empty(self):
+        self.assertEqual(0, fold(monoid(operator.add, int), add_square, []))
+        self.assertEqual(0, fold(monoid(operator.add, int), add_square, iter([])))
+        self.assertEqual(42, fold(operator.add, add_square, [], init=42))
+
+    def test_order(self):
+        # combinef doesn't have to be commutative
+        concat = monoid(operator.add, list)
+        for n in (1, 3, 64, 1000, 2000):
+            self.assertEqual(list(range(1000)), fold(concat, append, list(range(1000)), n=n))
+            self.assertEqual(list(range(1000)), fold(concat, append, iter(range(1000)), n=n))
+
+    def test_executor(self):
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(4950, fold(monoid(operator.add, int), operator.add, range(100), n=10, executor=executor))
+            # Not shut down
+            self.assertEqual(1, executor.submit(abs, -1).result())
+
+        self.assertRaises(ValueError, fold, operator.add, operator.add, [1], n=0)
+        self.assertRaises(ValueError, fold, operator.add, operator.add, range(100), n=10, executor="nope")
+
+    def test_processes(self):
+        plus = monoid(operator.add, int)
+        expected = sum(x * x for x in range(20000))
+        self.assertEqual(expected, fold(plus, add_square, range(20000), n=1000, executor="process", workers=2))
+        self.assertEqual(expected, fold(plus, add_square, list(range(20000)), n=1000, executor="process",
+                                        workers=2))
+        self.assertEqual(expected, fold(plus, add_square, iter(range(20000)), n=1000, executor="process",
+                                        workers=2))
+
+    def test_exception(self):
+        def boom(acc, x):
+            if x == 500:
+                raise RuntimeError("boom!")
+            return acc + x
+
+        self.assertRaises(RuntimeError, fold, operator.add, boom, range(1000), n=10, init=0)
+        self.assertRaises(RuntimeError, fold, operator.add, boom, iter(range(1000)), n=10, init=0)
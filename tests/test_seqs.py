@@ -1,7 +1,12 @@
 # -*- coding: UTF-8 -*-
 
+import time
+import multiprocessing
+import operator
+import threading
 import unittest
-from collections import OrderedDict, Counter, deque, defaultdict
+from collections import OrderedDict, Counter, UserList, deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 import clj as c
 
@@ -25,6 +30,10 @@ class TestSeqs(unittest.TestCase):
         self.assertEquals([1], list(c.distinct([1])))
         self.assertEquals([1, 2, 3, 4], list(c.distinct([1, 2, 3, 4])))
         self.assertEquals([2, 1, 3], list(c.distinct([2, 1, 3, 1, 2, 3])))
+        self.assertEquals([2, 1], list(c.distinct([2, 1, 3, 1, 2, 3], key=c.is_odd)))
+        self.assertEquals([{"id": 1, "v": "a"}, {"id": 2, "v": "b"}],
+                          list(c.distinct([{"id": 1, "v": "a"}, {"id": 2, "v": "b"}, {"id": 1, "v": "c"}],
+                                          key=lambda d: d["id"])))
 
     def test_filter(self):
         self.assertIsNotNone(c.filter(lambda _: True, test_infinite_range()))
@@ -132,6 +141,14 @@ class TestSeqs(unittest.TestCase):
         self.assertEquals([1, 2, 3, 4], list(c.drop(-3, [1, 2, 3, 4])))
         self.assertEquals([4], list(c.drop(3, [1, 2, 3, 4])))
 
+        # Random access
+        for make in (list, tuple, bytes, bytearray, lambda x: memoryview(bytes(x)), deque, UserList, iter, lambda x: x):
+            expected = list(make(range(10)))[7:]
+            self.assertEquals(expected, list(c.drop(7, make(range(10)))))
+            self.assertEquals(expected[1:], list(c.drop(8, c.drop(-1, make(range(10))))))
+        self.assertEquals(["7", "8", "9"], list(c.drop(7, "0123456789")))
+        self.assertEquals([], list(c.drop(10 ** 12, range(10))))
+
     def test_drop_while(self):
         self.assertIsNotNone(c.drop_while(lambda _: True, test_infinite_range()))
         self.assertEquals([], list(c.drop_while(lambda _: True, [])))
@@ -179,6 +196,9 @@ class TestSeqs(unittest.TestCase):
         self.assertEquals([], list(c.butlast([1])))
         self.assertEquals([1], list(c.butlast([1, 2])))
         self.assertEquals([1, 2, 3], list(c.butlast([1, 2, 3, 4])))
+        self.assertEquals([0, 1, 2], list(c.butlast(range(4))))
+        self.assertEquals([1, 2], list(c.butlast({1: 1, 2: 2, 3: 3}.keys())))
+        self.assertEquals(["a"], list(c.butlast(deque("ab"))))
 
     def test_drop_last(self):
         self.assertEquals([], list(c.drop_last(0, [])))
@@ -188,6 +208,11 @@ class TestSeqs(unittest.TestCase):
         self.assertEquals([1, 2], list(c.drop_last(-5, [1, 2])))
         self.assertEquals([], list(c.drop_last(2, [1, 2])))
         self.assertEquals([1, 2], list(c.drop_last(3, [1, 2, 3, 4, 5])))
+        self.assertEquals([0, 1], list(c.drop_last(3, range(5))))
+        self.assertEquals([0, 1], list(c.drop_last(3, iter(range(5)))))
+        self.assertEquals(["a"], list(c.drop_last(2, deque("abc"))))
+        self.assertEquals([1, 2], list(c.drop_last(-1, {1, 2})))
+        self.assertEquals([], list(c.drop_last(5, {1: 1, 2: 2}.values())))
 
     def test_flatten(self):
         self.assertEquals([], list(c.flatten([])))
@@ -206,13 +231,41 @@ class TestSeqs(unittest.TestCase):
                           list(c.take(3, c.flatten([[1], c.range(), 42, c.range()]))),
                           "mix of single elements and infinite generators")
 
-        """
         deep_list = ["foo"]
         for _ in range(200):
             deep_list = [[[[[deep_list]]]]]
 
         self.assertEquals(["foo"], list(c.flatten(deep_list)), "deep list")
-        """
+
+        deep_list = [1]
+        for _ in range(100000):
+            deep_list = [deep_list, 2]
+        self.assertEquals([1] + [2] * 100000, list(c.flatten(deep_list)), "very deep list")
+
+    def test_flatten_max_depth(self):
+        x = [1, [2, (3, [4])], [[5]]]
+        self.assertEquals([1, 2, 3, 4, 5], list(c.flatten(x, max_depth=None)))
+        self.assertEquals([1, 2, 3, 4, 5], list(c.flatten(x, max_depth=3)))
+        self.assertEquals([1, 2, 3, [4], 5], list(c.flatten(x, max_depth=2)))
+        self.assertEquals([1, 2, (3, [4]), [5]], list(c.flatten(x, max_depth=1)))
+        self.assertEquals(x, list(c.flatten(x, max_depth=0)))
+        self.assertEquals(x, list(c.flatten(x, max_depth=-1)))
+
+        self.assertEquals([0, [1], 0, [1]], list(c.take(4, c.flatten(c.repeat([0, [1]]), max_depth=1))))
+
+    def test_flatten_leaf_types(self):
+        self.assertEquals([97, 98], list(c.flatten([b"ab"], leaf_types=(str,))))
+        # Without str in leaf_types, strings are split into characters
+        self.assertEquals(["a", "b", "c"], list(c.flatten(["ab", ["c"]], leaf_types=())))
+        self.assertEquals([1, (2, 3), b"4"], list(c.flatten([[1, (2, 3)], b"4"], leaf_types=(tuple, bytes))))
+        self.assertEquals([{"a": 1}, 2], list(c.flatten([[{"a": 1}], [2]], leaf_types=(dict,))))
+        self.assertEquals(["a", 2], list(c.flatten([[{"a": 1}], [2]])))
+        self.assertEquals([[1], [2]], list(c.flatten(([1], ([2],)), leaf_types=(list,))))
+
+        class Node(list):
+            pass
+
+        self.assertEquals([1, Node([2, [3]])], list(c.flatten([[1, Node([2, [3]])]], leaf_types=(Node,))))
 
     def test_reverse(self):
         self.assertEquals([], list(c.reverse([])))
@@ -237,6 +290,26 @@ class TestSeqs(unittest.TestCase):
         gen = (e for e in range(1, 7))
         self.assertEquals([[1, 2, 3], [4, 5, 6]], list(map(list, c.split_at(3, gen))))
         self.assertEquals([0, 1], list(c.split_at(2, test_infinite_range())[0]))
+        self.assertEquals([[1, 2, 3], []], list(map(list, c.split_at(5, [1, 2, 3]))))
+        self.assertEquals([[], [1, 2]], list(map(list, c.split_at(-1, [1, 2]))))
+        self.assertEquals([[], []], list(map(list, c.split_at(1, None))))
+
+        # Both halves are lazy and can be iterated over several times
+        read = []
+
+        def _gen():
+            for x in range(1, 7):
+                read.append(x)
+                yield x
+
+        taken, dropped = c.split_at(3, _gen())
+        self.assertEquals([], read)
+        self.assertEquals([4, 5], list(c.take(2, dropped)))
+        self.assertEquals([1, 2, 3, 4, 5], read)
+        self.assertEquals([1, 2, 3], list(taken))
+        self.assertEquals([1, 2, 3], list(taken))
+        self.assertEquals([4, 5, 6], list(dropped))
+        self.assertEquals([1, 2, 3], list(taken))
 
     def test_split_with(self):
         self.assertEquals([[], []],
@@ -254,6 +327,183 @@ class TestSeqs(unittest.TestCase):
         self.assertEquals([0, 1], list(c.split_with(lambda n: n < 2,
                                                     test_infinite_range())[0]))
 
+        taken, dropped = c.split_with(lambda n: n < 2, test_infinite_range())
+        self.assertEquals([2, 3], list(c.take(2, dropped)))
+        self.assertEquals([0, 1], list(taken))
+        self.assertEquals([0, 1], list(taken))
+
+    def test_pmap(self):
+        self.assertIsNotNone(c.pmap(c.inc, test_infinite_range()))
+        self.assertEqual([], list(c.pmap(c.inc, [])))
+        self.assertEqual([1, 2, 3], list(c.pmap(c.inc, range(3))))
+        self.assertEqual([9, 12], list(c.pmap(lambda *xs: sum(xs), [1, 2, 3], [2, 3, 4, 5], [6, 7])))
+        self.assertEqual(list(range(1, 101)), list(c.pmap(c.inc, range(100), workers=3, chunksize=7)))
+        self.assertEqual(list(range(1, 101)), sorted(c.pmap(c.inc, range(100), chunksize=3, ordered=False)))
+
+        self.assertEqual([1, 2, 3, 4, 5], list(c.take(5, c.pmap(c.inc, test_infinite_range(), max_in_flight=4))))
+
+        with self.assertRaises(ZeroDivisionError):
+            list(c.pmap(lambda x: 1 / x, [1, 2, 0, 3]))
+
+        self.assertRaises(ValueError, list, c.pmap(c.inc, [1], executor="nope"))
+        self.assertRaises(ValueError, list, c.pmap(c.inc, [1], chunksize=0))
+
+    def test_pmap_bounded(self):
+        read = []
+
+        def _gen():
+            for x in range(1000):
+                read.append(x)
+                yield x
+
+        g = c.pmap(c.inc, _gen(), max_in_flight=3, chunksize=2)
+        self.assertEqual([], read)
+        self.assertEqual(1, next(g))
+        self.assertEqual(list(range(6)), read)
+
+    def test_pmap_unordered(self):
+        def f(x):
+            time.sleep(0.05 if x == 0 else 0)
+            return x
+
+        self.assertEqual(0, list(c.pmap(f, range(10), workers=4, ordered=False))[-1])
+
+    def test_pmap_executor(self):
+        with ThreadPoolExecutor(2) as pool:
+            self.assertEqual([1, 2], list(c.pmap(c.inc, [0, 1], executor=pool)))
+            # not shut down
+            self.assertEqual(2, pool.submit(c.inc, 1).result())
+
+    def test_pmap_process(self):
+        self.assertEqual(list(range(1, 201)), list(c.pmap(c.inc, range(200), workers=2, executor="process")))
+        self.assertEqual([3, 5], list(c.pmap(max, [1, 5], [3, 2], executor="process", chunksize=1)))
+
+        # Stopping early shuts the pool down
+        g = c.pmap(c.inc, range(1000), executor="process", workers=2)
+        self.assertEqual([1, 2, 3], list(c.take(3, g)))
+        g.close()  # type: ignore
+        self.assertEqual([], multiprocessing.active_children())
+
+    def test_seque(self):
+        self.assertIsNotNone(c.seque(test_infinite_range()))
+        self.assertEqual([], list(c.seque([])))
+        self.assertEqual(list(range(1000)), list(c.seque(range(1000), 10)))
+        self.assertEqual(list(range(1000)), list(c.seque(iter(range(1000)), 100, chunksize=7)))
+        self.assertEqual([0, 1, 2], list(c.take(3, c.seque(test_infinite_range()))))
+
+        with ThreadPoolExecutor(1) as pool:
+            self.assertEqual([1, 2], list(c.seque([1, 2], executor=pool)))
+
+        self.assertRaises(ValueError, list, c.seque([1], n=0))
+        self.assertRaises(ValueError, list, c.seque([1], chunksize=0))
+
+    def test_seque_error(self):
+        def _gen():
+            yield 1
+            raise KeyError("oops")
+
+        g = c.seque(_gen())
+        self.assertEqual(1, next(g))
+        self.assertRaises(KeyError, next, g)
+
+    def test_seque_bounded(self):
+        read = []
+        closed = []
+
+        def _gen():
+            try:
+                for x in range(1000):
+                    read.append(x)
+                    yield x
+            finally:
+                closed.append(True)
+
+        g = c.seque(_gen(), 5)
+        self.assertEqual(0, next(g))
+        time.sleep(0.05)
+        # The 5 elements in the queue, the one being put and the one read
+        self.assertLessEqual(len(read), 7)
+
+        # The producer stops and closes the generator once the consumer is
+        # closed
+        g.close()
+        for _ in range(100):
+            if closed:
+                break
+            time.sleep(0.01)
+        self.assertEqual([True], closed)
+        self.assertLess(len(read), 1000)
+
+    def test_fork(self):
+        self.assertEqual((), c.fork([1], 0))
+        a, b, d = c.fork(test_infinite_range(), 3)
+        self.assertEqual([0, 1, 2], list(c.take(3, a)))
+        self.assertEqual([0, 1], list(c.take(2, b)))
+        self.assertEqual([(0, 2, 3), (1, 3, 4)], list(c.take(2, zip(d, b, a))))
+
+        a, b = c.fork(iter(range(5)))
+        self.assertEqual([0, 1, 2, 3, 4], list(a))
+        self.assertEqual([0, 1, 2, 3, 4], list(b))
+        self.assertEqual([], list(a))
+
+        self.assertRaises(ValueError, c.fork, [], -1)
+        self.assertRaises(ValueError, c.fork, [], 2, 0)
+
+    def test_fork_bounded(self):
+        a, b, d = c.fork(test_infinite_range(), 3, max_lag=3)
+        self.assertEqual([0, 1, 2], list(c.take(3, a)))
+        self.assertRaises(BufferError, next, a)
+        self.assertEqual([0, 1], [next(b), next(b)])
+        self.assertRaises(BufferError, next, a)
+        self.assertEqual(0, next(d))
+        self.assertEqual(3, next(a))
+
+        # Closed iterators no longer count
+        d.close()  # type: ignore
+        # b took 3 elements, although it only returned 2
+        self.assertEqual([4, 5], [next(a), next(a)])
+        self.assertRaises(BufferError, next, a)
+        del b
+        self.assertEqual(list(range(6, 100)), list(c.take(94, a)))
+
+    def test_fork_threads(self):
+        read = []
+
+        def _gen():
+            for x in range(10000):
+                read.append(x)
+                yield x
+
+        forks = c.fork(_gen(), 8, max_lag=10, block=True)
+        results = [[] for _ in forks]
+        lags = []
+
+        def consume(it, result):
+            for x in it:
+                result.append(x)
+                lags.append(len(read) - min(map(len, results)))
+
+        threads = [threading.Thread(target=consume, args=args) for args in zip(forks, results)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([list(range(10000))] * 8, results)
+        # max_lag, plus the elements the slowest one took but didn't return
+        # yet
+        self.assertLessEqual(max(lags), 21)
+
+    def test_fork_error(self):
+        def _gen():
+            yield 1
+            raise KeyError("oops")
+
+        a, b = c.fork(_gen())
+        self.assertEqual(1, next(a))
+        self.assertRaises(KeyError, next, a)
+        self.assertEqual(1, next(b))
+        self.assertRaises(KeyError, next, b)
+
     def test_replace(self):
         self.assertIsNotNone(c.replace({0: 1}, test_infinite_range()))
         self.assertEquals([], list(c.replace({}, [])))
@@ -306,10 +556,23 @@ class TestSeqs(unittest.TestCase):
 
         self.assertEquals(20, c.nth(test_infinite_range(), 20))
 
+        keys = {k: None for k in "abcdef"}.keys()
+        self.assertEquals(["a", "b", "c", "d", "e", "f"], [c.nth(keys, i) for i in range(6)])
+        self.assertEquals(nope, c.nth(keys, 6, nope))
+        self.assertRaises(IndexError, c.nth, keys, 6)
+        self.assertEquals(3, c.nth(deque(range(5)), 3))
+        self.assertEquals(2, c.nth({1, 2, 3}, 1))
+
     def test_last(self):
         self.assertEquals(None, c.last([]))
         self.assertEquals(1, c.last([1]))
         self.assertEquals(2, c.last([1, 2]))
+        self.assertEquals(9, c.last(range(10)))
+        self.assertEquals(None, c.last(range(0)))
+        self.assertEquals(2, c.last(deque([1, 2])))
+        self.assertEquals("b", c.last(OrderedDict(a=1, b=2)))
+        self.assertEquals(2, c.last(iter([1, 2])))
+        self.assertEquals(2, c.last(x for x in [1, 2]))
 
     def test_zipmap(self):
         self.assertEquals({}, c.zipmap([], []))
@@ -325,6 +588,63 @@ class TestSeqs(unittest.TestCase):
         self.assertEquals({1: [1, 5001], 3: [3]},
                           c.group_by(lambda e: e % 10, [1, 5001, 3]))
 
+    def test_reduce_by(self):
+        self.assertEqual({}, c.reduce_by(c.is_odd, operator.add, []))
+        self.assertEqual({False: 6, True: 9}, c.reduce_by(c.is_odd, operator.add, range(6)))
+        self.assertEqual({False: 106, True: 109}, c.reduce_by(c.is_odd, operator.add, iter(range(6)), 100))
+        self.assertEqual({"a": "ab", "b": "b"}, c.reduce_by(lambda w: w[0], max, ["a", "b", "ab", "aa"]))
+        # Same as reducing the groups
+        words = ["x", "yy", "z", "www", "vv", "u"]
+        self.assertEqual({k: len(v) for k, v in c.group_by(len, words).items()},
+                         c.reduce_by(len, lambda n, _: n + 1, words, 0))
+
+    def test_frequencies(self):
+        self.assertEqual({}, c.frequencies([]))
+        self.assertEqual({"b": 2, "a": 1}, c.frequencies("bab"))
+        self.assertEqual(["b", "a"], list(c.frequencies(iter("bab"))))
+
+    def test_aggregate_by(self):
+        self.assertEqual({}, c.aggregate_by(len, {"n": (operator.add, 0)}, []))
+        aggregates = {"count": (lambda n, _: n + 1, 0, operator.add),
+                      "sum": (operator.add, 0),
+                      "max": (max, float("-inf"))}
+        result = c.aggregate_by(c.is_odd, aggregates, iter([1, 2, 3, 4, 7]))
+        self.assertEqual({True: {"count": 3, "sum": 11, "max": 7}, False: {"count": 2, "sum": 6, "max": 4}}, result)
+        self.assertEqual(["count", "sum", "max"], list(result[True]))
+
+    def test_multi_reduce(self):
+        self.assertEqual({}, c.multi_reduce([1, 2], {}))
+        self.assertEqual({"n": 0, "last": None},
+                         c.multi_reduce([], {"n": (operator.add, 0), "last": (lambda _, e: e, None)}))
+        reductions = {"count": (lambda n, _: n + 1, 0, operator.add),
+                      "sum": (operator.add, 0),
+                      "by_parity": (lambda d, e: d.setdefault(c.is_odd(e), []).append(e) or d, {}),
+                      "last": (lambda _, e: e, None)}
+        result = c.multi_reduce(iter([1, 2, 3, 4, 7]), reductions)
+        self.assertEqual({"count": 5, "sum": 17, "by_parity": {True: [1, 3, 7], False: [2, 4]}, "last": 7}, result)
+        self.assertEqual(list(reductions), list(result))
+
+    def test_merge_with(self):
+        self.assertEqual({}, c.merge_with(operator.add))
+        self.assertEqual({}, c.merge_with(operator.add, None, {}))
+        self.assertEqual({"a": 1, "b": 5, "c": 4}, c.merge_with(operator.add, {"a": 1, "b": 2}, None, {"b": 3, "c": 4}))
+        self.assertEqual({"a": [1, 2]}, c.merge_with(lambda a, b: a + b, {"a": [1]}, {"a": [2]}))
+
+        # Combine the results of shards
+        coll = list(range(100))
+        shards = [coll[:30], coll[30:70], coll[70:]]
+        self.assertEqual(c.frequencies(x % 7 for x in coll),
+                         c.merge_with(operator.add, *(c.frequencies(x % 7 for x in shard) for shard in shards)))
+        self.assertEqual(c.reduce_by(c.is_even, max, coll),
+                         c.merge_with(max, *(c.reduce_by(c.is_even, max, shard) for shard in shards)))
+
+        aggregates = {"count": (lambda n, _: n + 1, 0, operator.add),
+                      "sum": (operator.add, 0),
+                      "min": (min, float("inf"))}
+        self.assertEqual(c.aggregate_by(c.is_even, aggregates, coll),
+                         c.merge_aggregates(aggregates, *(c.aggregate_by(c.is_even, aggregates, shard)
+                                                          for shard in shards)))
+
     def test_some(self):
         self.assertEquals(None, c.some(lambda e: True, []))
         self.assertEquals(None, c.some(lambda e: False, []))
@@ -398,6 +718,16 @@ class TestSeqs(unittest.TestCase):
 
         self.assertEquals(10, c.nth(c.iterate(inc, 0), 10))
 
+    def test_reductions(self):
+        def add(a, b): return a + b
+
+        self.assertEquals([None], list(c.reductions(add, [])))
+        self.assertEquals([5], list(c.reductions(add, None, 5)))
+        self.assertEquals([1, 3, 6], list(c.reductions(add, [1, 2, 3])))
+        self.assertEquals([1, 3, 6], list(c.reductions(add, iter([1, 2, 3]))))
+        self.assertEquals([10, 11, 13], list(c.reductions(add, (1, 2), 10)))
+        self.assertEquals([0, 1, 3], list(c.take(3, c.reductions(add, test_infinite_range()))))
+
     def test_repeat(self):
         self.assertEquals([2, 2, 2], list(c.take(3, c.repeat(2))))
         self.assertEquals([2, 2, 2], list(c.repeat(2, 3)))
@@ -442,6 +772,57 @@ class TestSeqs(unittest.TestCase):
         self.assertEquals(["C", "l", "o", "j", "u", "r", "e"],
                           list(map(c.first, c.tree_seq(c.rest, c.rest, t))))
 
+        deep = [1]
+        for _ in range(100000):
+            deep = [deep]
+        self.assertEquals(100002, c.count(c.tree_seq(c.is_seq, c.identity, deep)), "deep tree")
+
+        self.assertIsNotNone(c.tree_seq(c.constantly(True), lambda _: test_infinite_range(), 0))
+        self.assertEquals([0, 0, 0],
+                          list(c.take(3, c.tree_seq(c.constantly(True), lambda _: test_infinite_range(), 0))))
+
+    def test_tree_seq_bfs(self):
+        t = [[1, 2, [3]], [4]]
+        self.assertEquals([t, [1, 2, [3]], [4], 1, 2, [3], 4, 3],
+                          list(c.tree_seq(c.is_seq, c.identity, t, bfs=True)))
+        self.assertEquals([42], list(c.tree_seq(lambda _: False, c.identity, 42, bfs=True)))
+        self.assertEquals([0, 0, 1, 2],
+                          list(c.take(4, c.tree_seq(c.constantly(True), lambda _: test_infinite_range(), 0, bfs=True))))
+
+    def test_tree_seq_max_depth(self):
+        t = [[1, 2, [3]], [4]]
+        for bfs in (False, True):
+            self.assertEquals([t], list(c.tree_seq(c.is_seq, c.identity, t, bfs=bfs, max_depth=0)))
+            self.assertEquals([t], list(c.tree_seq(c.is_seq, c.identity, t, bfs=bfs, max_depth=-1)))
+            self.assertEquals([t, [1, 2, [3]], [4]], list(c.tree_seq(c.is_seq, c.identity, t, bfs=bfs, max_depth=1)))
+            self.assertEquals(7, c.count(c.tree_seq(c.is_seq, c.identity, t, bfs=bfs, max_depth=2)))
+            self.assertEquals(8, c.count(c.tree_seq(c.is_seq, c.identity, t, bfs=bfs, max_depth=3)))
+
+        calls = []
+
+        def children(node):
+            calls.append(node)
+            return [node + 1]
+
+        self.assertEquals([0, 1, 2], list(c.tree_seq(c.constantly(True), children, 0, max_depth=2)))
+        self.assertEquals([0, 1], calls)
+
+    def test_tree_seq_unique(self):
+        def is_list(x):
+            return isinstance(x, list)
+
+        shared = ["s", ["leaf"]]
+        dag = [[shared, "a"], [shared, "b"]]
+        for bfs in (False, True):
+            nodes = list(c.tree_seq(is_list, c.identity, dag, bfs=bfs, unique=True))
+            self.assertEquals(1, len([n for n in nodes if n is shared]))
+            self.assertEquals(1, nodes.count("leaf"))
+            self.assertEquals(2, len([n for n in c.tree_seq(is_list, c.identity, dag, bfs=bfs) if n is shared]))
+
+        cycle = ["x"]
+        cycle.append(cycle)
+        self.assertEquals([cycle, "x"], list(c.tree_seq(is_list, c.identity, cycle, unique=True)))
+
     def test_dedupe(self):
         self.assertEquals([], list(c.dedupe([])))
         self.assertEquals([1], list(c.dedupe([1])))
@@ -489,6 +870,44 @@ class TestSeqs(unittest.TestCase):
 
         self.assertSequenceEqual([[1, 2, 3], [4, 5]], list((c.partition([1, 2, 3, 4], 3, pad=[5]))))
         self.assertSequenceEqual([[1, 2, 3], [4, 5, 6]], list((c.partition([1, 2, 3, 4], 3, pad=[5, 6]))))
+        self.assertSequenceEqual([[1, 2, 3], [4, 5, 6]], list((c.partition([1, 2, 3, 4], 3, pad=[5, 6, 7]))))
+        self.assertSequenceEqual([[1, 2, 3], [4, 5, 6]], list((c.partition([1, 2, 3, 4], 3, pad=iter([5, 6, 7])))))
+        self.assertSequenceEqual([[1, 2, 3], [4]], list((c.partition([1, 2, 3, 4], 3, pad=[]))))
+
+        # step < n
+        # (partition 4 2 (range 10)) ; => ((0 1 2 3) (2 3 4 5) (4 5 6 7) (6 7 8 9))
+        self.assertSequenceEqual([[0, 1, 2, 3], [2, 3, 4, 5], [4, 5, 6, 7], [6, 7, 8, 9]],
+                                 list(c.partition(range(10), 4, 2)))
+        self.assertSequenceEqual([[0, 1, 2], [1, 2, 3]], list(c.partition(iter(range(4)), 3, 1)))
+        self.assertSequenceEqual([], list(c.partition([1, 2], 3, 1)))
+        # (partition 3 1 [:a] [1 2 3 4]) ; => ((1 2 3) (2 3 4) (3 4 :a))
+        self.assertSequenceEqual([[1, 2, 3], [2, 3, 4], [3, 4, "a"]], list(c.partition([1, 2, 3, 4], 3, 1, ["a"])))
+        self.assertSequenceEqual([[1, 2, "a"]], list(c.partition([1, 2], 3, 1, ["a"])))
+        self.assertSequenceEqual([[0, 1, 2]], list(c.take(1, c.partition(test_infinite_range(), 3, 1))))
+
+        # step > n
+        # (partition 2 3 [1 2 3 4 5 6 7]) ; => ((1 2) (4 5))
+        self.assertSequenceEqual([[1, 2], [4, 5]], list(c.partition([1, 2, 3, 4, 5, 6, 7], 2, 3)))
+        self.assertSequenceEqual([[1, 2], [4, 5], [7, "a"]], list(c.partition([1, 2, 3, 4, 5, 6, 7], 2, 3, ["a"])))
+        self.assertSequenceEqual([[1, 2], [4, 5]], list(c.partition([1, 2, 3, 4, 5, 6], 2, 3, ["a"])))
+
+        for step in (0, -1):
+            self.assertSequenceEqual([], list(c.partition([1, 2, 3], 2, step)))
+
+        # as_tuple
+        self.assertSequenceEqual([(1, 2), (3, 4)], list(c.partition([1, 2, 3, 4, 5], 2, as_tuple=True)))
+        self.assertSequenceEqual([(1, 2), (2, 3), (3, "a")], list(c.partition([1, 2, 3], 2, 1, ["a"], as_tuple=True)))
+
+    def test_partition_all(self):
+        self.assertSequenceEqual([], list(c.partition_all([], 2)))
+        self.assertSequenceEqual([], list(c.partition_all([1, 2], 0)))
+        self.assertSequenceEqual([[1, 2], [3, 4], [5]], list(c.partition_all([1, 2, 3, 4, 5], 2)))
+        # (partition-all 3 1 [1 2 3 4]) ; => ((1 2 3) (2 3 4) (3 4) (4))
+        self.assertSequenceEqual([[1, 2, 3], [2, 3, 4], [3, 4], [4]], list(c.partition_all([1, 2, 3, 4], 3, 1)))
+        # (partition-all 2 3 [1 2 3 4 5 6 7]) ; => ((1 2) (4 5) (7))
+        self.assertSequenceEqual([[1, 2], [4, 5], [7]], list(c.partition_all(iter([1, 2, 3, 4, 5, 6, 7]), 2, 3)))
+        self.assertSequenceEqual([(1, 2), (3,)], list(c.partition_all([1, 2, 3], 2, as_tuple=True)))
+        self.assertSequenceEqual([[0, 1]], list(c.take(1, c.partition_all(test_infinite_range(), 2))))
 
     def test_partition_by(self):
         self.assertSequenceEqual([], list(c.partition_by(c.is_odd, [])))
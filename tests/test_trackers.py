@@ -0,0 +1,86 @@
+# -*- coding: UTF-8 -*-
+
+import unittest
+
+import clj as c
+from clj.trackers import BloomTracker, LRUTracker, SetTracker, Tracker
+
+
+class TestTrackers(unittest.TestCase):
+
+    def test_set_tracker(self):
+        t = SetTracker()
+        self.assertEqual(0.0, t.hit_rate)
+        self.assertFalse(t.add(1))
+        self.assertFalse(t.add(2))
+        self.assertTrue(t.add(1))
+        self.assertTrue(t.add(1))
+        self.assertEqual(2, len(t))
+        self.assertEqual(4, t.lookups)
+        self.assertEqual(2, t.hits)
+        self.assertEqual(0.5, t.hit_rate)
+        self.assertGreater(t.nbytes, 0)
+        self.assertIn("SetTracker", repr(t))
+
+    def test_lru_tracker(self):
+        t = LRUTracker(2)
+        self.assertFalse(t.add("a"))
+        self.assertFalse(t.add("b"))
+        self.assertTrue(t.add("a"))
+        # "b" is the least recently seen
+        self.assertFalse(t.add("c"))
+        self.assertFalse(t.add("b"))
+        self.assertFalse(t.add("a"))
+        self.assertEqual(2, len(t))
+        self.assertEqual(1, t.hits)
+
+        bounded = LRUTracker(100)
+        for i in range(10000):
+            bounded.add(i)
+        nbytes = bounded.nbytes
+        for i in range(10000, 100000):
+            bounded.add(i)
+        self.assertEqual(100, len(bounded))
+        self.assertEqual(nbytes, bounded.nbytes)
+
+        self.assertRaises(ValueError, LRUTracker, 0)
+
+    def test_bloom_tracker(self):
+        t = BloomTracker(1000, 0.01)
+        nbytes = t.nbytes
+        for i in range(1000):
+            t.add(i)
+        for i in range(1000):
+            self.assertTrue(t.add(i), "no false negatives")
+        self.assertEqual(nbytes, t.nbytes)
+
+        # Each lookup also adds the key, so the filter slowly gets over capacity
+        false_positives = sum(t.add(i) for i in range(1000, 1200))
+        self.assertLess(false_positives, 200 * 0.05)
+
+        for key in ("a", (1, 2), None, 2 ** 100, -1):
+            t.add(key)
+            self.assertTrue(t.add(key))
+
+        self.assertRaises(ValueError, BloomTracker, 0)
+        self.assertRaises(ValueError, BloomTracker, 10, 0)
+        self.assertRaises(ValueError, BloomTracker, 10, 1)
+
+    def test_abstract(self):
+        class NoSize(Tracker):
+            def _add(self, key):
+                return False
+
+        self.assertRaises(TypeError, Tracker)
+        self.assertRaises(TypeError, NoSize)
+
+    def test_distinct(self):
+        coll = [3, 1, 3, 2, 1, 4]
+        for tracker in (SetTracker(), LRUTracker(10), BloomTracker(100)):
+            self.assertEqual([3, 1, 2, 4], list(c.distinct(coll, tracker=tracker)))
+            self.assertEqual(6, tracker.lookups)
+            self.assertEqual(2, tracker.hits)
+
+        self.assertEqual([3, 1, 3, 2, 1, 4], list(c.distinct(coll, tracker=LRUTracker(1))))
+        self.assertEqual([3, 1, 2, 1, 4], list(c.distinct(coll, tracker=LRUTracker(2))))
+        self.assertEqual([3, 2], list(c.distinct(coll, key=c.is_odd, tracker=LRUTracker(2))))
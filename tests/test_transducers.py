@@ -0,0 +1,213 @@
+# -*- coding: UTF-8 -*-
+
+import operator
+import random
+import unittest
+
+import clj as c
+from clj import transducers as t
+
+
+def test_infinite_range():
+    """
+    Test generator that fails if its 10k-th element is consumed.
+    """
+    n = 0
+    while True:
+        yield n
+        n += 1
+        assert n <= 10000
+
+
+class TestTransducers(unittest.TestCase):
+
+    def test_reduced(self):
+        r = t.reduced(42)
+        self.assertTrue(t.is_reduced(r))
+        self.assertFalse(t.is_reduced(42))
+        self.assertEqual(42, t.unreduced(r))
+        self.assertEqual(42, t.unreduced(42))
+        self.assertIs(r, t.ensure_reduced(r))
+        self.assertEqual(42, t.ensure_reduced(42).value)
+
+    def test_completing(self):
+        rf = t.completing(operator.add, str)
+        self.assertEqual(3, rf(1, 2))
+        self.assertEqual("3", rf(3))
+
+        self.assertEqual("6", t.transduce(t.map(c.identity), rf, [1, 2, 3], 0))
+
+    def test_transduce(self):
+        self.assertEqual(0, t.transduce(t.map(c.inc), operator.add, [], 0))
+        self.assertEqual(9, t.transduce(t.map(c.inc), operator.add, [1, 2, 3], 0))
+        self.assertEqual(12, t.transduce(c.comp(t.map(c.inc), t.filter(c.is_even), t.take(3)),
+                                         operator.add, test_infinite_range(), 0))
+        self.assertEqual([1, 2], t.transduce(t.take(2), lambda acc, x: acc + [x], [1, 2, 3], []))
+        self.assertEqual(6, t.transduce(c.identity, lambda *args: sum(args), [1, 2, 3]))
+
+    def test_into(self):
+        self.assertEqual([], c.into([], []))
+        self.assertEqual([0, 1, 2], c.into([0], [1, 2]))
+        self.assertEqual({1, 2}, c.into(set(), [1, 2, 1]))
+        self.assertEqual({"a": 1}, c.into({}, [("a", 1)]))
+        self.assertEqual([2, 4], c.into([], [1, 2, 3, 4], t.filter(c.is_even)))
+        self.assertEqual({"a": 2}, c.into({}, ["a"], t.map(lambda k: (k, 2))))
+
+        ls = []
+        self.assertIs(ls, c.into(ls, [1]))
+
+        self.assertRaises(TypeError, c.into, 42, [1])
+
+    def test_sequence(self):
+        self.assertIsNotNone(c.sequence(t.map(c.inc), test_infinite_range()))
+        self.assertEqual([], list(c.sequence(t.map(c.inc), [])))
+        self.assertEqual([1, 2, 3], list(c.sequence(t.map(c.inc), [0, 1, 2])))
+        self.assertEqual([0, 1, 2],
+                         list(c.take(3, c.sequence(t.map(c.identity), test_infinite_range()))))
+        self.assertEqual([[0, 1], [2]], list(c.sequence(c.comp(t.take(3), t.partition_all(2)),
+                                                        test_infinite_range())))
+
+    def test_distinct(self):
+        self.assertEqual([2, 1, 3], list(c.sequence(t.distinct(), [2, 1, 3, 1, 2, 3])))
+
+    def test_filter_remove(self):
+        self.assertEqual([0, 2], list(c.sequence(t.filter(c.is_even), range(4))))
+        self.assertEqual([1, 3], list(c.sequence(t.remove(c.is_even), range(4))))
+
+    def test_keep(self):
+        self.assertEqual([1, False], list(c.sequence(t.keep(c.identity), [1, None, False])))
+        self.assertEqual(["a", "c"],
+                         list(c.sequence(t.keep_indexed(lambda i, e: e if i % 2 == 0 else None),
+                                         ["a", "b", "c", "d"])))
+
+    def test_cat_mapcat(self):
+        self.assertEqual([1, 2, 3], list(c.sequence(t.cat, [[1], [], [2, 3]])))
+        self.assertEqual(["a", "b", "c", "d"],
+                         list(c.sequence(t.mapcat(lambda s: s.split(",")), ["a,b", "c,d"])))
+        self.assertEqual([1, 2], list(c.sequence(c.comp(t.cat, t.take(2)), [[1, 2, 3], [4]])))
+
+    def test_map(self):
+        self.assertEqual([1, 2, 3], list(c.sequence(t.map(c.inc), range(3))))
+        self.assertEqual([5, 4, 3],
+                         list(c.sequence(t.map_indexed(lambda i, e: i + e), [5, 3, 1])))
+
+    def test_interpose(self):
+        self.assertEqual([], list(c.sequence(t.interpose(","), [])))
+        self.assertEqual(["foo"], list(c.sequence(t.interpose(","), ["foo"])))
+        self.assertEqual(["foo", ",", "bar"], list(c.sequence(t.interpose(","), ["foo", "bar"])))
+        self.assertEqual([1, 0], list(c.sequence(c.comp(t.interpose(0), t.take(2)), [1, 2])))
+
+    def test_drop(self):
+        self.assertEqual([], list(c.sequence(t.drop(3), [1, 2])))
+        self.assertEqual([3, 4], list(c.sequence(t.drop(2), [1, 2, 3, 4])))
+        self.assertEqual([1, 2], list(c.sequence(t.drop(-1), [1, 2])))
+        self.assertEqual([3, 1], list(c.sequence(t.drop_while(lambda n: n < 3), [1, 2, 3, 1])))
+
+    def test_take(self):
+        els = []
+
+        def _gen():
+            for x in range(10):
+                els.append(x)
+                yield x
+
+        self.assertEqual([], list(c.sequence(t.take(0), [1, 2, 3])))
+        self.assertEqual([1, 2], list(c.sequence(t.take(2), [1, 2, 3])))
+        self.assertEqual([1, 2, 3], list(c.sequence(t.take(4), [1, 2, 3])))
+        self.assertEqual(els, list(c.sequence(t.take(5), _gen())))
+
+        self.assertEqual([1, 2], list(c.sequence(t.take_while(lambda n: n < 3), [1, 2, 3, 1])))
+        self.assertEqual([0, 2, 4], list(c.sequence(t.take_nth(2), range(6))))
+        self.assertRaises(ValueError, t.take_nth, 0)
+
+    def test_replace(self):
+        self.assertEqual(["b", "c"], list(c.sequence(t.replace({"a": "b"}), ["a", "c"])))
+
+    def test_dedupe(self):
+        self.assertEqual([1, 2, 1], list(c.sequence(t.dedupe(), [1, 1, 2, 2, 1])))
+        self.assertEqual([None, 1], list(c.sequence(t.dedupe(), [None, None, 1])))
+
+    def test_partition(self):
+        self.assertEqual([[1, 2]], list(c.sequence(t.partition(2), [1, 2, 3])))
+        self.assertEqual([[1, 2], [3]], list(c.sequence(t.partition_all(2), [1, 2, 3])))
+        self.assertRaises(ValueError, t.partition, 0)
+        self.assertRaises(ValueError, t.partition_all, -1)
+
+    def test_partition_by(self):
+        self.assertEqual([], list(c.sequence(t.partition_by(c.is_odd), [])))
+        self.assertEqual([[1, 1, 1], [2, 2], [3, 3]],
+                         list(c.sequence(t.partition_by(c.is_odd), [1, 1, 1, 2, 2, 3, 3])))
+        self.assertEqual([["A"], ["B", "B"], ["A"]],
+                         list(c.sequence(t.partition_by(c.identity), "ABBA")))
+
+    def test_equivalent_to_seqs(self):
+        coll = list(range(1000))
+        xf = c.comp(t.map(c.inc), t.filter(c.is_even), t.keep(lambda x: x // 3), t.distinct(),
+                    t.partition_all(7))
+        expected = [p for p in _seqs_pipeline(coll)]
+        self.assertEqual(expected, list(c.sequence(xf, coll)))
+        self.assertEqual(expected, c.into([], coll, xf))
+
+    def test_fused_equivalent_to_unfused(self):
+        stages = [
+            lambda: t.map(c.inc),
+            lambda: t.filter(c.is_even),
+            lambda: t.remove(lambda x: x % 3 == 0),
+            lambda: t.keep(lambda x: x // 2 or None),
+            lambda: t.keep_indexed(lambda i, x: x if i % 3 else None),
+            lambda: t.map_indexed(lambda i, x: x + i),
+            lambda: t.distinct(),
+            lambda: t.dedupe(),
+            lambda: t.drop(3),
+            lambda: t.drop_while(lambda x: x < 5),
+            lambda: t.take(40),
+            lambda: t.take_nth(2),
+            lambda: t.take_while(lambda x: x < 500),
+            lambda: t.replace({4: 5}),
+            lambda: t.mapcat(lambda x: [x, x + 1]),
+            lambda: c.comp(t.partition_all(3), t.cat),
+            lambda: c.comp(t.partition(2), t.map(sum)),
+            lambda: c.comp(t.partition_by(lambda x: x % 7 == 0), t.map(len)),
+            lambda: t.interpose(9),
+        ]
+
+        def unfused(xf):
+            # Hide the stages so that no code is generated
+            return lambda rf: xf(rf)
+
+        rnd = random.Random(42)
+        for _ in range(300):
+            chosen = [rnd.choice(stages) for _ in range(rnd.randint(1, 8))]
+            fused = c.comp(*[s() for s in chosen])
+            plain = c.comp(*[unfused(s()) for s in chosen])
+            coll = [rnd.randint(0, 100) for _ in range(rnd.randint(0, 200))]
+
+            expected = t.transduce(plain, lambda acc, x: acc + [x], coll, [])
+            self.assertEqual(expected, t.transduce(fused, lambda acc, x: acc + [x], coll, []))
+            self.assertEqual(expected, list(c.sequence(fused, coll)))
+            self.assertEqual(expected, list(c.sequence(c.comp(fused, t.map(c.identity), unfused(t.take(1000))),
+                                                       coll)))
+            self.assertEqual(expected[:3], t.transduce(c.comp(fused, t.take(3)), lambda acc, x: acc + [x], coll, []))
+            self.assertEqual(expected[:2], t.transduce(fused, lambda acc, x: t.reduced(acc + [x]) if acc else acc + [x],
+                                                       coll, []))
+
+        # The partition flushed after an upstream take goes through all the
+        # iterations of the loops below it
+        for xf in (c.comp(t.take(2), t.partition_all(3), t.cat, t.mapcat(lambda x: [x, x])),
+                   c.comp(t.take_while(lambda x: x < 3), t.partition_by(c.is_odd), t.cat, t.mapcat(lambda x: [x, x]))):
+            expected = t.transduce(unfused(xf), lambda acc, x: acc + [x], [1, 2, 3], [])
+            self.assertEqual([1, 1, 2, 2], expected)
+            self.assertEqual(expected, list(c.sequence(xf, [1, 2, 3])))
+            self.assertEqual(expected, c.into([], [1, 2, 3], xf))
+
+
+def _seqs_pipeline(coll):
+    s = c.distinct(c.keep(lambda x: x // 3, c.filter(c.is_even, c.map(c.inc, coll))))
+    chunk = []
+    for e in s:
+        chunk.append(e)
+        if len(chunk) == 7:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,131 @@
+# -*- coding: UTF-8 -*-
+
+import array
+import random
+import tracemalloc
+import unittest
+from collections import deque
+
+import clj as c
+from clj.views import ReversedView, SliceView, StridedView, SequenceView, is_viewable
+
+
+class TestViews(unittest.TestCase):
+
+    def assertSameAsList(self, expected, view):
+        self.assertEqual(expected, list(view))
+        self.assertEqual(len(expected), len(view))
+        self.assertEqual(expected, [view[i] for i in range(len(view))])
+        self.assertEqual(expected[::-1], list(reversed(view)))
+        if expected:
+            self.assertEqual(expected[-1], view[-1])
+        self.assertRaises(IndexError, lambda: view[len(expected)])
+
+    def test_is_viewable(self):
+        for coll in ([], (), "", b"", bytearray(), array.array("i"), memoryview(b""), range(3), SliceView([1])):
+            self.assertTrue(is_viewable(coll))
+        for coll in (deque(), {1}, {1: 2}, iter([]), memoryview(bytes(4)).cast("B", (2, 2)), None):
+            self.assertFalse(is_viewable(coll))
+
+    def test_views(self):
+        for make in (list, tuple, lambda x: x, bytes, bytearray, lambda x: array.array("d", x),
+                     lambda x: array.array("u", [chr(97 + e) for e in x]), lambda x: memoryview(bytes(x)),
+                     lambda x: "".join(map(str, x))):
+            coll = make(range(10))
+            expected = list(coll)
+            self.assertSameAsList(expected[3:], SliceView(coll, 3))
+            self.assertSameAsList(expected[3:-2], SliceView(coll, 3, -2))
+            self.assertSameAsList(expected[8:1:-3], SliceView(coll, 8, 1, -3))
+            self.assertSameAsList(expected[::-1], ReversedView(coll))
+            self.assertSameAsList(expected[1::3], StridedView(coll, 3, 1))
+            self.assertSameAsList([], SliceView(coll, 20))
+
+            # Views of views
+            view = StridedView(ReversedView(SliceView(coll, 1)), 2)
+            self.assertSameAsList(expected[1:][::-1][::2], view)
+            self.assertSameAsList(expected[1:][::-1][::2][1:], view[1:])
+            self.assertSameAsList(expected[1:][::-1][::2][::-1], view[::-1])
+            self.assertIsInstance(view[1:], SliceView)
+
+        self.assertRaises(ValueError, StridedView, [1], 0)
+
+    def test_buffers(self):
+        data = bytearray(b"abcdef")
+        view = SliceView(data, 2)
+        self.assertIsInstance(view._base, memoryview)
+        data[3] = ord("x")
+        self.assertEqual(b"cxef", bytes(view))
+        # Like memoryviews, views prevent resizing
+        self.assertRaises(BufferError, data.append, 1)
+        self.assertEqual("<SliceView of bytearray, 4 items>", repr(view))
+        # Except arrays of unicode characters, which don't support the buffer protocol
+        self.assertIsInstance(SliceView(array.array("d", [1.0]))._base, memoryview)
+        self.assertIsInstance(SliceView(array.array("u", "ab"))._base, array.array)
+
+    def test_seqs(self):
+        coll = list(range(10))
+        for view, expected in ((c.rest(coll), coll[1:]),
+                               (c.drop(3, coll), coll[3:]),
+                               (c.drop(-3, coll), coll),
+                               (c.take(3, coll), coll[:3]),
+                               (c.take(-3, coll), []),
+                               (c.butlast(coll), coll[:-1]),
+                               (c.drop_last(3, coll), coll[:-3]),
+                               (c.drop_last(20, coll), []),
+                               (c.reverse(coll), coll[::-1]),
+                               (c.take_nth(3, coll), coll[::3]),
+                               (c.split_at(4, coll)[0], coll[:4]),
+                               (c.split_at(4, coll)[1], coll[4:]),
+                               (c.split_at(-4, coll)[1], coll),
+                               (c.butlast([]), [])):
+            self.assertIsInstance(view, SequenceView)
+            self.assertSameAsList(expected, view)
+
+        # Nothing is copied, so the views see changes
+        view = c.reverse(coll)
+        coll[9] = 42
+        self.assertEqual(42, c.first(view))
+
+        self.assertEqual(["b", "c"], list(c.rest("abc")))
+        self.assertNotIsInstance(c.rest(deque([1, 2])), SequenceView)
+        self.assertNotIsInstance(c.rest(iter([1, 2])), SequenceView)
+
+        # Empty views of buffers and ranges
+        self.assertEqual([], list(c.reverse(c.take(0, b"abcde"))))
+        self.assertEqual([], list(reversed(c.take(0, bytearray(b"abc")))))
+        self.assertEqual([], list(c.reverse(c.butlast(range(1)))))
+
+    def test_slices(self):
+        # Slices of slices of views, against the same slices of lists
+        rnd = random.Random(42)
+        makes = (list, tuple, bytes, bytearray, lambda x: array.array("B", x), lambda x: memoryview(bytes(x)),
+                 lambda x: range(len(x)), lambda x: "".join(map(chr, x)))
+
+        def random_slice(n):
+            def bound():
+                return rnd.choice([None, rnd.randint(-n - 2, n + 2)])
+
+            return slice(bound(), bound(), rnd.choice([None, 1, 2, 3, -1, -2, -3]))
+
+        for _ in range(500):
+            data = [rnd.randrange(256) for _ in range(rnd.randint(0, 10))]
+            for make in makes:
+                coll = make(data)
+                view = SliceView(coll)
+                expected = list(coll)
+                for _ in range(3):
+                    s = random_slice(len(data))
+                    view = view[s]
+                    expected = expected[s]
+                    self.assertSameAsList(expected, view)
+
+    def test_memory(self):
+        coll = list(range(100000))
+        tracemalloc.start()
+        try:
+            c.dorun(c.reverse(c.rest(c.take_nth(2, c.butlast(coll)))))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        # A copy would take 400 kB
+        self.assertLess(peak, 10000)